@@ -0,0 +1,54 @@
+"""add task closure table
+
+Revision ID: 0b6d4e8f2a17
+Revises: f1a9c3e5b720
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d4e8f2a17'
+down_revision: Union[str, Sequence[str], None] = 'f1a9c3e5b720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(
+        'ix_task_closure_descendant_id_depth', 'task_closure', ['descendant_id', 'depth'], unique=False
+    )
+    # Backfill from the main_task_id adjacency list; the depth cap guards against cycles.
+    op.execute(
+        """
+        INSERT INTO task_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM tasks
+            UNION ALL
+            SELECT tree.ancestor_id, tasks.id, tree.depth + 1
+            FROM tasks JOIN tree ON tasks.main_task_id = tree.descendant_id
+            WHERE tree.depth < 100
+        )
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM tree GROUP BY ancestor_id, descendant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_closure_descendant_id_depth', table_name='task_closure')
+    op.drop_table('task_closure')
@@ -0,0 +1,86 @@
+"""add running task progress aggregates
+
+Revision ID: 2c5e7a9b1d34
+Revises: 0b6d4e8f2a17
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c5e7a9b1d34'
+down_revision: Union[str, Sequence[str], None] = '0b6d4e8f2a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('task_progress', sa.Column('cycle_no', sa.Integer(), nullable=True))
+    op.add_column('task_progress', sa.Column('cumulative_done_hr', sa.Float(), nullable=True))
+    op.create_index(
+        'ix_task_progress_task_id_cycle_no', 'task_progress', ['task_id', 'cycle_no'], unique=False
+    )
+    op.create_table(
+        'task_progress_stats',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('cycle_count', sa.Integer(), nullable=False),
+        sa.Column('done_hr_sum', sa.Float(), nullable=False),
+        sa.Column('done_hr_sq_sum', sa.Float(), nullable=False),
+        sa.Column('estimated_hr_sum', sa.Float(), nullable=False),
+        sa.Column('completion_pct_sum', sa.Float(), nullable=False),
+        sa.Column('estimated_cycle_count', sa.Integer(), nullable=False),
+        sa.Column('first_window_done_hr', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+
+    # Backfill from the existing history; same computation as
+    # TaskRepository.rebuild_progress_stats (python -m infrastructure.workers.progress_stats_backfill).
+    op.execute(
+        """
+        UPDATE task_progress SET cycle_no = numbered.cycle_no, cumulative_done_hr = numbered.cumulative_done_hr
+        FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER (PARTITION BY task_id ORDER BY start_date, id) AS cycle_no,
+                   SUM(COALESCE(done_hr, 0)) OVER (
+                       PARTITION BY task_id ORDER BY start_date, id
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                   ) AS cumulative_done_hr
+            FROM task_progress
+        ) AS numbered
+        WHERE task_progress.id = numbered.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO task_progress_stats (
+            task_id, cycle_count, done_hr_sum, done_hr_sq_sum, estimated_hr_sum,
+            completion_pct_sum, estimated_cycle_count, first_window_done_hr
+        )
+        SELECT task_id,
+               COUNT(*),
+               SUM(COALESCE(done_hr, 0)),
+               SUM(COALESCE(done_hr, 0) * COALESCE(done_hr, 0)),
+               SUM(COALESCE(estimated_hr, 0)),
+               COALESCE(SUM(CASE WHEN done_hr >= estimated_hr THEN 100.0
+                                 ELSE COALESCE(done_hr, 0) * 100.0 / estimated_hr END)
+                        FILTER (WHERE estimated_hr > 0), 0),
+               COUNT(*) FILTER (WHERE estimated_hr > 0),
+               COALESCE(SUM(COALESCE(done_hr, 0)) FILTER (WHERE cycle_no <= 3), 0)
+        FROM task_progress
+        GROUP BY task_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_progress_stats')
+    op.drop_index('ix_task_progress_task_id_cycle_no', table_name='task_progress')
+    op.drop_column('task_progress', 'cumulative_done_hr')
+    op.drop_column('task_progress', 'cycle_no')
@@ -0,0 +1,62 @@
+"""add indexes for hot query predicates
+
+Revision ID: e4b8a6c2d913
+Revises: c7d2f0a18e35
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8a6c2d913'
+down_revision: Union[str, Sequence[str], None] = 'c7d2f0a18e35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_tasks_owner_id_status', 'tasks', ['owner_id', 'status']),
+    ('ix_tasks_status', 'tasks', ['status']),
+    ('ix_tasks_main_task_id', 'tasks', ['main_task_id']),
+    ('ix_task_assignees_user_id_task_id', 'task_assignees', ['user_id', 'task_id']),
+    ('ix_task_assignees_task_id', 'task_assignees', ['task_id']),
+    ('ix_times_plan_id', 'times', ['plan_id']),
+    ('ix_times_task_id', 'times', ['task_id']),
+    ('ix_task_progress_task_id_start_date', 'task_progress', ['task_id', 'start_date']),
+    ('ix_stop_progress_task_id', 'stop_progress', ['task_id']),
+    ('ix_tokens_user_id', 'tokens', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+    # Fold duplicate day plans into the oldest one before enforcing one plan per user and day.
+    op.execute(
+        """
+        UPDATE times SET plan_id = keep.id
+        FROM plans dup
+        JOIN (SELECT user_id, date, MIN(id) AS id FROM plans GROUP BY user_id, date) keep
+          ON keep.user_id = dup.user_id AND keep.date = dup.date
+        WHERE times.plan_id = dup.id AND dup.id <> keep.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM plans
+        WHERE id NOT IN (SELECT MIN(id) FROM plans GROUP BY user_id, date)
+        """
+    )
+    op.create_unique_constraint('uq_plans_user_id_date', 'plans', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_plans_user_id_date', 'plans', type_='unique')
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
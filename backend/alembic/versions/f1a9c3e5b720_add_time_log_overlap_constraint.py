@@ -0,0 +1,59 @@
+"""add time log overlap index and exclusion constraint
+
+Revision ID: f1a9c3e5b720
+Revises: e4b8a6c2d913
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9c3e5b720'
+down_revision: Union[str, Sequence[str], None] = 'e4b8a6c2d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMERANGE_MARKER = 'created by migration f1a9c3e5b720'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite index also serves plain plan_id lookups.
+    op.create_index(
+        'ix_times_plan_id_start_time_end_time', 'times', ['plan_id', 'start_time', 'end_time'], unique=False
+    )
+    op.drop_index('ix_times_plan_id', table_name='times')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Fails if overlapping logs already exist; they have to be cleaned up by hand first.
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        # CREATE TYPE has no IF NOT EXISTS; skip it when the type is already there.
+        # The comment marks the type as ours so downgrade only drops what it created.
+        op.execute(
+            "DO $$ BEGIN "
+            "CREATE TYPE timerange AS RANGE (subtype = time); "
+            f"COMMENT ON TYPE timerange IS '{TIMERANGE_MARKER}'; "
+            "EXCEPTION WHEN duplicate_object THEN NULL; "
+            "END $$"
+        )
+        op.execute(
+            "ALTER TABLE times ADD CONSTRAINT ex_times_no_overlap "
+            "EXCLUDE USING gist (plan_id WITH =, timerange(start_time, end_time) WITH &&)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE times DROP CONSTRAINT IF EXISTS ex_times_no_overlap")
+        op.execute(
+            "DO $$ BEGIN "
+            "IF obj_description(to_regtype('timerange'), 'pg_type') = "
+            f"'{TIMERANGE_MARKER}' THEN DROP TYPE timerange; END IF; "
+            "END $$"
+        )
+    op.create_index('ix_times_plan_id', 'times', ['plan_id'], unique=False)
+    op.drop_index('ix_times_plan_id_start_time_end_time', table_name='times')
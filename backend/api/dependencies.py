@@ -1,8 +1,10 @@
 # from api.config import settings
 import os
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 from domain.interfaces.daypla_uow import IDayPlanUoW
+from domain.interfaces.email_service import EmailServiceInterface
 from domain.interfaces.iuow import IUnitOfWork
 from domain.models.user_model import TokenClaimUser
 from fastapi import Depends, HTTPException
@@ -10,8 +12,10 @@ from fastapi.security import OAuth2PasswordBearer
 from infrastructure.db.session import AsyncSessionLocal
 from infrastructure.repositories.token_repository import TokenRepository
 from infrastructure.repositories.user_repository import UserRepository
-from infrastructure.services.email_service import EmailService
+from infrastructure.services.analytics_cache import AnalyticsCache, create_analytics_cache
+from infrastructure.services.claims_cache import ClaimsCache
 from infrastructure.services.jwt_service import JwtService
+from infrastructure.services.outbox_email_service import OutboxEmailService
 from infrastructure.services.password_service import PasswordService
 from infrastructure.uow.dayyplan_uow import DayPlanUnitOfWork
 from infrastructure.uow.task_uow import SqlAlchemyUnitOfWork
@@ -39,28 +43,73 @@ async def get_db() -> AsyncSession:
 
 
 async def get_dayplan_uow(db: AsyncSession = Depends(get_db)) -> IDayPlanUoW:
-    return DayPlanUnitOfWork(lambda: db)
+    return DayPlanUnitOfWork(lambda: db, get_analytics_cache())
 
 async def get_dayplan_usecase(uow: IDayPlanUoW = Depends(get_dayplan_uow)) -> DayPlanUseCase:
     return DayPlanUseCase(uow)
 
 async def get_uow(db: AsyncSession = Depends(get_db)) -> IUnitOfWork:
     # Create a session factory that reuses the existing session
-    return SqlAlchemyUnitOfWork(lambda: db)
+    return SqlAlchemyUnitOfWork(lambda: db, get_analytics_cache())
 
 async def get_task_service(uow: IUnitOfWork = Depends(get_uow)) -> TaskService:
-    return TaskService(uow)
+    return TaskService(uow, get_analytics_cache())
 
+async def get_export_task_service() -> TaskService:
+    # A streamed response outlives the request-scoped session, so exports open their own.
+    return TaskService(SqlAlchemyUnitOfWork(AsyncSessionLocal), get_analytics_cache())
 
-async def get_user_usecase(db: AsyncSession = Depends(get_db)) -> UserUsecase:
-    repo = UserRepository(db)
-    tokenRepo = TokenRepository(db)
-    jwt_service = JwtService(
+
+# Stateless services: built once per process and shared by every request.
+@lru_cache
+def get_jwt_service() -> JwtService:
+    return JwtService(
         SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_HOURS
     )
-    email_service=EmailService()
 
-    password_service = PasswordService()
+
+@lru_cache
+def get_password_service() -> PasswordService:
+    return PasswordService()
+
+
+def get_email_service(db: AsyncSession = Depends(get_db)) -> EmailServiceInterface:
+    # Requests only enqueue, in the request's session so the row commits with
+    # the user or token; the outbox sender delivers in the background.
+    return OutboxEmailService(db)
+
+
+@lru_cache
+def get_claims_cache() -> Optional[ClaimsCache]:
+    ttl_seconds = float(os.getenv("AUTH_CLAIMS_CACHE_TTL_SECONDS", "30"))
+    if ttl_seconds <= 0:
+        return None
+    return ClaimsCache(
+        ttl_seconds, maxsize=int(os.getenv("AUTH_CLAIMS_CACHE_SIZE", "10000"))
+    )
+
+
+@lru_cache
+def get_analytics_cache() -> Optional[AnalyticsCache]:
+    return create_analytics_cache()
+
+
+def init_services():
+    """Build the shared services at startup instead of on the first request."""
+    get_jwt_service()
+    get_password_service()
+    get_claims_cache()
+    get_analytics_cache()
+
+
+async def get_user_usecase(
+    db: AsyncSession = Depends(get_db),
+    jwt_service: JwtService = Depends(get_jwt_service),
+    password_service: PasswordService = Depends(get_password_service),
+    email_service: EmailServiceInterface = Depends(get_email_service),
+) -> UserUsecase:
+    repo = UserRepository(db)
+    tokenRepo = TokenRepository(db)
     return UserUsecase(repo, password_service, jwt_service, tokenRepo, email_service)
 
 
@@ -68,10 +117,16 @@ async def get_user_usecase(db: AsyncSession = Depends(get_db)) -> UserUsecase:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    user_usecase: UserUsecase = Depends(get_user_usecase),
+    jwt_service: JwtService = Depends(get_jwt_service),
+    claims_cache: Optional[ClaimsCache] = Depends(get_claims_cache),
 ) -> TokenClaimUser:
+    # Stateless: the access token alone identifies the caller, no DB session is opened.
+    if claims_cache is not None:
+        if cached := claims_cache.get(token):
+            return cached
+
     try:
-        payload, err = user_usecase.jwt_service.decode_token(token)
+        payload, err = jwt_service.decode_token(token)
         if not payload:
             raise HTTPException(status_code=400, detail=err)
         username = payload.get("username")
@@ -87,7 +142,10 @@ async def get_current_user(
             status_code=401, detail="Invalid authentication credentials"
         )
 
-    return TokenClaimUser(user_id, email, username, role)
+    current_user = TokenClaimUser(user_id, email, username, role)
+    if claims_cache is not None:
+        claims_cache.set(token, current_user, payload.get("exp"))
+    return current_user
 
 
 def role_required(permitted_roles: List[str]):
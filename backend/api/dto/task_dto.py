@@ -1,9 +1,12 @@
+from typing import Dict
+
 from api.schemas.task_schema import Task as PydanticTask
-from api.schemas.task_schema import TaskCreate
+from api.schemas.task_schema import TaskBulkUpdate, TaskCreate, TaskImportItem
 from api.schemas.task_schema import TaskProgress as PydanticTaskProgress
 from api.schemas.task_schema import TaskUpdate as PydanticTaskUpdate
 from domain.models.task_model import (
     TaskCreateInput,
+    TaskImportInput,
     TaskOutput,
     TaskProgressDomain,
     TaskUpdateInput,
@@ -40,6 +43,19 @@ def pydantic_to_domain_task_create(pydantic_task: TaskCreate) -> TaskCreateInput
     )
 
 
+def pydantic_to_domain_task_import(pydantic_task: TaskImportItem) -> TaskImportInput:
+    return TaskImportInput(
+        description=pydantic_task.description,
+        end_date=pydantic_task.end_date,
+        estimated_hr=pydantic_task.estimated_hr,
+        is_repititive=pydantic_task.is_repititive,
+        status=pydantic_task.status,
+        start_date=pydantic_task.start_date,
+        main_task_id=pydantic_task.main_task_id,
+        parent_index=pydantic_task.parent_index,
+    )
+
+
 def pydantic_to_domain_task_update(p: PydanticTaskUpdate) -> TaskUpdateInput:
     return TaskUpdateInput(
         description=p.description,
@@ -52,6 +68,15 @@ def pydantic_to_domain_task_update(p: PydanticTaskUpdate) -> TaskUpdateInput:
     )
 
 
+def pydantic_to_bulk_changes(p: TaskBulkUpdate) -> Dict[int, dict]:
+    """Per-task changes: the shared ``changes`` for ``ids``, then each item's own on top."""
+    shared = p.changes.model_dump(exclude_unset=True) if p.changes else {}
+    updates = {task_id: dict(shared) for task_id in p.ids}
+    for item in p.items:
+        updates.setdefault(item.id, {}).update(item.model_dump(exclude_unset=True, exclude={"id"}))
+    return updates
+
+
 def pydantic_to_domain_task_progress(p: PydanticTaskProgress) -> TaskProgressDomain:
     return TaskProgressDomain(
         task_id=p.task_id,
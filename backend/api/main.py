@@ -1,13 +1,42 @@
 import os
+from contextlib import asynccontextmanager
 
+from api.dependencies import get_analytics_cache, get_password_service, init_services
 from api.routers import dayplan_router, task, user_router
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from infrastructure.db.session import get_pool_metrics
+from infrastructure.workers.email_outbox_worker import create_email_outbox_sender
+from infrastructure.workers.rollover_worker import create_rollover_scheduler
 
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_services()
+    # Repetitive tasks roll over here instead of on GET /tasks.
+    # Set ROLLOVER_SCHEDULER_ENABLED=false when running the standalone worker.
+    scheduler = None
+    if os.getenv("ROLLOVER_SCHEDULER_ENABLED", "true").lower() == "true":
+        scheduler = create_rollover_scheduler(get_analytics_cache())
+        scheduler.start()
+    # Emails are queued in the outbox by requests and delivered here.
+    # Set EMAIL_OUTBOX_SENDER_ENABLED=false when running the standalone worker.
+    email_sender = None
+    if os.getenv("EMAIL_OUTBOX_SENDER_ENABLED", "true").lower() == "true":
+        email_sender = create_email_outbox_sender()
+        email_sender.start()
+    yield
+    if scheduler:
+        await scheduler.stop()
+    if email_sender:
+        await email_sender.stop()
+    get_password_service().shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 app.add_middleware(
@@ -27,3 +56,15 @@ app.include_router(task.router, prefix="/tasks", tags=["Tasks"])
 app.include_router(dayplan_router.router, prefix="/plans", tags=["Plans"])
 # app.include_router(times.router, prefix="/times", tags=["Times"])
 app.include_router(user_router.router, prefix="/auth", tags=["Authentication"])
+
+
+@app.get("/health/db-pool", tags=["Health"])
+async def db_pool_metrics():
+    """Connection pool checkouts, current usage and checkout wait times."""
+    return get_pool_metrics()
+
+
+@app.get("/health/password-hash", tags=["Health"])
+async def password_hash_metrics():
+    """Password hashing pool size, queue depth and in-flight hashes."""
+    return get_password_service().metrics()
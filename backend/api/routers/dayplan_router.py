@@ -1,6 +1,14 @@
+from typing import List
+
 from api.dependencies import get_current_user, get_dayplan_usecase
 from api.dto.dayplan_dto import time_create_to_domain
-from api.schemas.dayplan_schema import DayPlan, DayPlanCreate, Time, TimeCreate
+from api.schemas.dayplan_schema import (
+    DayPlan,
+    DayPlanCreate,
+    Time,
+    TimeBatchResult,
+    TimeCreate,
+)
 from api.utilities.handle_service_result import handle_service_result
 from fastapi import APIRouter, Depends
 
@@ -38,6 +46,18 @@ async def create_timelog(
     return await usecase.create_time_log(time_log, current_user)
 
 
+@router.post("/timelog/batch", response_model=List[TimeBatchResult])
+@handle_service_result
+async def create_timelogs(
+    time_logs: List[TimeCreate],
+    usecase=Depends(get_dayplan_usecase),
+    current_user=Depends(get_current_user),
+):
+    """Create a day's worth of time logs at once; each item reports its own result."""
+    time_logs = [time_create_to_domain(time_log) for time_log in time_logs]
+    return await usecase.create_time_logs(time_logs, current_user)
+
+
 @router.delete("/timelog/{time_log_id}")
 @handle_service_result
 async def delete_timelog(
@@ -1,16 +1,24 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from api.dependencies import get_current_user, get_task_service
+from api.dependencies import get_current_user, get_export_task_service, get_task_service
 from api.dto import task_dto
 from api.schemas.task_schema import (
     AssignUserInput,
     Task,
+    TaskBulkUpdate,
     TaskCreate,
+    TaskImportItem,
+    TaskImportResult,
+    TaskPortfolioEntry,
     TaskProgress,
+    TaskTreeNode,
     TaskUpdate,
+    TaskUpdateResult,
 )
 from api.utilities.handle_service_result import handle_service_result
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 
@@ -27,19 +35,71 @@ async def create_task(
     return result
 
 
+@router.post("/import", response_model=List[TaskImportResult])
+@handle_service_result
+async def import_tasks(
+    tasks: List[TaskImportItem],
+    service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Create a backlog of tasks at once; each item reports its own result. An item
+    can nest under an earlier item of the same batch with ``parent_index``.
+    """
+    tasks = [task_dto.pydantic_to_domain_task_import(task) for task in tasks]
+    return await service.import_tasks(tasks, current_user)
+
+
 @router.get("/", response_model=List[Task])
 @handle_service_result
 async def read_tasks(
     skip: int = 0,
     limit: int = 10,
     search_name: Optional[str] = None,
+    after_end_date: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     service=Depends(get_task_service),
     current_user=Depends(get_current_user),
 ):
-    result = await service.get_tasks(current_user=current_user,search_name=search_name, skip=skip, limit=limit)
+    """
+    List the caller's open tasks ordered by end date. For keyset pagination pass the
+    ``end_date`` and ``id`` of the last task of the previous page as
+    ``after_end_date``/``after_id`` instead of ``skip``.
+    """
+    result = await service.get_tasks(
+        current_user=current_user,
+        search_name=search_name,
+        skip=skip,
+        limit=limit,
+        after_end_date=after_end_date,
+        after_id=after_id,
+    )
     return result
 
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export")
+@handle_service_result
+async def export_tasks(
+    format: str = "ndjson",
+    service=Depends(get_export_task_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Stream every task the caller owns or is assigned, with its progress and stop
+    history, plus the time logs of the caller's day plans. ``format`` is ``ndjson``
+    (one object per row, tagged with ``record_type``) or ``csv``.
+    """
+    chunks = service.export_tasks(current_user, format)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
 @router.get("/{task_id}", response_model=Task)
 @handle_service_result
 async def read_task(
@@ -51,6 +111,28 @@ async def read_task(
     return result
 
 
+@router.get("/{task_id}/subtree", response_model=List[TaskTreeNode])
+@handle_service_result
+async def read_subtree(
+    task_id: int,
+    service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    """The task and every descendant, by depth, each with its subtree's hour totals."""
+    return await service.get_subtree(task_id, current_user)
+
+
+@router.get("/{task_id}/ancestors", response_model=List[TaskTreeNode])
+@handle_service_result
+async def read_ancestors(
+    task_id: int,
+    service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    """The chain of parent tasks, root first, each with its subtree's hour totals."""
+    return await service.get_ancestors(task_id, current_user)
+
+
 @router.delete("/{task_id}")
 @handle_service_result
 async def delete_task(
@@ -74,6 +156,22 @@ async def assign_user_to_task(
     return result
 
 
+@router.patch("/bulk", response_model=List[TaskUpdateResult])
+@handle_service_result
+async def bulk_update_tasks(
+    data: TaskBulkUpdate,
+    service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Update many tasks at once, e.g. to close out a sprint: ``changes`` applies to
+    every id in ``ids`` and each entry of ``items`` carries its own changes. Each
+    task reports its own result.
+    """
+    updates = task_dto.pydantic_to_bulk_changes(data)
+    return await service.bulk_update_tasks(updates, current_user)
+
+
 @router.patch("/{task_id}", response_model=Task)
 @handle_service_result
 async def update_task(
@@ -115,10 +213,38 @@ async def task_progress(
     task_id: int,
     skip: Optional[int] = 0,
     limit: Optional[int] = 20,
+    before_start_date: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Progress history of a task, newest first. For keyset pagination pass the
+    ``start_date`` and ``id`` of the last cycle of the previous page as
+    ``before_start_date``/``before_id`` instead of ``skip``.
+    """
+    return await service.get_progress(
+        task_id,
+        current_user,
+        skip,
+        limit,
+        before_start_date=before_start_date,
+        before_id=before_id,
+    )
+
+@router.get("/analytics/portfolio", response_model=List[TaskPortfolioEntry])
+@handle_service_result
+async def portfolio_analytics(
+    skip: int = 0,
+    limit: int = 100,
     service=Depends(get_task_service),
     current_user=Depends(get_current_user),
 ):
-    return await service.get_progress(task_id, current_user, skip, limit)
+    """
+    Completion rate, efficiency, deadline status and grade for every task the
+    caller owns or is assigned, ordered by end date.
+    """
+    return await service.get_portfolio_analytics(current_user, skip=skip, limit=limit)
 
 @router.get("/analytics/{task_id}")
 @handle_service_result
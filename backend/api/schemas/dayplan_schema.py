@@ -40,3 +40,11 @@ class DayPlan(DayPlanBase):
     times: Optional[List[Time]] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TimeBatchResult(BaseModel):
+    index: int
+    time_log: Optional[Time] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
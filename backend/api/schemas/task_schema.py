@@ -37,6 +37,19 @@ class Task(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskImportItem(TaskCreate):
+    # Batch index of an earlier item to nest this task under, instead of main_task_id
+    parent_index: Optional[int] = None
+
+
+class TaskImportResult(BaseModel):
+    index: int
+    task: Optional[Task] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class AssignUserInput(BaseModel):
     assignee_email: EmailStr
 
@@ -51,10 +64,72 @@ class TaskUpdate(BaseModel):
     main_task_id: Optional[int] = None
 
 
+class TaskBulkChanges(BaseModel):
+    description: Optional[str] = None
+    end_date: Optional[datetime] = None
+    estimated_hr: Optional[float] = None
+    is_repititive: Optional[bool] = None
+    status: Optional[TaskStatus] = None
+    start_date: Optional[datetime] = None
+
+
+class TaskBulkUpdateItem(TaskBulkChanges):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    # `changes` applies to every task in `ids`; `items` carry their own changes
+    ids: List[int] = []
+    changes: Optional[TaskBulkChanges] = None
+    items: List[TaskBulkUpdateItem] = []
+
+
+class TaskUpdateResult(BaseModel):
+    task_id: int
+    task: Optional[Task] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TaskProgress(BaseModel):
+    id: Optional[int] = None
     task_id: int
     start_date: datetime
     end_date: datetime
     status: TaskStatus
     done_hr: float
     estimated_hr: float
+
+
+class TaskPortfolioEntry(BaseModel):
+    id: int
+    description: str
+    status: TaskStatus
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    estimated_hr: float
+    done_hr: float
+    is_repititive: bool
+    is_stopped: bool
+    cycle_count: int
+    completion_rate: float
+    efficiency_score: float
+    deadline_status: str
+    grade: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskTreeNode(BaseModel):
+    id: int
+    description: str
+    status: TaskStatus
+    main_task_id: Optional[int] = None
+    depth: int
+    done_hr: float
+    estimated_hr: float
+    subtree_done_hr: float
+    subtree_estimated_hr: float
+
+    model_config = ConfigDict(from_attributes=True)
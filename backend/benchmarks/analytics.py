@@ -0,0 +1,188 @@
+"""
+Compare per-request analytics cost before and after the running progress
+aggregates (task_progress_stats), at growing history sizes.
+
+    cd backend
+    python -m benchmarks.analytics                  # 1k, 10k and 100k cycles
+    python -m benchmarks.analytics --cycles 500 5000 --legacy-max 5000
+
+"before" loads the whole history and runs the list-based metrics the service
+used to compute (their variance loop is O(n²), so it is skipped above
+``--legacy-max`` cycles); "after" reads the aggregates and runs today's
+metrics. Where both run, their outputs are checked to be identical.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from domain.models.task_model import TaskCreateInput, TaskProgressDomain  # noqa: E402
+from infrastructure.models.model import Base  # noqa: E402
+from infrastructure.repositories.task_repository import TaskRepository  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from usecases.task_usecase import TaskService  # noqa: E402
+
+
+def legacy_time_efficiency(task, progress_history):
+    if not progress_history:
+        return {"efficiency_score": 0, "avg_hours_per_cycle": 0, "cycles_completed": 0, "total_cycles": 0}
+    total_cycles = len(progress_history)
+    total_hours_worked = sum(p.done_hr for p in progress_history)
+    avg_hours_per_cycle = total_hours_worked / total_cycles if total_cycles > 0 else 0
+    efficiency_score = min(100, (task.estimated_hr / avg_hours_per_cycle * 100)) if avg_hours_per_cycle > 0 else 0
+    return {
+        "efficiency_score": round(efficiency_score, 2),
+        "avg_hours_per_cycle": round(avg_hours_per_cycle, 2),
+        "cycles_completed": total_cycles,
+        "total_cycles": total_cycles,
+        "total_hours_worked": round(total_hours_worked, 2),
+    }
+
+
+def legacy_progress_trends(progress_history):
+    if not progress_history:
+        return {"trend": "no_data", "consistency_score": 0, "improvement_rate": 0, "cycles_analyzed": 0}
+    sorted_progress = sorted(progress_history, key=lambda x: x.start_date)
+    hours_per_cycle = [p.done_hr for p in sorted_progress]
+    if len(hours_per_cycle) > 1:
+        variance = sum(
+            (h - sum(hours_per_cycle) / len(hours_per_cycle)) ** 2 for h in hours_per_cycle
+        ) / len(hours_per_cycle)
+        consistency_score = max(0, 100 - (variance * 20))
+    else:
+        consistency_score = 100
+    if len(hours_per_cycle) >= 2:
+        first_half = hours_per_cycle[:len(hours_per_cycle) // 2]
+        second_half = hours_per_cycle[len(hours_per_cycle) // 2:]
+        avg_first = sum(first_half) / len(first_half)
+        avg_second = sum(second_half) / len(second_half)
+        improvement_rate = ((avg_second - avg_first) / avg_first * 100) if avg_first > 0 else 0
+    else:
+        improvement_rate = 0
+    if len(hours_per_cycle) >= 3:
+        recent_avg = sum(hours_per_cycle[-3:]) / 3
+        earlier_avg = sum(hours_per_cycle[:3]) / 3
+        if recent_avg > earlier_avg * 1.1:
+            trend = "improving"
+        elif recent_avg < earlier_avg * 0.9:
+            trend = "declining"
+        else:
+            trend = "stable"
+    else:
+        trend = "insufficient_data"
+    return {
+        "trend": trend,
+        "consistency_score": round(consistency_score, 2),
+        "improvement_rate": round(improvement_rate, 2),
+        "cycles_analyzed": len(hours_per_cycle),
+        "recent_performance": hours_per_cycle[-2:] if len(hours_per_cycle) >= 2 else hours_per_cycle,
+    }
+
+
+def legacy_performance_indicators(task, progress_history):
+    if not progress_history:
+        return {"productivity_score": 0, "reliability_score": 0, "quality_score": 0, "overall_performance": 0}
+    total_estimated = sum(p.estimated_hr for p in progress_history)
+    total_done = sum(p.done_hr for p in progress_history)
+    productivity_score = min(100, (total_done / total_estimated * 100)) if total_estimated > 0 else 0
+    reliability_scores = [
+        min(100, (p.done_hr / p.estimated_hr * 100)) for p in progress_history if p.estimated_hr > 0
+    ]
+    reliability_score = sum(reliability_scores) / len(reliability_scores) if reliability_scores else 0
+    quality_score = reliability_score
+    overall_performance = productivity_score * 0.4 + reliability_score * 0.3 + quality_score * 0.3
+    return {
+        "productivity_score": round(productivity_score, 2),
+        "reliability_score": round(reliability_score, 2),
+        "quality_score": round(quality_score, 2),
+        "overall_performance": round(overall_performance, 2),
+    }
+
+
+def timed(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+async def atimed(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+async def run(cycles: int, legacy_max: int, repeat: int):
+    rng = random.Random(cycles)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        repo = TaskRepository(session)
+        start = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        task = await repo.create_task(
+            TaskCreateInput(description="daily", start_date=start, end_date=start + timedelta(days=1), estimated_hr=4),
+            owner_id=1,
+        )
+        history = [
+            TaskProgressDomain(
+                task_id=task.id,
+                start_date=start + timedelta(days=i),
+                end_date=start + timedelta(days=i + 1),
+                status="completed",
+                done_hr=round(rng.uniform(0, 6), 2),
+                estimated_hr=rng.choice((0.0, 2.0, 4.0)),
+            )
+            for i in range(cycles)
+        ]
+        for chunk in range(0, cycles, 5000):
+            await repo.bulk_create_progress(history[chunk:chunk + 5000])
+        await session.commit()
+
+        service = TaskService(None)
+        stats, read_after = await atimed(repeat, lambda: repo.get_progress_stats(task.id))
+        after, compute_after = timed(repeat, lambda: (
+            service._calculate_time_efficiency(task, stats),
+            service._analyze_progress_trends(stats),
+            service._calculate_performance_indicators(task, stats),
+        ))
+        print(f"\n-- {cycles} cycles")
+        print(f"   after:  read {read_after:9.3f} ms   compute {compute_after:9.3f} ms")
+
+        if cycles > legacy_max:
+            print(f"   before: skipped (above --legacy-max {legacy_max})")
+        else:
+            loaded, read_before = await atimed(repeat, lambda: repo.get_progress(task.id, limit=cycles))
+            before, compute_before = timed(repeat, lambda: (
+                legacy_time_efficiency(task, history),
+                legacy_progress_trends(history),
+                legacy_performance_indicators(task, history),
+            ))
+            print(f"   before: read {read_before:9.3f} ms   compute {compute_before:9.3f} ms")
+            print(f"   identical results: {before == after}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for cycles in args.cycles:
+        asyncio.run(run(cycles, args.legacy_max, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
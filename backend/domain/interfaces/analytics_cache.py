@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional, Tuple
+
+
+class IAnalyticsCache(ABC):
+    @abstractmethod
+    async def get(self, task_id: int) -> Tuple[Optional[Any], int]:
+        """Return (cached payload or None, the task's current version)"""
+        pass
+
+    @abstractmethod
+    async def set(self, task_id: int, version: int, payload: Any):
+        """Store a payload computed while the task was at ``version``"""
+        pass
+
+    @abstractmethod
+    async def invalidate(self, task_ids: Iterable[int]):
+        """Bump the version of each task so earlier payloads are never served again"""
+        pass
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from datetime import date
-from typing import Optional
+from datetime import date, time
+from typing import Dict, List, Optional, Set, Tuple
 
 from domain.models.dayplan_model import DayPlan, TimeLog, TimeLogCreate
 
@@ -27,8 +27,32 @@ class AbstractDayPlanRepository(ABC):
     def deleteTimeLog(self, id: int) -> Optional[TimeLog]:
         pass
 
+    @abstractmethod
+    async def dayplan_exists(self, id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def has_overlapping_time_log(self, plan_id: int, start_time: time, end_time: time) -> bool:
+        """True if a time log in the plan overlaps [start_time, end_time)."""
+        pass
+
     @abstractmethod
     def create_time_log(self, time_log: TimeLogCreate) -> TimeLog:
+        """Raises BadRequestError if the log overlaps one inserted concurrently."""
+        pass
+
+    @abstractmethod
+    async def get_existing_dayplan_ids(self, ids: List[int]) -> Set[int]:
+        pass
+
+    @abstractmethod
+    async def get_time_log_ranges(self, plan_ids: List[int]) -> Dict[int, List[Tuple[time, time]]]:
+        """Existing (start_time, end_time) pairs per plan, sorted by start_time."""
+        pass
+
+    @abstractmethod
+    async def bulk_create_time_logs(self, time_logs: List[TimeLogCreate]) -> List[TimeLog]:
+        """Insert in one statement; results come back in input order."""
         pass
 
     @abstractmethod
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from domain.models.email_model import OutboxEmail
+
+
+class IEmailOutboxRepository(ABC):
+    @abstractmethod
+    async def enqueue(self, to: str, subject: str, html_body: str) -> int:
+        """Store a message for later delivery and return its id."""
+        pass
+
+    @abstractmethod
+    async def claim_batch(self, now: datetime, limit: int, lease_seconds: float) -> List[OutboxEmail]:
+        """
+        Lock up to ``limit`` messages that are due and lease them for
+        ``lease_seconds``, so a crashed sender's messages become due again.
+        """
+        pass
+
+    @abstractmethod
+    async def mark_sent(self, ids: List[int], sent_at: datetime):
+        pass
+
+    @abstractmethod
+    async def mark_failed(self, id: int, error: str, next_attempt_at: datetime, give_up: bool = False):
+        """Record a failed attempt and schedule the retry, or give up on the message."""
+        pass
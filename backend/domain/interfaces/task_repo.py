@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from domain.models.task_model import TaskCreateInput, TaskOutput, TaskProgressDomain
+from domain.models.task_model import (
+    StopProgressDomain,
+    TaskCreateInput,
+    TaskOutput,
+    TaskPortfolioEntry,
+    TaskProgressDomain,
+    TaskProgressStatsDomain,
+    TaskTreeNode,
+)
 
 
 class AbstractTaskRepository(ABC):
@@ -10,7 +19,45 @@ class AbstractTaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_tasks(self, skip: int = 0, limit: int = 100) -> List[TaskOutput]:
+    async def is_in_subtree(self, root_id: int, task_id: int) -> bool:
+        """True if task_id is root_id or one of its descendants."""
+        pass
+
+    @abstractmethod
+    async def get_subtree(self, task_id: int) -> List[TaskTreeNode]:
+        """The task and all its descendants, by depth, with per-node subtree totals."""
+        pass
+
+    @abstractmethod
+    async def get_ancestors(self, task_id: int, user_id: int) -> List[TaskTreeNode]:
+        """Ancestors the user can see, root first, with per-node subtree totals."""
+        pass
+
+    @abstractmethod
+    async def propagate_done_hours(self, task_id: int, hours: float) -> Dict[int, Tuple[float, str]]:
+        """
+        Add hours to a task, completing it and its ancestors while their
+        done_hr reaches the estimate. Returns {task_id: (done_hr, status)}.
+        """
+        pass
+
+    @abstractmethod
+    async def get_tasks_by_ids(self, task_ids: List[int]) -> List[TaskOutput]:
+        """Fetch several tasks in one query; missing ids are skipped."""
+        pass
+
+    @abstractmethod
+    async def get_tasks(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TaskOutput]:
+        """
+        Returns the open tasks owned by or assigned to ``user_id``, ordered by
+        ``(end_date, id)``. ``after`` is a keyset cursor and takes precedence over ``skip``.
+        """
         pass
 
     @abstractmethod
@@ -25,6 +72,39 @@ class AbstractTaskRepository(ABC):
     async def create_progress(self, progress: TaskProgressDomain) -> TaskProgressDomain:
         pass
 
+    @abstractmethod
+    async def bulk_create_progress(self, progress: List[TaskProgressDomain]) -> int:
+        """
+        Inserts many progress rows in one statement. Returns the number of rows written.
+        """
+        pass
+
+    @abstractmethod
+    async def advance_repetitive_tasks(self, windows: Dict[int, Tuple[datetime, datetime]]) -> int:
+        """
+        Moves every task id in ``windows`` to its new (start_date, end_date) and resets
+        it to a fresh in_progress cycle with one set-based update.
+        """
+        pass
+
+    @abstractmethod
+    async def get_due_repetitive_task_ids(
+        self, now: datetime, limit: int = 100, after_id: int = 0
+    ) -> List[int]:
+        """
+        Returns up to ``limit`` ids, ascending and greater than ``after_id``, of running
+        repetitive tasks whose end_date is not after ``now``.
+        """
+        pass
+
+    @abstractmethod
+    async def get_due_repetitive_tasks(self, task_ids: List[int], now: datetime) -> List[TaskOutput]:
+        """
+        Locks and returns the tasks among ``task_ids`` that are still due for a rollover,
+        skipping rows another worker already holds.
+        """
+        pass
+
     @abstractmethod
     async def assign_user_to_task(
         self, task_id: int, assignee_email: str
@@ -37,12 +117,13 @@ class AbstractTaskRepository(ABC):
     @abstractmethod
     async def update_task(self, task_id: int, data: dict) -> Optional[TaskOutput]:
         """
-        Returns (TaskOutput, None) on success, or (None, error_message) on failure.
+        Sets the non-None columns in ``data`` with one UPDATE ... RETURNING.
+        Returns the updated task, or None if it doesn't exist.
         """
         pass
 
     @abstractmethod
-    async def create_stop(self, task_id: int):
+    async def create_stop(self, task_id: int) -> StopProgressDomain:
         pass
 
     @abstractmethod
@@ -50,12 +131,83 @@ class AbstractTaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_stop(self, task_id: int):
+    async def get_stop(self, task_id: int) -> Optional[StopProgressDomain]:
+        pass
+
+    @abstractmethod
+    async def get_progress(
+        self,
+        task_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TaskProgressDomain]:
+        """
+        Progress cycles newest first by ``(start_date, id)``. ``before`` is a keyset
+        cursor (the last row's ``(start_date, id)``) and takes precedence over ``skip``.
+        """
+        pass
+
+    @abstractmethod
+    async def get_stop_progress(self, task_id: int) -> List[datetime]:
+        """When the task was stopped, oldest first."""
+        pass
+
+    @abstractmethod
+    async def get_progress_stats(self, task_id: int) -> TaskProgressStatsDomain:
+        """Running aggregates over the task's progress cycles; empty if it has none."""
+        pass
+
+    @abstractmethod
+    async def get_portfolio(self, user_id: int, skip: int = 0, limit: int = 100) -> List[TaskPortfolioEntry]:
+        """
+        Every task owned by or assigned to ``user_id`` with its completion rate and
+        cycle efficiency (from the running progress aggregates), ordered by
+        ``(end_date, id)``, in one query.
+        """
         pass
 
     @abstractmethod
-    async def get_progress(self, task_id: int, skip: int = 0, limit: int = 100):
+    async def get_task_visibility(self, task_ids: List[int], user_id: int) -> Dict[int, bool]:
+        """Map each existing id in ``task_ids`` to whether ``user_id`` owns or is assigned it."""
         pass
+
+    @abstractmethod
+    async def bulk_create_tasks(
+        self, tasks: List[TaskCreateInput], parents: List[Optional[int]], owner_id: int
+    ) -> List[TaskOutput]:
+        """
+        Insert the tasks and their closure rows. ``parents[i]`` is the batch index of
+        task ``i``'s parent (an earlier item), or None to use its ``main_task_id``.
+        """
+        pass
+
+    @abstractmethod
+    async def bulk_update_tasks(self, changes: Dict[int, dict]) -> List[TaskOutput]:
+        """
+        Apply ``{task_id: {column: value}}`` in a single UPDATE (None values and
+        ``main_task_id`` are ignored) and return the updated tasks in id order.
+        """
+        pass
+
+    @abstractmethod
+    def export_columns(self) -> List[str]:
+        """Union of the column names of every exported table, in table order."""
+        pass
+
+    @abstractmethod
+    def stream_export(self, user_id: int, batch_size: int = 1000) -> AsyncIterator[Tuple[str, List[dict]]]:
+        """
+        Async iterator of ``(table name, rows)`` batches covering the user's tasks,
+        ``task_progress``, ``stop_progress`` and ``times``, read off a server-side cursor.
+        """
+        pass
+
+    @abstractmethod
+    async def rebuild_progress_stats(self, task_ids: List[int]) -> int:
+        """Recompute the aggregates of the given tasks from their full progress history."""
+        pass
+
     @abstractmethod
-    async def get_tasks_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[TaskOutput]:
+    async def get_tasks_by_name(self, name: str, user_id: int, skip: int = 0, limit: int = 100) -> List[TaskOutput]:
         pass
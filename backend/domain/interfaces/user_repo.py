@@ -17,6 +17,11 @@ class IUserRepository(ABC):
     async def update_user(self, user_id: int, **kwargs):
         pass
 
+    @abstractmethod
+    async def has_any_user(self) -> bool:
+        """Return True if at least one user exists."""
+        pass
+
     @abstractmethod
     async def get_all_users(self):
         pass
\ No newline at end of file
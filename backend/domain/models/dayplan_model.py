@@ -26,3 +26,11 @@ class TimeLog(TimeLogCreate):
     id: int
     done: bool
     task: "TaskOutput"
+
+
+@dataclass
+class TimeLogResult:
+    """Outcome of one item in a batch create: the created log or why it was rejected."""
+    index: int
+    time_log: Optional[TimeLog] = None
+    error: Optional[str] = None
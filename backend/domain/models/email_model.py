@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class OutboxEmail:
+    id: int
+    to: str
+    subject: str
+    html_body: str
+    attempts: int = 0
+    created_at: Optional[datetime] = None
@@ -24,6 +24,12 @@ class TaskCreateInput:
     main_task_id: Optional[int] = None
 
 
+@dataclass
+class TaskImportInput(TaskCreateInput):
+    """A task to import; ``parent_index`` points at an earlier item of the same batch."""
+    parent_index: Optional[int] = None
+
+
 @dataclass
 class TaskOutput:
     id: int
@@ -41,6 +47,22 @@ class TaskOutput:
     assignees: List[int] = field(default_factory=list)
     
 
+@dataclass
+class TaskImportResult:
+    """Outcome of one item in a bulk import: the created task or why it was rejected."""
+    index: int
+    task: Optional[TaskOutput] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class TaskUpdateResult:
+    """Outcome of one task in a bulk update: the updated task or why it was left alone."""
+    task_id: int
+    task: Optional[TaskOutput] = None
+    error: Optional[str] = None
+
+
 @dataclass
 class TimeTask:
     id: int
@@ -77,3 +99,72 @@ class TaskProgressDomain:
     status: TaskStatus
     done_hr: float
     estimated_hr: float
+    id: Optional[int] = None
+
+
+@dataclass
+class StopProgressDomain:
+    id: int
+    task_id: int
+    stopped_at: datetime
+
+
+PROGRESS_TREND_WINDOW = 3
+
+
+@dataclass
+class TaskProgressStatsDomain:
+    """
+    Aggregates over a task's progress cycles in start_date order. Windows are
+    the first and last ``PROGRESS_TREND_WINDOW`` cycles (fewer if the task has
+    fewer); ``first_half_done_hr`` covers the first ``cycle_count // 2`` cycles
+    and ``recent_done_hr`` holds the last two cycles, oldest first.
+    """
+
+    cycle_count: int = 0
+    done_hr_sum: float = 0.0
+    done_hr_sq_sum: float = 0.0
+    estimated_hr_sum: float = 0.0
+    completion_pct_sum: float = 0.0
+    estimated_cycle_count: int = 0
+    first_half_done_hr: float = 0.0
+    first_window_done_hr: float = 0.0
+    last_window_done_hr: float = 0.0
+    recent_done_hr: List[float] = field(default_factory=list)
+
+
+@dataclass
+class TaskPortfolioEntry:
+    """
+    One row of a user's analytics dashboard. ``completion_rate`` and
+    ``efficiency_score`` come out of the query; the service fills in
+    ``deadline_status`` and ``grade``.
+    """
+
+    id: int
+    description: str
+    status: TaskStatus
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    estimated_hr: float
+    done_hr: float
+    is_repititive: bool
+    is_stopped: bool
+    cycle_count: int
+    completion_rate: float
+    efficiency_score: float
+    deadline_status: Optional[str] = None
+    grade: Optional[str] = None
+
+
+@dataclass
+class TaskTreeNode:
+    id: int
+    description: str
+    status: TaskStatus
+    depth: int
+    done_hr: float
+    estimated_hr: float
+    subtree_done_hr: float
+    subtree_estimated_hr: float
+    main_task_id: Optional[int] = None
@@ -1,16 +1,184 @@
 import asyncio
 import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
 
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class DatabaseSettings:
+    """
+    Engine configuration, read from the environment by ``from_env``:
+
+    DB_ECHO, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS and DB_USE_NULL_POOL (for pgbouncer
+    in transaction mode, where pooling happens outside the app).
+    """
+
+    url: str
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_timeout_ms: Optional[int] = None
+    use_null_pool: bool = False
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        statement_timeout = os.getenv("DB_STATEMENT_TIMEOUT_MS")
+        return cls(
+            url=DATABASE_URL,
+            echo=_env_bool("DB_ECHO", False),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            statement_timeout_ms=int(statement_timeout) if statement_timeout else None,
+            use_null_pool=_env_bool("DB_USE_NULL_POOL", False),
+        )
+
+
+class PoolMetrics:
+    """Counters fed by the pool: checkouts, connections and time spent waiting for one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.wait_count = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_count += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checkouts - self.checkins,
+                "invalidations": self.invalidations,
+                "avg_wait_ms": round(self.total_wait_seconds / self.wait_count * 1000, 3)
+                if self.wait_count
+                else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
+
+
+def engine_options(settings: DatabaseSettings) -> dict:
+    url = make_url(settings.url)
+    options = {"echo": settings.echo}
+    connect_args = {}
+
+    if url.get_backend_name() == "postgresql" and settings.statement_timeout_ms:
+        if url.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.statement_timeout_ms)
+            }
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.statement_timeout_ms}"
+
+    if settings.use_null_pool:
+        options["poolclass"] = NullPool
+        if url.get_driver_name() == "asyncpg":
+            # pgbouncer in transaction mode can't keep prepared statements per connection
+            connect_args["statement_cache_size"] = 0
+    elif url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=settings.pool_pre_ping,
+        )
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def create_engine_from_settings(settings: DatabaseSettings):
+    engine = create_async_engine(settings.url, **engine_options(settings))
+    pool_events = {
+        "connect": "connects",
+        "checkout": "checkouts",
+        "checkin": "checkins",
+        "invalidate": "invalidations",
+    }
+    for event_name, counter in pool_events.items():
+        event.listen(
+            engine.sync_engine,
+            event_name,
+            lambda *args, counter=counter: pool_metrics.increment(counter),
+        )
+    return engine
+
+
+def get_pool_metrics() -> dict:
+    metrics = pool_metrics.snapshot()
+    pool = engine.sync_engine.pool
+    metrics["pool_class"] = type(pool).__name__
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            pool_size=pool.size(),
+            pool_checked_in=pool.checkedin(),
+            pool_checked_out=pool.checkedout(),
+            pool_overflow=pool.overflow(),
+        )
+    return metrics
+
+
+engine = create_engine_from_settings(DatabaseSettings.from_env())
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -43,4 +211,4 @@ async def get_db():
                 await asyncio.sleep(delay_seconds)
             else:
                 print("Could not connect to DB after multiple attempts!")
-                raise
\ No newline at end of file
+                raise
@@ -1,3 +1,5 @@
+from enum import Enum
+
 from domain.models.task_model import (
     TaskCreateInput,
     TaskOutput,
@@ -5,23 +7,25 @@ from domain.models.task_model import (
     TaskStatus,
 )
 from infrastructure.models.model import Task as ORMTask
-from infrastructure.models.model import TaskProgress as ORMTaskProgress
 
 
-def domain_to_orm_task_create(domain_task: TaskCreateInput, owner_id: int) -> ORMTask:
-    orm_task = ORMTask(
-        description=domain_task.description,
-        end_date=domain_task.end_date,
-        estimated_hr=domain_task.estimated_hr,
-        is_repititive=domain_task.is_repititive,
-        status=domain_task.status.value,  # Enum to string
-        start_date=domain_task.start_date,
-        main_task_id=domain_task.main_task_id,
-        owner_id=owner_id,
-        done_hr=0.0,
-        is_stopped=False,
-    )
-    return orm_task
+def domain_to_task_row(domain_task: TaskCreateInput, owner_id: int) -> dict:
+    return {
+        "description": domain_task.description,
+        "end_date": domain_task.end_date,
+        "estimated_hr": domain_task.estimated_hr,
+        "is_repititive": domain_task.is_repititive,
+        "status": (
+            domain_task.status.value
+            if isinstance(domain_task.status, Enum)
+            else domain_task.status
+        ),
+        "start_date": domain_task.start_date,
+        "main_task_id": domain_task.main_task_id,
+        "owner_id": owner_id,
+        "done_hr": 0.0,
+        "is_stopped": False,
+    }
 
 
 def orm_to_domain_task_output(orm_task: ORMTask) -> TaskOutput:
@@ -52,27 +56,28 @@ def orm_to_domain_task_output(orm_task: ORMTask) -> TaskOutput:
 # Domain -> ORM
 
 
-def domain_to_orm_task_progress(domain: TaskProgressDomain) -> ORMTaskProgress:
-    orm = ORMTaskProgress(
-        task_id=domain.task_id,
-        start_date=domain.start_date,
-        end_date=domain.end_date,
-        status=(
+def domain_to_task_progress_row(domain: TaskProgressDomain) -> dict:
+    return {
+        "task_id": domain.task_id,
+        "start_date": domain.start_date,
+        "end_date": domain.end_date,
+        "status": (
             domain.status.value
             if isinstance(domain.status, TaskStatus)
             else domain.status
         ),
-        done_hr=domain.done_hr,
-        estimated_hr=domain.estimated_hr,
-    )
-    return orm
+        "done_hr": domain.done_hr,
+        "estimated_hr": domain.estimated_hr,
+    }
 
 
 # ORM -> Domain
 
 
-def orm_to_domain_task_progress(orm: ORMTaskProgress) -> TaskProgressDomain:
+def orm_to_domain_task_progress(orm) -> TaskProgressDomain:
+    # ``orm`` is a TaskProgress instance or a RETURNING row with the same columns.
     return TaskProgressDomain(
+        id=orm.id,
         task_id=orm.task_id,
         start_date=orm.start_date,
         end_date=orm.end_date,
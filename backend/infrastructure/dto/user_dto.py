@@ -1,5 +1,13 @@
 from domain.models.user_model import User, UserRegister
 from infrastructure.models.model import User as UserModel
+from sqlalchemy import inspect
+
+
+def _loaded_task_ids(user_model: UserModel, relationship: str):
+    # task lists are only filled in when the query's loading profile included them
+    if relationship in inspect(user_model).unloaded:
+        return []
+    return [task.id for task in getattr(user_model, relationship)]
 
 
 def create_domain_user_from_model(user_model: UserModel) -> User:
@@ -10,8 +18,8 @@ def create_domain_user_from_model(user_model: UserModel) -> User:
         verified=user_model.verified,
         role=user_model.role,
         email=user_model.email,
-        assigned_tasks=[task.id for task in user_model.assigned_tasks],
-        my_tasks=[task.id for task in user_model.my_tasks],
+        assigned_tasks=_loaded_task_ids(user_model, "assigned_tasks"),
+        my_tasks=_loaded_task_ids(user_model, "my_tasks"),
     )
 
 
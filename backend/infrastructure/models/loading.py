@@ -0,0 +1,30 @@
+"""
+Named eager-loading profiles.
+
+Every relationship in ``model.py`` is declared ``lazy="raise"``, so a query loads
+nothing beyond its own row unless it opts in. Each profile below lists exactly
+what the matching DTO mapper reads; repositories pass it as ``.options(*PROFILE)``.
+"""
+from infrastructure.models.model import DayPlan, Task, TimeLog, Token, User
+from sqlalchemy.orm import joinedload, selectinload
+
+# orm_to_domain_task_output: subtask ids and assignee ids
+TASK_LIST = (
+    selectinload(Task.subtasks).load_only(Task.id),
+    selectinload(Task.assignees).load_only(User.id),
+)
+
+# A single task maps through the same DTO as the list, so it needs the same ids.
+TASK_DETAIL = TASK_LIST
+
+# create_domain_user_from_model: user columns only, task id lists stay empty
+AUTH_LOOKUP = ()
+
+# TokenRepository.FindByID: the token plus the columns of its user
+TOKEN_WITH_USER = (joinedload(Token.user),)
+
+# orm_to_domain_dayplan: every time log and the task columns of each log
+DAYPLAN_VIEW = (selectinload(DayPlan.times).joinedload(TimeLog.task),)
+
+# orm_to_domain_timelog: the log and its task columns
+TIMELOG_DETAIL = (joinedload(TimeLog.task),)
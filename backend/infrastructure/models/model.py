@@ -1,17 +1,22 @@
 from infrastructure.db.session import Base
 from sqlalchemy import (
     Boolean,
+    DDL,
     Column,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Time,
+    UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import literal_column
 from sqlalchemy.sql import func
 
 
@@ -29,22 +34,25 @@ class User(Base):
         "Task",
         secondary="task_assignees",
         back_populates="assignees",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     my_tasks = relationship(
         "Task",
         back_populates="owner",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     tokens = relationship(
         "Token",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     day_plans = relationship(
-        "DayPlan", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
+        "DayPlan", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
 
 
@@ -60,26 +68,60 @@ class Task(Base):
     is_repititive = Column(Boolean, default=False)
     status = Column(String, default="pending")
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    main_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
+    main_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True, index=True)
     is_stopped = Column(Boolean, default=False, nullable=False)
 
-    main_task = relationship("Task", remote_side=[id], back_populates="subtasks", lazy="selectin")
+    __table_args__ = (
+        Index("ix_tasks_owner_id_status", "owner_id", "status"),
+        Index("ix_tasks_status", "status"),
+    )
+
+    main_task = relationship("Task", remote_side=[id], back_populates="subtasks", lazy="raise")
     subtasks = relationship(
-        "Task", back_populates="main_task", cascade="all, delete-orphan", lazy="selectin"
+        "Task", back_populates="main_task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
     time_logs = relationship(
-        "TimeLog", back_populates="task", cascade="all, delete-orphan", lazy="selectin"
+        "TimeLog", back_populates="task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
     progress = relationship(
-        "TaskProgress", back_populates="task", cascade="all, delete-orphan", lazy="selectin"
+        "TaskProgress", back_populates="task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
     stop_progress = relationship(
-        "StopProgress", back_populates="task", cascade="all, delete-orphan", lazy="selectin"
+        "StopProgress", back_populates="task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
     assignees = relationship(
-        "User", secondary="task_assignees", back_populates="assigned_tasks", lazy="selectin"
+        "User",
+        secondary="task_assignees",
+        back_populates="assigned_tasks",
+        passive_deletes=True,
+        lazy="raise",
     )
-    owner = relationship("User", foreign_keys=[owner_id], back_populates="my_tasks", lazy="selectin")
+    owner = relationship("User", foreign_keys=[owner_id], back_populates="my_tasks", lazy="raise")
+
+
+# Full-text search over Task.description. On Postgres the migration adds a GIN
+# expression index on TASK_SEARCH_VECTOR; SQLite (tests, local dev) gets an
+# external-content FTS5 table kept in sync by triggers.
+# Constants are inlined (not bound) so the planner can match the index expression.
+TASK_SEARCH_CONFIG = literal_column("'simple'::regconfig")
+TASK_SEARCH_VECTOR = func.to_tsvector(
+    TASK_SEARCH_CONFIG, func.coalesce(Task.description, literal_column("''"))
+)
+
+for _ddl in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO tasks_fts(rowid, description) VALUES (new.id, new.description); END",
+):
+    event.listen(Task.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__, "before_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite")
+)
 
 
 task_assignees = Table(
@@ -87,6 +129,20 @@ task_assignees = Table(
     Base.metadata,
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE")),
     Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE")),
+    Index("ix_task_assignees_user_id_task_id", "user_id", "task_id"),
+    Index("ix_task_assignees_task_id", "task_id"),
+)
+
+
+# Closure table over Task.main_task_id: one row per (ancestor, descendant) pair,
+# including each task with itself at depth 0. Maintained by TaskRepository.
+task_closure = Table(
+    "task_closure",
+    Base.metadata,
+    Column("ancestor_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("depth", Integer, nullable=False),
+    Index("ix_task_closure_descendant_id_depth", "descendant_id", "depth"),
 )
 
 
@@ -96,9 +152,11 @@ class DayPlan(Base):
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    user = relationship("User", back_populates="day_plans", lazy="selectin")
+    user = relationship("User", back_populates="day_plans", lazy="raise")
 
-    times = relationship("TimeLog", back_populates="plan", cascade="all, delete-orphan", lazy="selectin")
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_plans_user_id_date"),)
+
+    times = relationship("TimeLog", back_populates="plan", cascade="all, delete-orphan", passive_deletes=True, lazy="raise")
 
 
 class TimeLog(Base):
@@ -107,12 +165,18 @@ class TimeLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     start_time = Column(Time)
     end_time = Column(Time)
-    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"))
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
     plan_id = Column(Integer, ForeignKey("plans.id", ondelete="CASCADE"))
     done = Column(Boolean, default=False)
 
-    plan = relationship("DayPlan", back_populates="times", lazy="selectin")
-    task = relationship("Task", back_populates="time_logs", lazy="selectin")
+    plan = relationship("DayPlan", back_populates="times", lazy="raise")
+    task = relationship("Task", back_populates="time_logs", lazy="raise")
+
+    # Serves the overlap probe. On Postgres the migration also adds the
+    # ex_times_no_overlap exclusion constraint over timerange(start_time, end_time).
+    __table_args__ = (
+        Index("ix_times_plan_id_start_time_end_time", "plan_id", "start_time", "end_time"),
+    )
 
 
 class TaskProgress(Base):
@@ -125,27 +189,69 @@ class TaskProgress(Base):
     status = Column(String)
     done_hr = Column(Float, default=0.0)
     estimated_hr = Column(Float)
+    # 1-based position in the task's history and the running done_hr total up to
+    # and including this cycle; lets analytics read window sums by cycle_no.
+    cycle_no = Column(Integer, nullable=True)
+    cumulative_done_hr = Column(Float, nullable=True)
+
+    task = relationship("Task", back_populates="progress", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_task_progress_task_id_start_date", "task_id", "start_date"),
+        Index("ix_task_progress_task_id_cycle_no", "task_id", "cycle_no"),
+    )
 
-    task = relationship("Task", back_populates="progress", lazy="selectin")
+
+class TaskProgressStats(Base):
+    """Running aggregates over a task's progress history, updated as cycles are recorded."""
+
+    __tablename__ = "task_progress_stats"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    cycle_count = Column(Integer, default=0, nullable=False)
+    done_hr_sum = Column(Float, default=0.0, nullable=False)
+    done_hr_sq_sum = Column(Float, default=0.0, nullable=False)
+    estimated_hr_sum = Column(Float, default=0.0, nullable=False)
+    # Sum of min(100, done_hr / estimated_hr * 100) over cycles with an estimate
+    completion_pct_sum = Column(Float, default=0.0, nullable=False)
+    estimated_cycle_count = Column(Integer, default=0, nullable=False)
+    first_window_done_hr = Column(Float, default=0.0, nullable=False)
 
 
 class StopProgress(Base):
     __tablename__ = "stop_progress"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"))
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
     stopped_at = Column(DateTime(timezone=True))
 
-    task = relationship("Task", back_populates="stop_progress", lazy="selectin")
+    task = relationship("Task", back_populates="stop_progress", lazy="raise")
 
 
 class Token(Base):
     __tablename__ = "tokens"
 
     id = Column(String, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     token = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expired_at = Column(DateTime(timezone=True))
 
-    user = relationship("User", back_populates="tokens", lazy="selectin")
+    user = relationship("User", back_populates="tokens", lazy="raise")
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(String, nullable=False)
+    status = Column(String, default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),)
@@ -1,5 +1,7 @@
-from datetime import date
+from datetime import date, time
+from typing import Dict, List, Set, Tuple
 
+from domain.exceptions import BadRequestError
 from domain.interfaces.dayplan_repo import AbstractDayPlanRepository
 from domain.models.dayplan_model import TimeLog as dTimeLog
 from domain.models.dayplan_model import TimeLogCreate
@@ -8,10 +10,11 @@ from infrastructure.dto.dayplan_dto import (
     orm_to_domain_dayplan,
     orm_to_domain_timelog,
 )
+from infrastructure.models.loading import DAYPLAN_VIEW, TIMELOG_DETAIL
 from infrastructure.models.model import DayPlan, TimeLog
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 
 class DayPlanRepository(AbstractDayPlanRepository):
@@ -23,9 +26,17 @@ class DayPlanRepository(AbstractDayPlanRepository):
     # ------------------------------
     async def create_dayplan(self, date: date, current_user) -> DayPlan:
         dayplan = DayPlan(date=date, user_id=current_user.id)
-        self.db.add(dayplan)
-        # No commit here
-        await self.db.flush()  # Ensure id is generated
+        try:
+            async with self.db.begin_nested():
+                self.db.add(dayplan)
+                # No commit here
+                await self.db.flush()  # Ensure id is generated
+        except IntegrityError:
+            # uq_plans_user_id_date: a concurrent request created today's plan first.
+            existing = await self.get_dayplan(date, current_user)
+            if existing:
+                return existing
+            raise
         return DayPlan(
             id=dayplan.id,
             date=dayplan.date,
@@ -37,10 +48,7 @@ class DayPlanRepository(AbstractDayPlanRepository):
     async def get_dayplan(self, date: date, current_user) -> DayPlan | None:
         result = await self.db.execute(
             select(DayPlan)
-            .options(
-                selectinload(DayPlan.times)            # ✅ load all timelogs
-                .selectinload(TimeLog.task)          # ✅ and each timelog’s task
-            )
+            .options(*DAYPLAN_VIEW)
             .filter(DayPlan.date == date, DayPlan.user_id == current_user.id)
         )
         orm_dayplan = result.scalars().first()
@@ -49,7 +57,9 @@ class DayPlanRepository(AbstractDayPlanRepository):
         return orm_to_domain_dayplan(orm_dayplan)
 
     async def get_dayplanById(self, id: int) -> DayPlan:
-        result = await self.db.execute(select(DayPlan).filter(DayPlan.id == id))
+        result = await self.db.execute(
+            select(DayPlan).options(*DAYPLAN_VIEW).filter(DayPlan.id == id)
+        )
         dayplan = result.scalars().first()
         if not dayplan:
             return None
@@ -57,9 +67,9 @@ class DayPlanRepository(AbstractDayPlanRepository):
 
     async def delete_dayplan(self, date: date, current_user) -> DayPlan | None:
         result = await self.db.execute(
-            select(DayPlan).filter(
-                DayPlan.date == date, DayPlan.user_id == current_user.id
-            )
+            select(DayPlan)
+            .options(*DAYPLAN_VIEW)
+            .filter(DayPlan.date == date, DayPlan.user_id == current_user.id)
         )
         orm_dayplan = result.scalars().first()
         if orm_dayplan:
@@ -72,7 +82,7 @@ class DayPlanRepository(AbstractDayPlanRepository):
     # TimeLog Methods
     # ------------------------------
     async def deleteTimeLog(self, id):
-        result = await self.db.execute(select(TimeLog).filter(TimeLog.id == id))
+        result = await self.db.execute(select(TimeLog).options(*TIMELOG_DETAIL).filter(TimeLog.id == id))
         time_log = result.scalars().first()
         if not time_log:
             return None
@@ -81,10 +91,89 @@ class DayPlanRepository(AbstractDayPlanRepository):
         # No commit
         return orm_to_domain_timelog(time_log)
 
+    async def dayplan_exists(self, id: int) -> bool:
+        result = await self.db.execute(select(select(DayPlan.id).where(DayPlan.id == id).exists()))
+        return bool(result.scalar())
+
+    async def has_overlapping_time_log(self, plan_id: int, start_time, end_time) -> bool:
+        """EXISTS probe on (plan_id, start_time, end_time) for a half-open overlap."""
+        result = await self.db.execute(
+            select(
+                select(TimeLog.id)
+                .where(
+                    TimeLog.plan_id == plan_id,
+                    TimeLog.start_time < end_time,
+                    TimeLog.end_time > start_time,
+                )
+                .exists()
+            )
+        )
+        return bool(result.scalar())
+
+    async def get_existing_dayplan_ids(self, ids: List[int]) -> Set[int]:
+        if not ids:
+            return set()
+        result = await self.db.execute(select(DayPlan.id).where(DayPlan.id.in_(ids)))
+        return set(result.scalars().all())
+
+    async def get_time_log_ranges(self, plan_ids: List[int]) -> Dict[int, List[Tuple[time, time]]]:
+        ranges: Dict[int, List[Tuple[time, time]]] = {plan_id: [] for plan_id in plan_ids}
+        if not plan_ids:
+            return ranges
+        result = await self.db.execute(
+            select(TimeLog.plan_id, TimeLog.start_time, TimeLog.end_time)
+            .where(TimeLog.plan_id.in_(plan_ids))
+            .order_by(TimeLog.plan_id, TimeLog.start_time)
+        )
+        for plan_id, start_time, end_time in result.all():
+            ranges[plan_id].append((start_time, end_time))
+        return ranges
+
+    async def bulk_create_time_logs(self, time_logs: List[TimeLogCreate]) -> List[dTimeLog]:
+        if not time_logs:
+            return []
+        try:
+            result = await self.db.execute(
+                insert(TimeLog)
+                .returning(TimeLog.id, TimeLog.done, sort_by_parameter_order=True),
+                [
+                    {
+                        "task_id": t.task_id,
+                        "start_time": t.start_time,
+                        "end_time": t.end_time,
+                        "plan_id": t.plan_id,
+                        "done": False,
+                    }
+                    for t in time_logs
+                ],
+            )
+        except IntegrityError as e:
+            if "ex_times_no_overlap" in str(e.orig):
+                raise BadRequestError("Time log overlaps with existing time log") from e
+            raise
+        return [
+            dTimeLog(
+                id=id,
+                task_id=t.task_id,
+                start_time=t.start_time,
+                end_time=t.end_time,
+                plan_id=t.plan_id,
+                done=done,
+                task=None,
+            )
+            for t, (id, done) in zip(time_logs, result.all())
+        ]
+
     async def create_time_log(self, time_log: TimeLogCreate):
         db_time_log = domain_to_orm_timelog_create(time_log)
         self.db.add(db_time_log)
-        await self.db.flush()  # Ensure id is generated
+        try:
+            await self.db.flush()  # Ensure id is generated
+        except IntegrityError as e:
+            # Lost a race with a concurrent insert; ex_times_no_overlap caught it.
+            if "ex_times_no_overlap" in str(e.orig):
+                raise BadRequestError("Time log overlaps with existing time log") from e
+            raise
         
         # Create a simple domain model without loading the task relationship
         # to avoid the lazy loading issue
@@ -100,7 +189,7 @@ class DayPlanRepository(AbstractDayPlanRepository):
         )
 
     async def get_time_log(self, id):
-        result = await self.db.execute(select(TimeLog).filter(TimeLog.id == id))
+        result = await self.db.execute(select(TimeLog).options(*TIMELOG_DETAIL).filter(TimeLog.id == id))
         time_log = result.scalars().first()
         if not time_log:
             return None
@@ -110,7 +199,7 @@ class DayPlanRepository(AbstractDayPlanRepository):
         Partially update a TimeLog fields with provided kwargs.
         Does NOT commit; flush is optional to get updated id.
         """
-        result = await self.db.execute(select(TimeLog).filter(TimeLog.id == time_log_id))
+        result = await self.db.execute(select(TimeLog).options(*TIMELOG_DETAIL).filter(TimeLog.id == time_log_id))
         time_log = result.scalars().first()
         if not time_log:
             return None  # or raise NotFoundError
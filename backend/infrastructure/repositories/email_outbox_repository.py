@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from domain.interfaces.email_outbox_repo import IEmailOutboxRepository
+from domain.models.email_model import OutboxEmail
+from infrastructure.models.model import EmailOutbox
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class EmailOutboxRepository(IEmailOutboxRepository):
+    """Outbox rows are written here; committing is left to the caller."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, to: str, subject: str, html_body: str) -> int:
+        result = await self.db.execute(
+            insert(EmailOutbox)
+            .values(
+                to_address=to,
+                subject=subject,
+                html_body=html_body,
+                status="pending",
+                attempts=0,
+                next_attempt_at=datetime.now(timezone.utc),
+            )
+            .returning(EmailOutbox.id)
+        )
+        return result.scalar_one()
+
+    async def claim_batch(self, now: datetime, limit: int, lease_seconds: float) -> List[OutboxEmail]:
+        rows = (
+            await self.db.execute(
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status.in_(("pending", "sending")),
+                    EmailOutbox.next_attempt_at <= now,
+                )
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalars().all()
+        if not rows:
+            return []
+
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_([row.id for row in rows]))
+            .values(
+                status="sending",
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return [
+            OutboxEmail(
+                id=row.id,
+                to=row.to_address,
+                subject=row.subject,
+                html_body=row.html_body,
+                attempts=row.attempts + 1,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+
+    async def mark_sent(self, ids: List[int], sent_at: datetime):
+        if not ids:
+            return
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids))
+            .values(status="sent", sent_at=sent_at, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed(self, id: int, error: str, next_attempt_at: datetime, give_up: bool = False):
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == id)
+            .values(
+                status="failed" if give_up else "pending",
+                last_error=error[:1000],
+                next_attempt_at=next_attempt_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,114 +1,827 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from domain.interfaces.task_repo import AbstractTaskRepository
-from domain.models.task_model import TaskCreateInput, TaskOutput, TaskProgressDomain
+from domain.models.task_model import (
+    PROGRESS_TREND_WINDOW,
+    StopProgressDomain,
+    TaskCreateInput,
+    TaskOutput,
+    TaskPortfolioEntry,
+    TaskProgressDomain,
+    TaskProgressStatsDomain,
+    TaskTreeNode,
+)
 from infrastructure.dto.task_dto import (
-    domain_to_orm_task_create,
-    domain_to_orm_task_progress,
+    domain_to_task_progress_row,
+    domain_to_task_row,
     orm_to_domain_task_output,
     orm_to_domain_task_progress,
 )
-from infrastructure.models.model import StopProgress, Task, TaskProgress, User
-from sqlalchemy import and_
+from infrastructure.models.loading import TASK_DETAIL, TASK_LIST
+from infrastructure.models.model import (
+    TASK_SEARCH_CONFIG,
+    TASK_SEARCH_VECTOR,
+    DayPlan,
+    StopProgress,
+    Task,
+    TaskProgress,
+    TaskProgressStats,
+    TimeLog,
+    User,
+    task_assignees,
+    task_closure,
+)
+from sqlalchemy import (
+    Integer,
+    and_,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    table,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+
+
+def _search_words(name: str) -> List[str]:
+    """Split a search string into words safe to embed in tsquery/FTS5 syntax."""
+    return "".join(c if c.isalnum() else " " for c in name).lower().split()
+
+
+# Tables covered by stream_export, in the order they are emitted
+_EXPORT_MODELS = (Task, TaskProgress, StopProgress, TimeLog)
 
 
 class TaskRepository(AbstractTaskRepository):
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Tasks whose analytics inputs were written; the unit of work
+        # invalidates their cached analytics once the transaction commits.
+        self.changed_task_ids: Set[int] = set()
 
     async def get_task(self, task_id: int) -> Optional[TaskOutput]:
         result = await self.db.execute(
             select(Task)
-            .options(
-                selectinload(Task.subtasks),
-                selectinload(Task.assignees)
-            )
+            .options(*TASK_DETAIL)
             .filter(Task.id == task_id)
         )
         task = result.scalar_one_or_none()
         return orm_to_domain_task_output(task) if task else None
 
-    async def get_tasks(self, skip: int = 0, limit: int = 100) -> List[TaskOutput]:
+    async def propagate_done_hours(
+        self, task_id: int, hours: float, max_depth: int = 100
+    ) -> Dict[int, Tuple[float, str]]:
+        """
+        Add ``hours`` to a task and roll completion up its ``main_task_id``
+        chain in one recursive CTE UPDATE. A task whose done_hr reaches its
+        estimate is completed and adds its estimate to the parent; the walk
+        stops at the first ancestor that doesn't complete, which only gets its
+        done_hr bumped (and moves from pending to in_progress).
+
+        Returns ``{task_id: (done_hr, status)}`` for every updated task.
+        """
+        parent = aliased(Task)
+        chain = (
+            select(
+                Task.id,
+                Task.main_task_id,
+                Task.estimated_hr,
+                (Task.done_hr + hours).label("new_done"),
+                (Task.done_hr + hours >= Task.estimated_hr).label("completes"),
+                literal_column("0").label("depth"),
+            )
+            .where(Task.id == task_id)
+            .cte("chain", recursive=True)
+        )
+        chain = chain.union_all(
+            select(
+                parent.id,
+                parent.main_task_id,
+                parent.estimated_hr,
+                (parent.done_hr + chain.c.estimated_hr).label("new_done"),
+                (parent.done_hr + chain.c.estimated_hr >= parent.estimated_hr).label("completes"),
+                (chain.c.depth + 1).label("depth"),
+            )
+            .join(chain, parent.id == chain.c.main_task_id)
+            .where(chain.c.completes, chain.c.depth < max_depth)
+        )
         result = await self.db.execute(
-            select(Task).filter(Task.status!="completed")
-            .options(
-                selectinload(Task.assignees),
-                selectinload(Task.owner),
-                selectinload(Task.subtasks),
+            update(Task)
+            .where(Task.id == chain.c.id)
+            .values(
+                done_hr=chain.c.new_done,
+                status=case(
+                    (chain.c.completes, "completed"),
+                    (Task.status == "pending", "in_progress"),
+                    else_=Task.status,
+                ),
             )
-            .offset(skip)
-            .limit(limit)
+            .returning(Task.id, Task.done_hr, Task.status)
+            .execution_options(synchronize_session=False)
+        )
+        updated = {id: (done_hr, status) for id, done_hr, status in result.all()}
+        self.changed_task_ids.update(updated)
+        return updated
+
+    async def get_tasks_by_ids(self, task_ids: List[int]) -> List[TaskOutput]:
+        if not task_ids:
+            return []
+        result = await self.db.execute(
+            select(Task).options(*TASK_LIST).where(Task.id.in_(task_ids))
         )
+        return [orm_to_domain_task_output(task) for task in result.scalars().all()]
+
+    def _visible_to(self, user_id: int):
+        """Owner-or-assignee predicate, resolved through ``task_assignees``."""
+        return or_(
+            Task.owner_id == user_id,
+            Task.id.in_(
+                select(task_assignees.c.task_id).where(task_assignees.c.user_id == user_id)
+            ),
+        )
+
+    async def get_tasks(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TaskOutput]:
+        """
+        Open tasks visible to ``user_id`` ordered by ``(end_date, id)``.
+        Pass the last row's ``(end_date, id)`` as ``after`` to fetch the next page.
+        """
+        query = (
+            select(Task)
+            .filter(Task.status != "completed", self._visible_to(user_id))
+            .options(*TASK_LIST)
+            .order_by(Task.end_date, Task.id)
+        )
+        if after:
+            after_end_date, after_id = after
+            query = query.filter(
+                or_(
+                    Task.end_date > after_end_date,
+                    and_(Task.end_date == after_end_date, Task.id > after_id),
+                )
+            )
+        else:
+            query = query.offset(skip)
+        result = await self.db.execute(query.limit(limit))
         tasks = result.scalars().all()
         return [orm_to_domain_task_output(task) for task in tasks]
 
     async def create_task(self, task: TaskCreateInput, owner_id: int) -> TaskOutput:
-        db_task = domain_to_orm_task_create(task, owner_id)
-        self.db.add(db_task)
-        await self.db.flush()
-        await self.db.refresh(db_task)
-        return orm_to_domain_task_output(db_task)
+        # A new task has no subtasks or assignees, so the inserted row is all it is.
+        row = (await self.db.execute(
+            insert(Task).values(domain_to_task_row(task, owner_id)).returning(*Task.__table__.c)
+        )).one()
+        await self._attach_to_tree(row.id, row.main_task_id)
+        if row.main_task_id is not None:
+            # The parent's subtasks changed
+            self.changed_task_ids.add(row.main_task_id)
+        return TaskOutput(**row._mapping)
+
+    async def get_task_visibility(self, task_ids: List[int], user_id: int) -> Dict[int, bool]:
+        """Which of ``task_ids`` exist, and whether ``user_id`` owns or is assigned each."""
+        if not task_ids:
+            return {}
+        result = await self.db.execute(
+            select(Task.id, self._visible_to(user_id)).where(Task.id.in_(task_ids))
+        )
+        return {task_id: bool(visible) for task_id, visible in result.all()}
+
+    async def bulk_create_tasks(
+        self, tasks: List[TaskCreateInput], parents: List[Optional[int]], owner_id: int
+    ) -> List[TaskOutput]:
+        """
+        Insert a batch of tasks, one executemany per tree level, plus their closure
+        rows in one more. ``parents[i]`` is the batch index of task ``i``'s parent,
+        which must come earlier in the batch; when it is None ``main_task_id`` is
+        used as given.
+        """
+        if not tasks:
+            return []
+        rows = [domain_to_task_row(task, owner_id) for task in tasks]
+        levels: Dict[int, List[int]] = {}
+        depth: List[int] = []
+        for i, parent in enumerate(parents):
+            depth.append(0 if parent is None else depth[parent] + 1)
+            levels.setdefault(depth[i], []).append(i)
+
+        for level in sorted(levels):
+            indexes = levels[level]
+            for i in indexes:
+                if parents[i] is not None:
+                    rows[i]["main_task_id"] = rows[parents[i]]["id"]
+            result = await self.db.execute(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                [rows[i] for i in indexes],
+            )
+            for i, task_id in zip(indexes, result.scalars().all()):
+                rows[i]["id"] = task_id
+
+        # Ancestors of each out-of-batch parent, then each new task's chain
+        # extends its parent's: the same rows _attach_to_tree would insert.
+        external = {
+            row["main_task_id"] for row, parent in zip(rows, parents)
+            if parent is None and row["main_task_id"] is not None
+        }
+        chains: Dict[int, List[Tuple[int, int]]] = {task_id: [] for task_id in external}
+        if external:
+            result = await self.db.execute(
+                select(task_closure.c.descendant_id, task_closure.c.ancestor_id, task_closure.c.depth)
+                .where(task_closure.c.descendant_id.in_(external))
+            )
+            for descendant_id, ancestor_id, ancestor_depth in result.all():
+                chains[descendant_id].append((ancestor_id, ancestor_depth))
+        closure_rows = []
+        subtasks: Dict[int, List[int]] = {}
+        for row in rows:
+            parent_id = row["main_task_id"]
+            chain = [(row["id"], 0)] + [
+                (ancestor_id, ancestor_depth + 1) for ancestor_id, ancestor_depth in chains.get(parent_id, [])
+            ]
+            chains[row["id"]] = chain
+            closure_rows.extend(
+                {"ancestor_id": ancestor_id, "descendant_id": row["id"], "depth": ancestor_depth}
+                for ancestor_id, ancestor_depth in chain
+            )
+            if parent_id is not None:
+                subtasks.setdefault(parent_id, []).append(row["id"])
+        await self.db.execute(insert(task_closure), closure_rows)
+        self.changed_task_ids.update(external)
+
+        return [
+            TaskOutput(**row, subtasks=subtasks.get(row["id"], []), assignees=[]) for row in rows
+        ]
+
+    async def _attach_to_tree(self, task_id: int, parent_id: Optional[int]):
+        """Closure rows for a new leaf: itself at depth 0 plus every ancestor of its parent."""
+        rows = select(
+            literal(task_id, Integer).label("ancestor_id"),
+            literal(task_id, Integer).label("descendant_id"),
+            literal(0, Integer).label("depth"),
+        )
+        if parent_id is not None:
+            rows = rows.union_all(
+                select(
+                    task_closure.c.ancestor_id,
+                    literal(task_id, Integer),
+                    task_closure.c.depth + 1,
+                ).where(task_closure.c.descendant_id == parent_id)
+            )
+        await self.db.execute(
+            insert(task_closure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+        )
+
+    async def _move_in_tree(self, task_id: int, parent_id: Optional[int]):
+        """Re-hang the subtree rooted at ``task_id`` under ``parent_id`` (or make it a root)."""
+        subtree = select(task_closure.c.descendant_id).where(task_closure.c.ancestor_id == task_id)
+        await self.db.execute(
+            delete(task_closure).where(
+                task_closure.c.descendant_id.in_(subtree),
+                task_closure.c.ancestor_id.not_in(subtree),
+            )
+        )
+        if parent_id is None:
+            return
+        above = task_closure.alias("above")
+        below = task_closure.alias("below")
+        await self.db.execute(
+            insert(task_closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    above.c.ancestor_id,
+                    below.c.descendant_id,
+                    above.c.depth + below.c.depth + 1,
+                )
+                .select_from(above.join(below, true()))
+                .where(above.c.descendant_id == parent_id, below.c.ancestor_id == task_id),
+            )
+        )
+
+    async def is_in_subtree(self, root_id: int, task_id: int) -> bool:
+        result = await self.db.execute(
+            select(
+                select(task_closure.c.ancestor_id)
+                .where(task_closure.c.ancestor_id == root_id, task_closure.c.descendant_id == task_id)
+                .exists()
+            )
+        )
+        return bool(result.scalar())
+
+    def _tree_nodes(self, task_id: int, ancestors: bool = False):
+        """
+        Descendants (or ancestors) of ``task_id`` with each node's own subtree
+        totals, in one grouped query over a second closure join.
+        """
+        link = task_closure.alias("link")
+        below = task_closure.alias("below")
+        member = aliased(Task)
+        if ancestors:
+            node, anchor = link.c.ancestor_id, link.c.descendant_id
+        else:
+            node, anchor = link.c.descendant_id, link.c.ancestor_id
+        columns = (
+            Task.id,
+            Task.description,
+            Task.status,
+            Task.main_task_id,
+            link.c.depth,
+            Task.done_hr,
+            Task.estimated_hr,
+        )
+        query = (
+            select(
+                *columns,
+                func.coalesce(func.sum(member.done_hr), 0.0).label("subtree_done_hr"),
+                func.coalesce(func.sum(member.estimated_hr), 0.0).label("subtree_estimated_hr"),
+            )
+            .select_from(link)
+            .join(Task, Task.id == node)
+            .join(below, below.c.ancestor_id == Task.id)
+            .join(member, member.id == below.c.descendant_id)
+            .where(anchor == task_id)
+            .group_by(*columns)
+        )
+        return query, link
+
+    async def get_subtree(self, task_id: int) -> List[TaskTreeNode]:
+        query, link = self._tree_nodes(task_id)
+        result = await self.db.execute(query.order_by(link.c.depth, Task.id))
+        return [TaskTreeNode(**row._mapping) for row in result.all()]
+
+    async def get_ancestors(self, task_id: int, user_id: int) -> List[TaskTreeNode]:
+        query, link = self._tree_nodes(task_id, ancestors=True)
+        result = await self.db.execute(
+            query.where(link.c.depth > 0, self._visible_to(user_id)).order_by(link.c.depth.desc())
+        )
+        return [TaskTreeNode(**row._mapping) for row in result.all()]
 
     async def delete_task(self, task_id: int, owner_id: int) -> bool:
         result = await self.db.execute(
             select(Task).filter(Task.id == task_id, Task.owner_id == owner_id)
         )
         if task := result.scalar_one_or_none():
+            # The subtree goes with the task (ON DELETE CASCADE); clear its closure rows too.
+            subtree = list((await self.db.execute(
+                select(task_closure.c.descendant_id).where(task_closure.c.ancestor_id == task_id)
+            )).scalars().all())
+            await self.db.execute(
+                delete(task_closure).where(task_closure.c.descendant_id.in_(subtree))
+            )
             await self.db.delete(task)
             await self.db.flush()
+            # Every removed task, and the parent whose subtasks just changed
+            self.changed_task_ids.update(subtree)
+            self.changed_task_ids.add(task_id)
+            if task.main_task_id is not None:
+                self.changed_task_ids.add(task.main_task_id)
             return True
         return False
 
     async def create_progress(self, progress: TaskProgressDomain) -> TaskProgressDomain:
-        db_progress = domain_to_orm_task_progress(progress)
-        self.db.add(db_progress)
+        row = domain_to_task_progress_row(progress)
+        await self._record_cycles([row])
+        result = await self.db.execute(
+            insert(TaskProgress).values(row).returning(*TaskProgress.__table__.c)
+        )
+        return orm_to_domain_task_progress(result.one())
+
+    async def bulk_create_progress(self, progress: List[TaskProgressDomain]) -> int:
+        """Insert all progress rows with a single executemany INSERT."""
+        if not progress:
+            return 0
+        rows = [domain_to_task_progress_row(p) for p in progress]
+        await self._record_cycles(rows)
+        await self.db.execute(insert(TaskProgress), rows)
         await self.db.flush()
-        await self.db.refresh(db_progress)
-        return orm_to_domain_task_progress(db_progress)
+        return len(progress)
 
-    async def assign_user_to_task(self, task_id: int, assignee_email: str):
-        task = (await self.db.execute(
-            select(Task).filter(Task.id == task_id)
-        )).scalar_one_or_none()
-        
-        user = (await self.db.execute(
-            select(User).filter(User.email == assignee_email)
+    async def _record_cycles(self, rows: List[dict]):
+        """
+        Number new progress rows after their task's existing cycles and fold
+        them into ``task_progress_stats``. Cycles are only ever appended, so the
+        rows are taken to be newer than anything already recorded.
+        """
+        task_ids = sorted({row["task_id"] for row in rows})
+        # Make sure every stats row exists before locking: FOR UPDATE locks nothing
+        # for a missing row, and two first cycles would both try to insert it.
+        dialect_insert = pg_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        await self.db.execute(
+            dialect_insert(TaskProgressStats)
+            .values([{"task_id": task_id} for task_id in task_ids])
+            .on_conflict_do_nothing(index_elements=["task_id"])
+        )
+        result = await self.db.execute(
+            select(TaskProgressStats)
+            .where(TaskProgressStats.task_id.in_(task_ids))
+            .order_by(TaskProgressStats.task_id)
+            .with_for_update()
+        )
+        stats = {s.task_id: s for s in result.scalars().all()}
+        self.changed_task_ids.update(task_ids)
+        for row in sorted(rows, key=lambda r: r["start_date"]):
+            s = stats[row["task_id"]]
+            done_hr = row["done_hr"] or 0.0
+            estimated_hr = row["estimated_hr"] or 0.0
+            s.cycle_count += 1
+            s.done_hr_sum += done_hr
+            s.done_hr_sq_sum += done_hr * done_hr
+            s.estimated_hr_sum += estimated_hr
+            if estimated_hr > 0:
+                s.completion_pct_sum += min(100.0, done_hr / estimated_hr * 100)
+                s.estimated_cycle_count += 1
+            if s.cycle_count <= PROGRESS_TREND_WINDOW:
+                s.first_window_done_hr += done_hr
+            row["cycle_no"] = s.cycle_count
+            row["cumulative_done_hr"] = s.done_hr_sum
+
+    async def get_progress_stats(self, task_id: int) -> TaskProgressStatsDomain:
+        """
+        The stored aggregates plus the few cycle rows (by ``cycle_no``) needed for
+        the half and last-window sums: two indexed reads however long the history.
+        """
+        s = (await self.db.execute(
+            select(TaskProgressStats).where(TaskProgressStats.task_id == task_id)
         )).scalar_one_or_none()
+        if s is None or not s.cycle_count:
+            return TaskProgressStatsDomain()
 
-        if not task or not user:
-            return None, "Task or User not found"
-        if user in task.assignees:
-            return None, "User already assigned"
+        n = s.cycle_count
+        half = n // 2
+        window_start = n - min(PROGRESS_TREND_WINDOW, n)
+        wanted = {c for c in (half, window_start, n - 1, n) if c > 0}
+        result = await self.db.execute(
+            select(TaskProgress.cycle_no, TaskProgress.done_hr, TaskProgress.cumulative_done_hr)
+            .where(TaskProgress.task_id == task_id, TaskProgress.cycle_no.in_(wanted))
+        )
+        done = {}
+        cumulative = {0: 0.0}
+        for cycle_no, done_hr, cumulative_done_hr in result.all():
+            done[cycle_no] = done_hr or 0.0
+            cumulative[cycle_no] = cumulative_done_hr
 
-        task.assignees.append(user)
+        return TaskProgressStatsDomain(
+            cycle_count=n,
+            done_hr_sum=s.done_hr_sum,
+            done_hr_sq_sum=s.done_hr_sq_sum,
+            estimated_hr_sum=s.estimated_hr_sum,
+            completion_pct_sum=s.completion_pct_sum,
+            estimated_cycle_count=s.estimated_cycle_count,
+            first_half_done_hr=cumulative[half],
+            first_window_done_hr=s.first_window_done_hr,
+            last_window_done_hr=s.done_hr_sum - cumulative[window_start],
+            recent_done_hr=[done[c] for c in (n - 1, n) if c > 0],
+        )
+
+    async def get_portfolio(self, user_id: int, skip: int = 0, limit: int = 100) -> List[TaskPortfolioEntry]:
+        done_hr = func.coalesce(Task.done_hr, 0.0)
+        estimated_hr = func.coalesce(Task.estimated_hr, 0.0)
+        cycle_count = func.coalesce(TaskProgressStats.cycle_count, 0)
+        cycle_done_hr = func.coalesce(TaskProgressStats.done_hr_sum, 0.0)
+        # estimated_hr / (average hours per cycle), capped at 100
+        efficiency = estimated_hr * cycle_count * 100.0 / cycle_done_hr
+        result = await self.db.execute(
+            select(
+                Task.id,
+                Task.description,
+                Task.status,
+                Task.start_date,
+                Task.end_date,
+                Task.estimated_hr,
+                Task.done_hr,
+                Task.is_repititive,
+                Task.is_stopped,
+                cycle_count.label("cycle_count"),
+                case(
+                    (estimated_hr > 0, done_hr * 100.0 / estimated_hr), else_=0.0
+                ).label("completion_rate"),
+                case(
+                    (cycle_done_hr <= 0, 0.0), (efficiency > 100, 100.0), else_=efficiency
+                ).label("efficiency_score"),
+            )
+            .outerjoin(TaskProgressStats, TaskProgressStats.task_id == Task.id)
+            .where(self._visible_to(user_id))
+            .order_by(Task.end_date, Task.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return [TaskPortfolioEntry(**row._mapping) for row in result.all()]
+
+    def export_columns(self) -> List[str]:
+        columns: List[str] = []
+        for model in _EXPORT_MODELS:
+            columns.extend(c.key for c in model.__table__.columns if c.key not in columns)
+        return columns
+
+    async def stream_export(
+        self, user_id: int, batch_size: int = 1000
+    ) -> AsyncIterator[Tuple[str, List[dict]]]:
+        """
+        Yield ``(table name, rows)`` batches of the user's tasks, their progress and
+        stop history, and the time logs of the user's day plans. Rows come off a
+        server-side cursor ``batch_size`` at a time, so memory doesn't grow with
+        the history.
+        """
+        visible_ids = select(Task.id).where(self._visible_to(user_id))
+        queries = (
+            select(Task).where(self._visible_to(user_id)).order_by(Task.id),
+            select(TaskProgress)
+            .where(TaskProgress.task_id.in_(visible_ids))
+            .order_by(TaskProgress.task_id, TaskProgress.start_date, TaskProgress.id),
+            select(StopProgress)
+            .where(StopProgress.task_id.in_(visible_ids))
+            .order_by(StopProgress.task_id, StopProgress.id),
+            select(TimeLog)
+            .join(DayPlan, DayPlan.id == TimeLog.plan_id)
+            .where(DayPlan.user_id == user_id)
+            .order_by(TimeLog.plan_id, TimeLog.start_time, TimeLog.id),
+        )
+        for model, query in zip(_EXPORT_MODELS, queries):
+            columns = [c.key for c in model.__table__.columns]
+            result = await self.db.stream_scalars(query.execution_options(yield_per=batch_size))
+            async for batch in result.partitions():
+                yield model.__tablename__, [{c: getattr(row, c) for c in columns} for row in batch]
+
+    async def rebuild_progress_stats(self, task_ids: List[int]) -> int:
+        """
+        Recompute ``cycle_no``/``cumulative_done_hr`` and the stats rows of the given
+        tasks from their full history, set-based. Returns the number of stats rows written.
+        """
+        if not task_ids:
+            return 0
+        order = (TaskProgress.start_date, TaskProgress.id)
+        numbered = (
+            select(
+                TaskProgress.id,
+                func.row_number()
+                .over(partition_by=TaskProgress.task_id, order_by=order)
+                .label("cycle_no"),
+                func.sum(func.coalesce(TaskProgress.done_hr, 0.0))
+                .over(partition_by=TaskProgress.task_id, order_by=order, rows=(None, 0))
+                .label("cumulative_done_hr"),
+            )
+            .where(TaskProgress.task_id.in_(task_ids))
+            .subquery()
+        )
+        await self.db.execute(
+            update(TaskProgress)
+            .where(TaskProgress.id == numbered.c.id)
+            .values(cycle_no=numbered.c.cycle_no, cumulative_done_hr=numbered.c.cumulative_done_hr)
+            .execution_options(synchronize_session=False)
+        )
+
+        await self.db.execute(
+            delete(TaskProgressStats).where(TaskProgressStats.task_id.in_(task_ids))
+        )
+        done_hr = func.coalesce(TaskProgress.done_hr, 0.0)
+        estimated_hr = func.coalesce(TaskProgress.estimated_hr, 0.0)
+        has_estimate = estimated_hr > 0
+        result = await self.db.execute(
+            insert(TaskProgressStats).from_select(
+                [
+                    "task_id",
+                    "cycle_count",
+                    "done_hr_sum",
+                    "done_hr_sq_sum",
+                    "estimated_hr_sum",
+                    "completion_pct_sum",
+                    "estimated_cycle_count",
+                    "first_window_done_hr",
+                ],
+                select(
+                    TaskProgress.task_id,
+                    func.count(),
+                    func.sum(done_hr),
+                    func.sum(done_hr * done_hr),
+                    func.sum(estimated_hr),
+                    func.coalesce(
+                        func.sum(
+                            case(
+                                (done_hr >= estimated_hr, 100.0),
+                                else_=done_hr / estimated_hr * 100,
+                            )
+                        ).filter(has_estimate),
+                        0.0,
+                    ),
+                    func.count().filter(has_estimate),
+                    func.coalesce(
+                        func.sum(done_hr).filter(TaskProgress.cycle_no <= PROGRESS_TREND_WINDOW),
+                        0.0,
+                    ),
+                )
+                .where(TaskProgress.task_id.in_(task_ids))
+                .group_by(TaskProgress.task_id),
+            )
+        )
         await self.db.flush()
-        await self.db.refresh(task)
-        return orm_to_domain_task_output(task), None
+        self.changed_task_ids.update(task_ids)
+        return result.rowcount
+
+    async def advance_repetitive_tasks(self, windows: Dict[int, Tuple[datetime, datetime]]) -> int:
+        """
+        Move each task to its new ``(start_date, end_date)`` window and reset it to a
+        fresh ``in_progress`` cycle, all in one ``UPDATE ... WHERE id IN (...)``.
+        """
+        if not windows:
+            return 0
+        start_dates = {
+            task_id: literal(start, Task.start_date.type) for task_id, (start, _) in windows.items()
+        }
+        end_dates = {
+            task_id: literal(end, Task.end_date.type) for task_id, (_, end) in windows.items()
+        }
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.id.in_(list(windows)))
+            .values(
+                start_date=case(start_dates, value=Task.id),
+                end_date=case(end_dates, value=Task.id),
+                status="in_progress",
+                done_hr=0.0,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.changed_task_ids.update(windows)
+        return result.rowcount
+
+    def _due_for_rollover(self, now: datetime):
+        return and_(
+            Task.is_repititive.is_(True),
+            Task.is_stopped.is_(False),
+            Task.end_date <= now,
+        )
+
+    async def get_due_repetitive_task_ids(
+        self, now: datetime, limit: int = 100, after_id: int = 0
+    ) -> List[int]:
+        result = await self.db.execute(
+            select(Task.id)
+            .filter(self._due_for_rollover(now), Task.id > after_id)
+            .order_by(Task.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_due_repetitive_tasks(self, task_ids: List[int], now: datetime) -> List[TaskOutput]:
+        """
+        Lock and return the tasks among ``task_ids`` that still need a rollover.
+        Rows already locked by another worker are skipped.
+        """
+        if not task_ids:
+            return []
+        result = await self.db.execute(
+            select(Task)
+            .options(*TASK_LIST)
+            .filter(Task.id.in_(task_ids), self._due_for_rollover(now))
+            .order_by(Task.id)
+            .with_for_update(skip_locked=True, of=Task)
+        )
+        return [orm_to_domain_task_output(task) for task in result.scalars().all()]
+
+    async def assign_user_to_task(self, task_id: int, assignee_email: str):
+        # INSERT ... SELECT: only inserts when the task and user exist and the
+        # user isn't assigned yet; the failure path works out which one it was.
+        already_assigned = (
+            select(task_assignees.c.user_id)
+            .where(task_assignees.c.task_id == task_id, task_assignees.c.user_id == User.id)
+            .exists()
+        )
+        result = await self.db.execute(
+            insert(task_assignees)
+            .from_select(
+                ["user_id", "task_id"],
+                select(User.id, literal(task_id, Integer)).where(
+                    User.email == assignee_email,
+                    select(Task.id).where(Task.id == task_id).exists(),
+                    ~already_assigned,
+                ),
+            )
+            .returning(task_assignees.c.user_id)
+        )
+        if result.first() is None:
+            task_exists = (await self.db.execute(
+                select(select(Task.id).where(Task.id == task_id).exists())
+            )).scalar()
+            user_exists = (await self.db.execute(
+                select(select(User.id).where(User.email == assignee_email).exists())
+            )).scalar()
+            if not task_exists or not user_exists:
+                return None, "Task or User not found"
+            return None, "User already assigned"
+
+        self.changed_task_ids.add(task_id)
+        row = (await self.db.execute(
+            select(*Task.__table__.c).where(Task.id == task_id)
+        )).one()
+        return (await self._task_outputs([row]))[0], None
 
     async def update_task(self, task_id: int, data: dict):
-        # raise ValueError("task error")
-        if task := (await self.db.execute(
-            select(Task).filter(Task.id == task_id)
-        )).scalar_one_or_none():
+        values = {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in data.items()
+            if value is not None and key in Task.__table__.c and key != "id"
+        }
+        if not values:
+            return await self.get_task(task_id)
+        moved = "main_task_id" in values
+        if moved:
+            # RETURNING only sees the new row; the old parent's subtasks change too.
+            old_parent_id = (await self.db.execute(
+                select(Task.main_task_id).where(Task.id == task_id)
+            )).scalar_one_or_none()
+        row = (await self.db.execute(
+            update(Task).where(Task.id == task_id).values(values).returning(*Task.__table__.c)
+        )).one_or_none()
+        if row is None:
+            return None
+        self.changed_task_ids.add(task_id)
+        if moved:
+            self.changed_task_ids.update(
+                parent_id for parent_id in (old_parent_id, row.main_task_id) if parent_id is not None
+            )
+            await self._move_in_tree(task_id, row.main_task_id)
+        return (await self._task_outputs([row]))[0]
+
+    async def _task_outputs(self, rows) -> List[TaskOutput]:
+        """Map ``tasks`` rows (e.g. from RETURNING) to TaskOutput, with subtask and assignee ids."""
+        if not rows:
+            return []
+        task_ids = [row.id for row in rows]
+        subtasks: Dict[int, List[int]] = {task_id: [] for task_id in task_ids}
+        assignees: Dict[int, List[int]] = {task_id: [] for task_id in task_ids}
+        result = await self.db.execute(
+            select(Task.main_task_id, Task.id).where(Task.main_task_id.in_(task_ids)).order_by(Task.id)
+        )
+        for parent_id, task_id in result.all():
+            subtasks[parent_id].append(task_id)
+        result = await self.db.execute(
+            select(task_assignees.c.task_id, task_assignees.c.user_id)
+            .where(task_assignees.c.task_id.in_(task_ids))
+            .order_by(task_assignees.c.user_id)
+        )
+        for task_id, user_id in result.all():
+            assignees[task_id].append(user_id)
+        return [
+            TaskOutput(**row._mapping, subtasks=subtasks[row.id], assignees=assignees[row.id])
+            for row in rows
+        ]
+
+    async def bulk_update_tasks(self, changes: Dict[int, dict]) -> List[TaskOutput]:
+        """
+        Apply per-task column changes in one ``UPDATE ... WHERE id IN (...)``: each
+        changed column is set through a ``CASE id`` over the tasks that change it.
+        None values are skipped, as in ``update_task``; parents can't be changed here.
+        Returns the updated tasks in id order.
+        """
+        columns: Dict[str, Dict[int, object]] = {}
+        for task_id, data in changes.items():
             for key, value in data.items():
-                if hasattr(task, key) and value is not None:
-                    setattr(task, key, value)
-            await self.db.flush()
-            await self.db.refresh(task)
-            return orm_to_domain_task_output(task)
-        return None
+                if value is not None and key in Task.__table__.c and key not in ("id", "main_task_id"):
+                    columns.setdefault(key, {})[task_id] = value.value if isinstance(value, Enum) else value
+        if not columns:
+            return sorted(await self.get_tasks_by_ids(list(changes)), key=lambda task: task.id)
 
-    async def create_stop(self, task_id: int):
-        # raise ValueError("test error")
-        db_stop = StopProgress(task_id=task_id, stopped_at=datetime.now(timezone.utc))
-        self.db.add(db_stop)
-        await self.db.flush()
-        await self.db.refresh(db_stop)
-        return db_stop
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.id.in_(list(changes)))
+            .values({
+                key: case(
+                    {task_id: literal(value, getattr(Task, key).type) for task_id, value in by_task.items()},
+                    value=Task.id,
+                    else_=getattr(Task, key),
+                )
+                for key, by_task in columns.items()
+            })
+            .returning(*Task.__table__.c)
+            .execution_options(synchronize_session=False)
+        )
+        rows = sorted(result.all(), key=lambda row: row.id)
+        self.changed_task_ids.update(row.id for row in rows)
+        return await self._task_outputs(rows)
+
+    async def create_stop(self, task_id: int) -> StopProgressDomain:
+        result = await self.db.execute(
+            insert(StopProgress)
+            .values(task_id=task_id, stopped_at=datetime.now(timezone.utc))
+            .returning(StopProgress.id, StopProgress.task_id, StopProgress.stopped_at)
+        )
+        self.changed_task_ids.add(task_id)
+        return StopProgressDomain(**result.one()._mapping)
 
     async def delete_stop(self, task_id: int):
         if stop := (await self.db.execute(
@@ -116,37 +829,97 @@ class TaskRepository(AbstractTaskRepository):
         )).scalar_one_or_none():
             await self.db.delete(stop)
             await self.db.flush()
+            self.changed_task_ids.add(task_id)
         return None
 
-    async def get_stop(self, task_id: int):
-        return (await self.db.execute(
-            select(StopProgress).filter(StopProgress.task_id == task_id)
-        )).scalar_one_or_none()
+    async def get_stop(self, task_id: int) -> Optional[StopProgressDomain]:
+        row = (await self.db.execute(
+            select(StopProgress.id, StopProgress.task_id, StopProgress.stopped_at)
+            .filter(StopProgress.task_id == task_id)
+        )).one_or_none()
+        return StopProgressDomain(**row._mapping) if row else None
 
-    async def get_progress(self, task_id: int, skip: int = 0, limit: int = 100):
+    async def get_stop_progress(self, task_id: int) -> List[datetime]:
         result = await self.db.execute(
+            select(StopProgress.stopped_at)
+            .where(StopProgress.task_id == task_id)
+            .order_by(StopProgress.stopped_at)
+        )
+        return list(result.scalars().all())
+
+    async def get_progress(
+        self,
+        task_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TaskProgressDomain]:
+        """
+        Progress cycles of a task, newest first by ``(start_date, id)``, read off
+        ``ix_task_progress_task_id_start_date``. Pass the last row's
+        ``(start_date, id)`` as ``before`` to fetch the next (older) page.
+        """
+        query = (
             select(TaskProgress)
             .filter(TaskProgress.task_id == task_id)
-            .offset(skip)
-            .limit(limit)
+            .order_by(TaskProgress.start_date.desc(), TaskProgress.id.desc())
         )
-        return [ domain_to_orm_task_progress(progress)  for progress in result.scalars().all()]
+        if before:
+            before_start_date, before_id = before
+            query = query.filter(
+                or_(
+                    TaskProgress.start_date < before_start_date,
+                    and_(TaskProgress.start_date == before_start_date, TaskProgress.id < before_id),
+                )
+            )
+        else:
+            query = query.offset(skip)
+        result = await self.db.execute(query.limit(limit))
+        return [orm_to_domain_task_progress(progress) for progress in result.scalars().all()]
     
 
 
 
-    async def get_tasks_by_name(self, name: str, skip: int = 0, limit: int = 100):
-        words = name.split()
-        conditions = [Task.description.ilike(f"%{w}%") for w in words]
+    async def get_tasks_by_name(self, name: str, user_id: int, skip: int = 0, limit: int = 100):
+        """
+        Ranked full-text search over descriptions the user can see. Every word
+        must match, as a prefix of a word in the description.
+        """
+        words = _search_words(name)
+        if not words:
+            return []
 
-        query = (
-            select(Task)
-            .options(
-                selectinload(Task.assignees),
-                selectinload(Task.owner),
-                selectinload(Task.subtasks),
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            ts_query = func.to_tsquery(
+                TASK_SEARCH_CONFIG, " & ".join(f"{w}:*" for w in words)
             )
-            .filter(and_(*conditions))  # must contain all words
+            rank = func.ts_rank(TASK_SEARCH_VECTOR, ts_query)
+            query = (
+                select(Task)
+                .where(TASK_SEARCH_VECTOR.op("@@")(ts_query))
+                .order_by(rank.desc(), Task.id)
+            )
+        elif dialect == "sqlite":
+            fts = table("tasks_fts", column("rowid"))
+            query = (
+                select(Task)
+                .join(fts, fts.c.rowid == Task.id)
+                .where(
+                    literal_column("tasks_fts").op("MATCH")(
+                        " AND ".join(f'"{w}"*' for w in words)
+                    )
+                )
+                .order_by(func.bm25(literal_column("tasks_fts")), Task.id)
+            )
+        else:
+            query = select(Task).where(
+                and_(*[Task.description.ilike(f"%{w}%") for w in words])
+            ).order_by(Task.end_date, Task.id)
+
+        query = (
+            query.options(*TASK_LIST)
+            .where(self._visible_to(user_id))
             .offset(skip)
             .limit(limit)
         )
@@ -1,9 +1,9 @@
 from domain.models.user_model import Token as DMToken
+from infrastructure.models.loading import TOKEN_WITH_USER
 from infrastructure.models.model import Token
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from domain.interfaces.token_repo import ITokenRepository
-from sqlalchemy.orm import selectinload
 
 
 class TokenRepository(ITokenRepository):
@@ -13,7 +13,7 @@ class TokenRepository(ITokenRepository):
     async def FindByID(self, id: str):
         result = await self.db.execute(
             select(Token)
-            .options(selectinload(Token.user))  # preloads user relationship
+            .options(*TOKEN_WITH_USER)  # preloads user relationship
             .where(Token.id == id)
         )
         dbtoken = result.scalar_one_or_none()  # returns single object or None
@@ -2,6 +2,7 @@ from domain.interfaces.user_repo import IUserRepository
 from domain.models.user_model import User as dUser
 from domain.models.user_model import UserRegister
 from infrastructure.dto.user_dto import create_domain_user_from_model
+from infrastructure.models.loading import AUTH_LOOKUP
 from infrastructure.models.model import User as UserModel
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,6 +16,7 @@ class UserRepository(IUserRepository):
         try:
             result = await self.db.execute(
                 select(UserModel)
+                .options(*AUTH_LOOKUP)
                 .where(UserModel.email == email)
                 .limit(1)
             )
@@ -29,6 +31,7 @@ class UserRepository(IUserRepository):
         try:
             result = await self.db.execute(
                 select(UserModel)
+                .options(*AUTH_LOOKUP)
                 .where(UserModel.username== username)
                 .limit(1)
             )
@@ -70,16 +73,22 @@ class UserRepository(IUserRepository):
         await self.db.commit()
 
         result = await self.db.execute(
-            select(UserModel).where(UserModel.id == user_id)
+            select(UserModel).options(*AUTH_LOOKUP).where(UserModel.id == user_id)
         )
         return create_domain_user_from_model(result.scalar_one_or_none())
+
+    async def has_any_user(self) -> bool:
+        """EXISTS probe used to bootstrap the first (superadmin) account."""
+        result = await self.db.execute(select(select(UserModel.id).exists()))
+        return bool(result.scalar())
+
     async def get_all_users(self):
         """
         Fetch all users from the database.
         Returns a list of UserModel objects.
         """
         try:
-            result = await self.db.execute(select(UserModel))
+            result = await self.db.execute(select(UserModel).options(*AUTH_LOOKUP))
             users = result.scalars().all() 
             return [create_domain_user_from_model(user) for user in users] if result else []
         except Exception as e:
@@ -0,0 +1,148 @@
+import logging
+import os
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from domain.interfaces.analytics_cache import IAnalyticsCache
+
+
+class InMemoryCacheBackend:
+    """
+    Per-process TTL LRU for values plus plain counters for versions. Counters
+    are never evicted (one int per task written to), so a version can't fall
+    back to an old value while a payload stored under it is still alive.
+    """
+
+    def __init__(self, maxsize: int = 10000, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        self._entries[key] = (value, self.clock() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def version(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Shared backend over any ``redis.asyncio``-compatible client (``get``,
+    ``set(..., ex=)``, ``incr``). Values are pickled, so only point this at a
+    Redis the app trusts. Versions live under their own keys without expiry.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return pickle.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        await self.client.set(key, pickle.dumps(value), ex=max(1, int(ttl_seconds)))
+
+    async def version(self, key: str) -> int:
+        raw = await self.client.get(key)
+        return int(raw) if raw is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+
+class AnalyticsCache(IAnalyticsCache):
+    """
+    Task analytics payloads keyed by task id and a per-task version counter.
+    Writers bump the version after commit (see the units of work), which
+    orphans every payload stored under an older version; ``ttl_seconds`` bounds
+    how stale the time-dependent figures (time spent, deadline status) get.
+
+    Cache errors are logged and treated as misses, never raised to the request.
+    """
+
+    def __init__(self, backend, ttl_seconds: float = 60, prefix: str = "task-analytics"):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.logger = logging.getLogger(__name__)
+
+    def _version_key(self, task_id: int) -> str:
+        return f"{self.prefix}:{task_id}:version"
+
+    def _payload_key(self, task_id: int, version: int) -> str:
+        return f"{self.prefix}:{task_id}:v{version}"
+
+    async def get(self, task_id: int) -> Tuple[Optional[Any], int]:
+        try:
+            version = await self.backend.version(self._version_key(task_id))
+            return await self.backend.get(self._payload_key(task_id, version)), version
+        except Exception as e:
+            self.logger.warning(f"Analytics cache read failed for task {task_id}: {e}")
+            return None, -1
+
+    async def set(self, task_id: int, version: int, payload: Any):
+        if version < 0:
+            return
+        try:
+            await self.backend.set(self._payload_key(task_id, version), payload, self.ttl_seconds)
+        except Exception as e:
+            self.logger.warning(f"Analytics cache write failed for task {task_id}: {e}")
+
+    async def invalidate(self, task_ids: Iterable[int]):
+        for task_id in set(task_ids):
+            try:
+                await self.backend.incr(self._version_key(task_id))
+            except Exception as e:
+                self.logger.error(f"Analytics cache invalidation failed for task {task_id}: {e}")
+
+
+def create_analytics_cache() -> Optional[AnalyticsCache]:
+    """
+    ANALYTICS_CACHE_TTL_SECONDS (default 60, 0 disables) and either
+    ANALYTICS_CACHE_REDIS_URL to share the cache (and its invalidations) across
+    processes, which needs the ``redis`` package, or
+    ANALYTICS_CACHE_IN_MEMORY_ENABLED=true for an in-process LRU of
+    ANALYTICS_CACHE_SIZE entries. Without either the cache is off.
+
+    The in-process LRU only sees writes made by its own process, so with
+    several uvicorn workers (or the standalone rollover worker) the other
+    processes serve stale analytics until the TTL expires; only enable it for a
+    single process.
+    """
+    ttl_seconds = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+    if ttl_seconds <= 0:
+        return None
+    redis_url = os.getenv("ANALYTICS_CACHE_REDIS_URL")
+    if redis_url:
+        from redis import asyncio as redis_asyncio
+
+        backend = RedisCacheBackend(redis_asyncio.from_url(redis_url))
+    elif os.getenv("ANALYTICS_CACHE_IN_MEMORY_ENABLED", "false").lower() == "true":
+        backend = InMemoryCacheBackend(maxsize=int(os.getenv("ANALYTICS_CACHE_SIZE", "10000")))
+    else:
+        return None
+    return AnalyticsCache(backend, ttl_seconds)
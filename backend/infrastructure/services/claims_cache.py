@@ -0,0 +1,52 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from domain.models.user_model import TokenClaimUser
+
+
+class ClaimsCache:
+    """
+    Short-lived LRU cache of decoded access-token claims, keyed by the token's
+    SHA-256. An entry never outlives ``ttl_seconds`` or the token's own ``exp``.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30,
+        maxsize: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _key(self, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[TokenClaimUser]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def set(self, token: str, claims: TokenClaimUser, token_exp: Optional[float] = None):
+        expires_at = self.clock() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        key = self._key(token)
+        self._entries[key] = (claims, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
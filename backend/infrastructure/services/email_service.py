@@ -1,6 +1,7 @@
 import logging
 import os
 import ssl
+from abc import abstractmethod
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -8,47 +9,25 @@ import aiosmtplib
 from domain.interfaces.email_service import EmailServiceInterface
 
 
-class EmailService(EmailServiceInterface):
+def build_message(from_header: str, to: str, subject: str, html_body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg['From'] = from_header
+    msg['To'] = to
+    msg['Subject'] = subject
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
+class EmailTemplates(EmailServiceInterface):
+    """Builds the app's emails; subclasses decide how ``send_email`` delivers them."""
+
     def __init__(self):
-        self.smtp_host = os.getenv('SMTP_HOST', 'smtp-relay.brevo.com')
-        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        self.smtp_username = os.getenv('SMTP_USERNAME')
-        self.smtp_password = os.getenv('SMTP_PASSWORD')
-        self.from_email = os.getenv('FROM_EMAIL')
-        self.from_name = os.getenv('FROM_NAME', 'Your App')
         self.frontend_url = os.getenv('FRONTEND_URL')
         self.logger = logging.getLogger(__name__)
-        
-        if not all([self.smtp_username, self.smtp_password, self.from_email]):
-            raise ValueError("Missing required SMTP configuration")
 
+    @abstractmethod
     async def send_email(self, to: str, subject: str, html_body: str) -> bool:
-        """Send email asynchronously using Brevo SMTP"""
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = f'{self.from_name} <{self.from_email}>'
-            msg['To'] = to
-            msg['Subject'] = subject
-            msg.attach(MIMEText(html_body, 'html'))
-
-            context = ssl.create_default_context()
-
-            await aiosmtplib.send(
-                msg,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                start_tls=True,
-                username=self.smtp_username,
-                password=self.smtp_password,
-                tls_context=context
-            )
-
-            self.logger.info(f"✅ Email sent to: {to}")
-            return True
-
-        except Exception as e:
-            self.logger.error(f"❌ Failed to send email: {e}")
-            return False
+        ...
 
     async def send_verification_email(self, username: str, email: str, token: str) -> bool:
         link = f"{self.frontend_url}/auth/verify-email?token={token}"
@@ -77,3 +56,45 @@ class EmailService(EmailServiceInterface):
             <p>{link}</p>
         </div>"""
         return await self.send_email(email, subject, html_body)
+
+
+class EmailService(EmailTemplates):
+    def __init__(self):
+        super().__init__()
+        self.smtp_host = os.getenv('SMTP_HOST', 'smtp-relay.brevo.com')
+        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
+        self.smtp_username = os.getenv('SMTP_USERNAME')
+        self.smtp_password = os.getenv('SMTP_PASSWORD')
+        self.from_email = os.getenv('FROM_EMAIL')
+        self.from_name = os.getenv('FROM_NAME', 'Your App')
+        
+        if not all([self.smtp_username, self.smtp_password, self.from_email]):
+            raise ValueError("Missing required SMTP configuration")
+
+    @property
+    def from_header(self) -> str:
+        return f'{self.from_name} <{self.from_email}>'
+
+    async def send_email(self, to: str, subject: str, html_body: str) -> bool:
+        """Send email asynchronously using Brevo SMTP"""
+        try:
+            msg = build_message(self.from_header, to, subject, html_body)
+
+            context = ssl.create_default_context()
+
+            await aiosmtplib.send(
+                msg,
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                start_tls=True,
+                username=self.smtp_username,
+                password=self.smtp_password,
+                tls_context=context
+            )
+
+            self.logger.info(f"✅ Email sent to: {to}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to send email: {e}")
+            return False
@@ -0,0 +1,26 @@
+from infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from infrastructure.services.email_service import EmailTemplates
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class OutboxEmailService(EmailTemplates):
+    """
+    Same templates as ``EmailService``, but ``send_email`` only writes the
+    message to the outbox table; ``EmailOutboxSender`` delivers it later.
+
+    The row is added to the caller's session and is not committed here, so it
+    is stored by the same commit as the user or token it belongs to and is
+    dropped if that transaction rolls back.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.outbox = EmailOutboxRepository(db)
+
+    async def send_email(self, to: str, subject: str, html_body: str) -> bool:
+        try:
+            await self.outbox.enqueue(to, subject, html_body)
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Failed to enqueue email: {e}")
+            return False
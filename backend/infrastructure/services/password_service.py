@@ -1,13 +1,78 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
 from passlib.context import CryptContext
 from domain.interfaces.password_service import IPasswordService
 
 
 class PasswordService(IPasswordService):
-    def __init__(self):
+    """
+    bcrypt hashing off the event loop. Calls run on a bounded thread pool
+    (bcrypt releases the GIL), so at most ``max_workers`` hashes run at once and
+    the rest wait in the pool's queue; ``metrics()`` reports both.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.max_workers = max_workers or int(
+            os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+
+    def _dequeue(self, job: dict):
+        # Called from the worker thread when the job starts, and from _run once
+        # the caller stops waiting; whichever comes first takes it off the queue.
+        with self._lock:
+            if job["queued"]:
+                job["queued"] = False
+                self._queued -= 1
+
+    def _track(self, job: dict, func: Callable, *args):
+        self._dequeue(job)
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    async def _run(self, func: Callable, *args):
+        job = {"queued": True}
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, self._track, job, func, *args
+            )
+        finally:
+            self._dequeue(job)
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.pwd_context.verify, plain_password, hashed_password)
 
-    def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+            }
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import ssl
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import aiosmtplib
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to ``size`` connected, authenticated SMTP clients around so a
+    batch of messages pays for the TLS handshake and login once.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        size: int = 2,
+        timeout: float = 30,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.size = size
+        self.timeout = timeout
+        self.tls_context = tls_context
+        self.logger = logging.getLogger(__name__)
+        self._idle: List[aiosmtplib.SMTP] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            tls_context=self.tls_context or (ssl.create_default_context() if self.start_tls else None),
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.username:
+            await smtp.login(self.username, self.password)
+        self.connects += 1
+        return smtp
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                # The server may have dropped an idle connection; NOOP finds out cheaply.
+                await smtp.noop()
+                return smtp
+            except aiosmtplib.SMTPException:
+                await self._discard(smtp)
+        return await self._connect()
+
+    async def _discard(self, smtp: aiosmtplib.SMTP):
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            smtp = await self._checkout()
+            try:
+                yield smtp
+            finally:
+                if smtp.is_connected:
+                    self._idle.append(smtp)
+
+    async def close(self):
+        while self._idle:
+            await self._discard(self._idle.pop())
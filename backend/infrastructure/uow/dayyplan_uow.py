@@ -1,12 +1,16 @@
 
+from typing import Optional
+
+from domain.interfaces.analytics_cache import IAnalyticsCache
 from domain.interfaces.daypla_uow import IDayPlanUoW
 from infrastructure.repositories.dayplan_repository import DayPlanRepository
 from infrastructure.repositories.task_repository import TaskRepository
 
 
 class DayPlanUnitOfWork(IDayPlanUoW):
-    def __init__(self, session_factory):
+    def __init__(self, session_factory, analytics_cache: Optional[IAnalyticsCache] = None):
         self.session_factory = session_factory
+        self.analytics_cache = analytics_cache
         self._session = None
         self._tasks = None
         self._dayplan=None
@@ -34,6 +38,26 @@ class DayPlanUnitOfWork(IDayPlanUoW):
             await self._session.begin()
         return self
         
+    async def commit(self):
+        if self._session is not None:
+            await self._session.commit()
+            await self._invalidate_analytics()
+
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
+            if self._tasks is not None:
+                self._tasks.changed_task_ids.clear()
+
+    async def _invalidate_analytics(self):
+        # Bumped only once committed, so a reader that recomputed from the old rows
+        # in the meantime stored its payload under the old version.
+        if self._tasks is None or not self._tasks.changed_task_ids:
+            return
+        task_ids, self._tasks.changed_task_ids = self._tasks.changed_task_ids, set()
+        if self.analytics_cache is not None:
+            await self.analytics_cache.invalidate(task_ids)
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self._session is None:
             return
@@ -41,6 +65,7 @@ class DayPlanUnitOfWork(IDayPlanUoW):
         try:
             if exc_type is None and self._session.in_transaction():
                 await self._session.commit()
+                await self._invalidate_analytics()
             elif self._session.in_transaction():
                 await self._session.rollback()
         finally:
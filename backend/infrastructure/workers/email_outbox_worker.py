@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+from domain.models.email_model import OutboxEmail
+from infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from infrastructure.services.email_service import build_message
+from infrastructure.services.smtp_pool import SMTPConnectionPool
+
+
+class EmailOutboxSender:
+    """
+    Delivers queued outbox messages over pooled SMTP connections.
+
+    Each run claims up to ``batch_size`` due messages, splits them into groups
+    of ``per_connection`` that share one pooled connection, and records the
+    outcome. Failed messages are retried with exponential backoff until
+    ``max_attempts`` is reached.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        pool: SMTPConnectionPool,
+        from_header: str,
+        batch_size: int = 50,
+        per_connection: int = 10,
+        interval_seconds: float = 5,
+        max_attempts: int = 5,
+        backoff_seconds: float = 30,
+        max_backoff_seconds: float = 3600,
+        lease_seconds: float = 300,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool
+        self.from_header = from_header
+        self.batch_size = batch_size
+        self.per_connection = per_connection
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self.logger = logging.getLogger(__name__)
+        self._runner: Optional[asyncio.Task] = None
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(
+            seconds=min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        )
+
+    async def _send_group(self, group: List[OutboxEmail]) -> Tuple[List[int], List[Tuple[OutboxEmail, str]]]:
+        sent: List[int] = []
+        failed: List[Tuple[OutboxEmail, str]] = []
+        try:
+            async with self.pool.connection() as smtp:
+                for i, email in enumerate(group):
+                    try:
+                        await smtp.send_message(
+                            build_message(self.from_header, email.to, email.subject, email.html_body)
+                        )
+                        sent.append(email.id)
+                    except Exception as e:
+                        failed.append((email, str(e)))
+                        if not smtp.is_connected:
+                            failed.extend((rest, str(e)) for rest in group[i + 1:])
+                            break
+        except Exception as e:
+            # Connecting or logging in failed: nothing left in the group went out.
+            done = set(sent) | {email.id for email, _ in failed}
+            failed.extend((email, str(e)) for email in group if email.id not in done)
+        return sent, failed
+
+    async def run_once(self) -> int:
+        """Send one batch of due messages. Returns the number claimed."""
+        async with self.session_factory() as session:
+            batch = await EmailOutboxRepository(session).claim_batch(
+                datetime.now(timezone.utc), self.batch_size, self.lease_seconds
+            )
+            await session.commit()
+        if not batch:
+            return 0
+
+        groups = [
+            batch[i:i + self.per_connection] for i in range(0, len(batch), self.per_connection)
+        ]
+        results = await asyncio.gather(*(self._send_group(group) for group in groups))
+
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            repo = EmailOutboxRepository(session)
+            await repo.mark_sent([id for sent, _ in results for id in sent], now)
+            for _, failed in results:
+                for email, error in failed:
+                    give_up = email.attempts >= self.max_attempts
+                    if give_up:
+                        self.logger.error(f"❌ Giving up on email {email.id} to {email.to}: {error}")
+                    await repo.mark_failed(email.id, error, now + self._backoff(email.attempts), give_up)
+            await session.commit()
+        return len(batch)
+
+    async def run_forever(self):
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                self.logger.error(f"Email outbox run failed: {e}")
+                claimed = 0
+            # A full batch means more is probably waiting, so go again straight away.
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> asyncio.Task:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run_forever())
+        return self._runner
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.pool.close()
+
+
+def create_email_outbox_sender() -> EmailOutboxSender:
+    from infrastructure.db.session import AsyncSessionLocal
+
+    pool = SMTPConnectionPool(
+        hostname=os.getenv("SMTP_HOST", "smtp-relay.brevo.com"),
+        port=int(os.getenv("SMTP_PORT", "587")),
+        username=os.getenv("SMTP_USERNAME"),
+        password=os.getenv("SMTP_PASSWORD"),
+        size=int(os.getenv("SMTP_POOL_SIZE", "2")),
+    )
+    return EmailOutboxSender(
+        AsyncSessionLocal,
+        pool,
+        from_header=f"{os.getenv('FROM_NAME', 'Your App')} <{os.getenv('FROM_EMAIL')}>",
+        batch_size=int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50")),
+        per_connection=int(os.getenv("EMAIL_OUTBOX_PER_CONNECTION", "10")),
+        interval_seconds=float(os.getenv("EMAIL_OUTBOX_INTERVAL_SECONDS", "5")),
+        max_attempts=int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5")),
+    )
+
+
+# Standalone worker: python -m infrastructure.workers.email_outbox_worker
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(create_email_outbox_sender().run_forever())
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+
+async def backfill(chunk_size: int = 500) -> int:
+    """
+    Rebuild ``task_progress_stats`` (and the per-cycle numbering it reads) for
+    every task with progress history, ``chunk_size`` tasks per transaction.
+    Returns the number of tasks rebuilt.
+    """
+    from infrastructure.db.session import AsyncSessionLocal
+    from infrastructure.models.model import TaskProgress
+    from infrastructure.repositories.task_repository import TaskRepository
+
+    logger = logging.getLogger(__name__)
+    rebuilt = 0
+    after_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            task_ids = (await session.execute(
+                select(TaskProgress.task_id)
+                .where(TaskProgress.task_id > after_id)
+                .group_by(TaskProgress.task_id)
+                .order_by(TaskProgress.task_id)
+                .limit(chunk_size)
+            )).scalars().all()
+            if not task_ids:
+                break
+            await TaskRepository(session).rebuild_progress_stats(task_ids)
+            await session.commit()
+        rebuilt += len(task_ids)
+        after_id = task_ids[-1]
+        logger.info(f"Rebuilt progress stats for {rebuilt} tasks")
+    return rebuilt
+
+
+# One-off command: python -m infrastructure.workers.progress_stats_backfill
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Rebuild per-task progress aggregates from history.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    asyncio.run(backfill(parser.parse_args().chunk_size))
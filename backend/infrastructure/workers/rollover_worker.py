@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+from typing import Callable, List, Optional
+
+from domain.interfaces.analytics_cache import IAnalyticsCache
+from dotenv import load_dotenv
+from usecases.task_usecase import TaskService
+
+
+class RolloverScheduler:
+    """
+    Periodically rolls over repetitive tasks whose end_date has passed.
+
+    Due task ids are scanned in chunks of ``chunk_size``; every chunk is rolled
+    over by its own ``TaskService`` (and therefore its own session and
+    transaction), with at most ``concurrency`` chunks in flight at once.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], TaskService],
+        interval_seconds: float = 60,
+        chunk_size: int = 200,
+        concurrency: int = 4,
+    ):
+        self.service_factory = service_factory
+        self.interval_seconds = interval_seconds
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.logger = logging.getLogger(__name__)
+        self._runner: Optional[asyncio.Task] = None
+
+    async def _rollover_chunk(self, semaphore: asyncio.Semaphore, task_ids: List[int]) -> int:
+        async with semaphore:
+            return await self.service_factory().rollover_tasks(task_ids)
+
+    async def run_once(self) -> int:
+        """Roll over everything that is currently due. Returns the number of tasks moved."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = []
+        after_id = 0
+        try:
+            while True:
+                task_ids = await self.service_factory().get_due_rollover_ids(
+                    limit=self.chunk_size, after_id=after_id
+                )
+                if not task_ids:
+                    break
+                pending.append(asyncio.create_task(self._rollover_chunk(semaphore, task_ids)))
+                after_id = task_ids[-1]
+                if len(task_ids) < self.chunk_size:
+                    break
+        except BaseException:
+            # Don't leave chunks running into the next pass over the same ids
+            for chunk in pending:
+                chunk.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        rolled = 0
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Rollover chunk failed: {result}")
+            else:
+                rolled += result
+        return rolled
+
+    async def run_forever(self):
+        while True:
+            try:
+                rolled = await self.run_once()
+                if rolled:
+                    self.logger.info(f"Rolled over {rolled} repetitive tasks")
+            except Exception as e:
+                self.logger.error(f"Rollover run failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> asyncio.Task:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run_forever())
+        return self._runner
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+
+
+def create_rollover_scheduler(analytics_cache: Optional[IAnalyticsCache] = None) -> RolloverScheduler:
+    from infrastructure.db.session import AsyncSessionLocal
+    from infrastructure.uow.task_uow import SqlAlchemyUnitOfWork
+
+    return RolloverScheduler(
+        lambda: TaskService(SqlAlchemyUnitOfWork(AsyncSessionLocal, analytics_cache)),
+        interval_seconds=float(os.getenv("ROLLOVER_INTERVAL_SECONDS", "60")),
+        chunk_size=int(os.getenv("ROLLOVER_CHUNK_SIZE", "200")),
+        concurrency=int(os.getenv("ROLLOVER_CONCURRENCY", "4")),
+    )
+
+
+# Standalone worker: python -m infrastructure.workers.rollover_worker
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    from infrastructure.services.analytics_cache import create_analytics_cache
+
+    # Only a shared (Redis) analytics cache sees these invalidations from another process.
+    asyncio.run(create_rollover_scheduler(create_analytics_cache()).run_forever())
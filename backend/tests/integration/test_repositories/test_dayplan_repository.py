@@ -99,3 +99,64 @@ async def test_create_get_update_delete_timelog(async_session):
     # Verify gone
     missing = await repo.get_time_log(created.id)
     assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_create_dayplan_is_unique_per_user_and_date(async_session):
+    repo = DayPlanRepository(async_session)
+
+    class User:
+        id = 1
+
+    first = await repo.create_dayplan(date.today(), User())
+    again = await repo.create_dayplan(date.today(), User())
+
+    assert again.id == first.id
+
+
+@pytest.mark.asyncio
+async def test_has_overlapping_time_log(async_session):
+    from datetime import time
+
+    repo = DayPlanRepository(async_session)
+
+    class User:
+        id = 1
+
+    dayplan = await repo.create_dayplan(date.today(), User())
+    other = await repo.create_dayplan(date.today() + timedelta(days=1), User())
+    await repo.create_time_log(TimeLogCreate(task_id=1, start_time=time(9), end_time=time(10), plan_id=dayplan.id))
+
+    assert await repo.dayplan_exists(dayplan.id)
+    assert not await repo.dayplan_exists(999)
+    assert await repo.has_overlapping_time_log(dayplan.id, time(9, 30), time(11))
+    assert await repo.has_overlapping_time_log(dayplan.id, time(8), time(12))
+    # Touching intervals don't overlap
+    assert not await repo.has_overlapping_time_log(dayplan.id, time(10), time(11))
+    assert not await repo.has_overlapping_time_log(dayplan.id, time(8), time(9))
+    assert not await repo.has_overlapping_time_log(other.id, time(9), time(10))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_time_logs_and_ranges(async_session):
+    from datetime import time
+
+    repo = DayPlanRepository(async_session)
+
+    class User:
+        id = 1
+
+    dayplan = await repo.create_dayplan(date.today(), User())
+    logs = [
+        TimeLogCreate(task_id=1, start_time=time(11), end_time=time(12), plan_id=dayplan.id),
+        TimeLogCreate(task_id=2, start_time=time(9), end_time=time(10), plan_id=dayplan.id),
+    ]
+
+    created = await repo.bulk_create_time_logs(logs)
+
+    assert [(c.task_id, c.start_time) for c in created] == [(1, time(11)), (2, time(9))]
+    assert created[0].id != created[1].id and not created[0].done
+    assert await repo.get_existing_dayplan_ids([dayplan.id, 999]) == {dayplan.id}
+    assert await repo.get_time_log_ranges([dayplan.id]) == {
+        dayplan.id: [(time(9), time(10)), (time(11), time(12))]
+    }
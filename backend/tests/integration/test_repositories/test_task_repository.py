@@ -3,7 +3,33 @@ from datetime import datetime, timezone, timedelta
 
 from infrastructure.repositories.task_repository import TaskRepository
 from domain.models.task_model import TaskCreateInput
-from domain.models.task_model import TaskProgressDomain
+from domain.models.task_model import TaskProgressDomain, TaskProgressStatsDomain
+
+
+def task_input(
+    description="Desc", main_task_id=None, estimated_hr=1, end_days=1, start=None, is_repititive=False
+):
+    start = start or datetime.now(timezone.utc)
+    return TaskCreateInput(
+        description=description,
+        start_date=start,
+        end_date=start + timedelta(days=end_days),
+        estimated_hr=estimated_hr,
+        main_task_id=main_task_id,
+        is_repititive=is_repititive,
+    )
+
+
+def progress_input(task_id, start, done_hr=1.0, estimated_hr=4.0, end_days=7, status="completed"):
+    return TaskProgressDomain(
+        task_id=task_id,
+        start_date=start,
+        end_date=start + timedelta(days=end_days),
+        status=status,
+        done_hr=done_hr,
+        estimated_hr=estimated_hr,
+    )
+
 
 @pytest.mark.asyncio
 async def test_create_and_get_task(async_session):
@@ -78,7 +104,12 @@ async def test_assign_user_to_task(async_session):
     
     assert error is None
     assert assigned_task is not None
-    assert len(assigned_task.assignees) == 1
+    assert assigned_task.assignees == [user.id]
+    assert assigned_task.description == "Desc"
+
+    assert await repo.assign_user_to_task(task.id, "user@test.com") == (None, "User already assigned")
+    assert await repo.assign_user_to_task(task.id, "nobody@test.com") == (None, "Task or User not found")
+    assert await repo.assign_user_to_task(999, "user@test.com") == (None, "Task or User not found")
 
 
 @pytest.mark.asyncio
@@ -109,6 +140,7 @@ async def test_progress_and_stop(async_session):
 
     assert created_prg is not None
     assert created_prg.task_id==task.id
+    assert created_prg.id is not None
 
     stop=await repo.create_stop(task.id)
 
@@ -132,3 +164,518 @@ async def test_progress_and_stop(async_session):
 
 
 
+
+@pytest.mark.asyncio
+async def test_get_progress_newest_first_with_keyset_cursor(async_session):
+    repo = TaskRepository(async_session)
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    task = await repo.create_task(
+        task_input("Weekly", estimated_hr=4, end_days=7, start=now, is_repititive=True), owner_id=1
+    )
+    # Two cycles share a start_date so the id tie-breaker is exercised
+    starts = [now - timedelta(days=7 * n) for n in (4, 3, 2, 2, 1)]
+    for start in starts:
+        await repo.create_progress(progress_input(task.id, start))
+
+    everything = await repo.get_progress(task.id, limit=10)
+    keys = [(p.start_date, p.id) for p in everything]
+    assert len(keys) == 5
+    assert keys == sorted(keys, reverse=True)
+
+    first_page = await repo.get_progress(task.id, limit=2)
+    assert first_page == everything[:2]
+    second_page = await repo.get_progress(
+        task.id, limit=2, before=(first_page[-1].start_date, first_page[-1].id)
+    )
+    assert second_page == everything[2:4]
+    last_page = await repo.get_progress(
+        task.id, limit=2, before=(second_page[-1].start_date, second_page[-1].id)
+    )
+    assert last_page == everything[4:]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_scoped_to_owner_or_assignee(async_session):
+    from infrastructure.models.model import User
+    repo = TaskRepository(async_session)
+
+    user = User(email="member@test.com", username="member")
+    async_session.add(user)
+    await async_session.flush()
+
+    owned = await repo.create_task(task_input(end_days=3), owner_id=user.id)
+    assigned = await repo.create_task(task_input(end_days=1), owner_id=99)
+    await repo.create_task(task_input(end_days=2), owner_id=99)
+    await repo.assign_user_to_task(assigned.id, "member@test.com")
+
+    tasks = await repo.get_tasks(user.id)
+
+    assert [t.id for t in tasks] == [assigned.id, owned.id]
+
+    first_page = await repo.get_tasks(user.id, limit=1)
+    next_page = await repo.get_tasks(
+        user.id, limit=1, after=(first_page[-1].end_date, first_page[-1].id)
+    )
+
+    assert [t.id for t in first_page] == [assigned.id]
+    assert [t.id for t in next_page] == [owned.id]
+
+@pytest.mark.asyncio
+async def test_bulk_progress_and_advance_repetitive_tasks(async_session):
+    repo = TaskRepository(async_session)
+
+    start = datetime(2030, 1, 1)
+    tasks = [
+        await repo.create_task(
+            task_input(f"Repeat {i}", estimated_hr=2, start=start, is_repititive=True), owner_id=1
+        )
+        for i in range(2)
+    ]
+
+    written = await repo.bulk_create_progress([
+        progress_input(task.id, start, estimated_hr=2, end_days=1, status="in_progress")
+        for task in tasks
+    ])
+    updated = await repo.advance_repetitive_tasks({
+        tasks[0].id: (start + timedelta(days=3), start + timedelta(days=4)),
+        tasks[1].id: (start + timedelta(days=5), start + timedelta(days=6)),
+    })
+    async_session.expire_all()
+
+    assert written == 2
+    assert updated == 2
+    assert len(await repo.get_progress(tasks[0].id)) == 1
+    moved = await repo.get_task(tasks[1].id)
+    assert moved.start_date == start + timedelta(days=5)
+    assert moved.end_date == start + timedelta(days=6)
+    assert moved.status == "in_progress"
+
+@pytest.mark.asyncio
+async def test_get_due_repetitive_tasks(async_session):
+    repo = TaskRepository(async_session)
+
+    past = datetime(2020, 1, 1)
+    due = await repo.create_task(task_input("Repeat", start=past, is_repititive=True), owner_id=1)
+    stopped = await repo.create_task(task_input("Repeat", start=past, is_repititive=True), owner_id=1)
+    await repo.update_task(stopped.id, {"is_stopped": True})
+    await repo.create_task(task_input("Repeat", start=past), owner_id=1)
+
+    now = datetime(2021, 1, 1)
+    ids = await repo.get_due_repetitive_task_ids(now)
+    tasks = await repo.get_due_repetitive_tasks(ids, now)
+
+    assert ids == [due.id]
+    assert [t.id for t in tasks] == [due.id]
+    assert await repo.get_due_repetitive_task_ids(now, after_id=due.id) == []
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_name_full_text_ranked_and_scoped(async_session):
+    repo = TaskRepository(async_session)
+
+    quarterly = await repo.create_task(task_input("Write quarterly report"), owner_id=1)
+    review = await repo.create_task(task_input("Report review: report, report!"), owner_id=1)
+    await repo.create_task(task_input("Buy groceries"), owner_id=1)
+    await repo.create_task(task_input("Someone else's report"), owner_id=2)
+
+    tasks = await repo.get_tasks_by_name("rep", user_id=1)
+    assert [t.id for t in tasks] == [review.id, quarterly.id]
+
+    assert [t.id for t in await repo.get_tasks_by_name("rep", user_id=1, skip=1, limit=1)] == [quarterly.id]
+    assert [t.id for t in await repo.get_tasks_by_name("Quarterly REPORT", user_id=1)] == [quarterly.id]
+    assert await repo.get_tasks_by_name("' OR 1=1 --", user_id=1) == []
+
+    await repo.update_task(quarterly.id, {"description": "Write yearly summary"})
+    assert [t.id for t in await repo.get_tasks_by_name("yearly", user_id=1)] == [quarterly.id]
+    assert [t.id for t in await repo.get_tasks_by_name("report", user_id=1)] == [review.id]
+
+@pytest.mark.asyncio
+async def test_propagate_done_hours_rolls_up_in_one_statement(async_session):
+    from infrastructure.models.model import Task
+
+    async_session.add_all([
+        Task(id=1, estimated_hr=10, done_hr=0, status="pending"),
+        Task(id=2, estimated_hr=4, done_hr=3, status="in_progress", main_task_id=1),
+        Task(id=3, estimated_hr=2, done_hr=1, status="pending", main_task_id=2),
+        Task(id=4, estimated_hr=5, done_hr=0, status="pending"),
+    ])
+    await async_session.flush()
+    repo = TaskRepository(async_session)
+
+    # 3 completes, 2 (3 + 2 >= 4) completes, 1 only gains 2's estimate
+    assert await repo.propagate_done_hours(3, 1.0) == {
+        3: (2.0, "completed"),
+        2: (5.0, "completed"),
+        1: (4.0, "in_progress"),
+    }
+    # Not enough to complete: only the task itself moves
+    assert await repo.propagate_done_hours(4, 1.5) == {4: (1.5, "in_progress")}
+
+@pytest.mark.asyncio
+async def test_closure_tree_create_move_and_delete(async_session):
+    repo = TaskRepository(async_session)
+
+    root = await repo.create_task(task_input("root", estimated_hr=10), owner_id=1)
+    child = await repo.create_task(task_input("child", root.id, estimated_hr=4), owner_id=1)
+    leaf = await repo.create_task(task_input("leaf", child.id, estimated_hr=2), owner_id=1)
+    other = await repo.create_task(task_input("other", estimated_hr=5), owner_id=1)
+
+    subtree = await repo.get_subtree(root.id)
+    assert [(n.id, n.depth) for n in subtree] == [(root.id, 0), (child.id, 1), (leaf.id, 2)]
+    assert subtree[0].subtree_estimated_hr == 16
+    assert subtree[1].subtree_estimated_hr == 6
+
+    ancestors = await repo.get_ancestors(leaf.id, user_id=1)
+    assert [(n.id, n.depth) for n in ancestors] == [(root.id, 2), (child.id, 1)]
+    assert await repo.get_ancestors(leaf.id, user_id=2) == []
+
+    assert await repo.is_in_subtree(root.id, leaf.id)
+    assert not await repo.is_in_subtree(leaf.id, root.id)
+
+    # Move child (and leaf with it) under other
+    await repo.update_task(child.id, {"main_task_id": other.id})
+    assert [n.id for n in await repo.get_subtree(root.id)] == [root.id]
+    assert [(n.id, n.depth) for n in await repo.get_subtree(other.id)] == [
+        (other.id, 0), (child.id, 1), (leaf.id, 2)
+    ]
+    assert [n.id for n in await repo.get_ancestors(leaf.id, user_id=1)] == [other.id, child.id]
+
+    assert await repo.delete_task(child.id, owner_id=1)
+    assert [n.id for n in await repo.get_subtree(other.id)] == [other.id]
+    assert not await repo.is_in_subtree(other.id, leaf.id)
+
+@pytest.mark.asyncio
+async def test_progress_stats_maintained_incrementally_and_rebuilt(async_session):
+    from sqlalchemy import update
+    from infrastructure.models.model import TaskProgress, TaskProgressStats
+
+    repo = TaskRepository(async_session)
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    task = await repo.create_task(task_input("weekly", estimated_hr=4, end_days=7, start=start), owner_id=1)
+
+    def cycle(week, done_hr, estimated_hr=4.0):
+        return progress_input(task.id, start + timedelta(weeks=week), done_hr, estimated_hr)
+
+    await repo.bulk_create_progress([cycle(0, 2.0), cycle(1, 6.0), cycle(2, 1.0)])
+    await repo.create_progress(cycle(3, 3.0, estimated_hr=0.0))
+    await repo.bulk_create_progress([cycle(4, 4.0)])
+
+    stats = await repo.get_progress_stats(task.id)
+    assert stats.cycle_count == 5
+    assert stats.done_hr_sum == 16.0
+    assert stats.done_hr_sq_sum == 4 + 36 + 1 + 9 + 16
+    assert stats.estimated_hr_sum == 16.0
+    assert stats.completion_pct_sum == 50 + 100 + 25 + 100
+    assert stats.estimated_cycle_count == 4
+    assert stats.first_half_done_hr == 8.0
+    assert stats.first_window_done_hr == 9.0
+    assert stats.last_window_done_hr == 8.0
+    assert stats.recent_done_hr == [3.0, 4.0]
+
+    # Wipe the derived data and rebuild it from the history
+    await async_session.execute(update(TaskProgress).values(cycle_no=None, cumulative_done_hr=None))
+    await async_session.execute(update(TaskProgressStats).values(cycle_count=0))
+    assert await repo.rebuild_progress_stats([task.id]) == 1
+    async_session.expunge_all()
+    assert await repo.get_progress_stats(task.id) == stats
+
+    assert await repo.get_progress_stats(task.id + 1) == TaskProgressStatsDomain()
+
+@pytest.mark.asyncio
+async def test_record_cycles_creates_stats_row_with_upsert_before_locking(async_session):
+    from sqlalchemy import event, insert
+    from infrastructure.models.model import TaskProgressStats
+
+    repo = TaskRepository(async_session)
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    first, second = [
+        await repo.create_task(task_input(d, estimated_hr=4, end_days=7, start=start), owner_id=1)
+        for d in ("first", "second")
+    ]
+    # Another writer already created the stats row of the second task
+    await async_session.execute(insert(TaskProgressStats).values(task_id=second.id))
+
+    statements = []
+    engine = async_session.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await repo.bulk_create_progress([progress_input(task.id, start, done_hr=2.0) for task in (first, second)])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements[0].startswith("INSERT INTO task_progress_stats")
+    assert "ON CONFLICT (task_id) DO NOTHING" in statements[0]
+    assert statements[1].startswith("SELECT")
+    for task in (first, second):
+        stats = await repo.get_progress_stats(task.id)
+        assert (stats.cycle_count, stats.done_hr_sum) == (1, 2.0)
+
+
+@pytest.mark.asyncio
+async def test_get_portfolio_computes_rates_in_one_query(async_session):
+    from infrastructure.models.model import User
+
+    repo = TaskRepository(async_session)
+    async_session.add(User(id=1, username="me", email="me@example.com"))
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    weekly = await repo.create_task(task_input("weekly", estimated_hr=4, end_days=7, start=start), owner_id=1)
+    await repo.update_task(weekly.id, {"done_hr": 3.0})
+    await repo.bulk_create_progress([
+        progress_input(weekly.id, start - timedelta(weeks=w + 1), done_hr)
+        for w, done_hr in enumerate((2.0, 8.0))
+    ])
+    unestimated = await repo.create_task(task_input("unestimated", estimated_hr=0, end_days=3, start=start), owner_id=1)
+    shared = await repo.create_task(task_input("shared", estimated_hr=10, end_days=5, start=start), owner_id=2)
+    await repo.assign_user_to_task(shared.id, "me@example.com")
+    await repo.create_task(task_input("private", start=start), owner_id=2)
+
+    entries = await repo.get_portfolio(user_id=1)
+
+    assert [e.id for e in entries] == [unestimated.id, shared.id, weekly.id]
+    by_id = {e.id: e for e in entries}
+    assert (by_id[weekly.id].cycle_count, by_id[weekly.id].completion_rate) == (2, 75.0)
+    assert by_id[weekly.id].efficiency_score == 80.0  # 4h estimate / 5h per cycle
+    assert (by_id[unestimated.id].completion_rate, by_id[unestimated.id].efficiency_score) == (0.0, 0.0)
+    assert by_id[shared.id].cycle_count == 0
+    assert [e.id for e in await repo.get_portfolio(user_id=1, skip=1, limit=1)] == [shared.id]
+
+@pytest.mark.asyncio
+async def test_unit_of_work_invalidates_analytics_after_commit(async_session):
+    from unittest.mock import AsyncMock
+    from infrastructure.uow.task_uow import SqlAlchemyUnitOfWork
+
+    cache = AsyncMock()
+    uow = SqlAlchemyUnitOfWork(lambda: async_session, analytics_cache=cache)
+    now = datetime.now(timezone.utc)
+
+    async with uow:
+        task = await uow.tasks.create_task(
+            TaskCreateInput(description="Desc", start_date=now, end_date=now + timedelta(days=1), estimated_hr=2),
+            owner_id=1,
+        )
+    cache.invalidate.assert_not_awaited()
+
+    async with uow:
+        await uow.tasks.update_task(task.id, {"description": "upd"})
+        await uow.tasks.create_stop(task.id)
+        cache.invalidate.assert_not_awaited()
+    cache.invalidate.assert_awaited_once_with({task.id})
+
+    cache.invalidate.reset_mock()
+    async with uow:
+        await uow.tasks.delete_stop(task.id)
+        await uow.rollback()
+    cache.invalidate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_export_scoped_to_user_in_batches(async_session):
+    from datetime import date, time
+    from infrastructure.models.model import DayPlan, TimeLog
+    repo = TaskRepository(async_session)
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    owned = [await repo.create_task(task_input(f"mine {n}", estimated_hr=2, start=now), owner_id=1) for n in range(3)]
+    other = await repo.create_task(task_input("theirs", estimated_hr=2, start=now), owner_id=2)
+    for task in (owned[0], other):
+        await repo.create_progress(progress_input(task.id, now, estimated_hr=2.0, end_days=1))
+        await repo.create_stop(task.id)
+    mine, theirs = DayPlan(date=date(2030, 1, 1), user_id=1), DayPlan(date=date(2030, 1, 1), user_id=2)
+    async_session.add_all([mine, theirs])
+    await async_session.flush()
+    async_session.add_all([
+        TimeLog(plan_id=mine.id, task_id=owned[0].id, start_time=time(9), end_time=time(10)),
+        TimeLog(plan_id=theirs.id, task_id=other.id, start_time=time(9), end_time=time(10)),
+    ])
+    await async_session.flush()
+
+    batches = [batch async for batch in repo.stream_export(1, batch_size=2)]
+
+    assert [(table, len(rows)) for table, rows in batches] == [
+        ("tasks", 2),
+        ("tasks", 1),
+        ("task_progress", 1),
+        ("stop_progress", 1),
+        ("times", 1),
+    ]
+    assert [row["description"] for _, rows in batches[:2] for row in rows] == ["mine 0", "mine 1", "mine 2"]
+    assert all(rows[0]["task_id"] == owned[0].id for _, rows in batches[2:])
+    columns = repo.export_columns()
+    assert columns[0] == "id" and {"description", "stopped_at", "plan_id", "cycle_no"} <= set(columns)
+    assert len(columns) == len(set(columns))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_nests_in_batch_and_under_existing(async_session):
+    repo = TaskRepository(async_session)
+
+    existing = await repo.create_task(task_input("existing"), owner_id=1)
+    foreign = await repo.create_task(task_input("foreign"), owner_id=2)
+
+    created = await repo.bulk_create_tasks(
+        [task_input("epic"), task_input("story"), task_input("sub"), task_input("loose", existing.id)],
+        [None, 0, 1, None],
+        owner_id=1,
+    )
+
+    epic, story, sub, loose = created
+    assert [t.description for t in created] == ["epic", "story", "sub", "loose"]
+    assert (story.main_task_id, sub.main_task_id, loose.main_task_id) == (epic.id, story.id, existing.id)
+    assert epic.subtasks == [story.id] and sub.subtasks == []
+    assert [(n.id, n.depth) for n in await repo.get_subtree(epic.id)] == [
+        (epic.id, 0), (story.id, 1), (sub.id, 2)
+    ]
+    assert [n.id for n in await repo.get_ancestors(sub.id, user_id=1)] == [epic.id, story.id]
+    assert [n.id for n in await repo.get_subtree(existing.id)] == [existing.id, loose.id]
+    fetched = await repo.get_task(story.id)
+    assert fetched.owner_id == 1 and fetched.subtasks == [sub.id]
+
+    assert await repo.get_task_visibility([existing.id, foreign.id, 999], user_id=1) == {
+        existing.id: True,
+        foreign.id: False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_in_one_statement(async_session):
+    from domain.models.task_model import TaskStatus
+    from infrastructure.models.model import User
+    repo = TaskRepository(async_session)
+    async_session.add(User(email="member@test.com", username="member"))
+    await async_session.flush()
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    first = await repo.create_task(task_input("first"), owner_id=1)
+    second = await repo.create_task(task_input("second"), owner_id=1)
+    child = await repo.create_task(task_input("child", first.id), owner_id=1)
+    untouched = await repo.create_task(task_input("untouched"), owner_id=1)
+    await repo.assign_user_to_task(second.id, "member@test.com")
+    repo.changed_task_ids.clear()
+
+    new_end = now + timedelta(days=3)
+    updated = await repo.bulk_update_tasks({
+        second.id: {"status": TaskStatus.completed, "end_date": new_end},
+        first.id: {"status": "completed", "description": "renamed", "estimated_hr": None},
+    })
+
+    assert [t.id for t in updated] == [first.id, second.id]
+    assert [t.status for t in updated] == ["completed", "completed"]
+    assert (updated[0].description, updated[0].estimated_hr) == ("renamed", 1)
+    assert updated[1].description == "second" and updated[1].end_date.replace(tzinfo=timezone.utc) == new_end
+    assert updated[0].subtasks == [child.id] and updated[1].assignees != []
+    assert repo.changed_task_ids == {first.id, second.id}
+
+    async_session.expire_all()
+    assert (await repo.get_task(untouched.id)).status == "pending"
+    assert (await repo.get_task(first.id)).description == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_single_task_writes_are_one_statement_each(async_session):
+    from sqlalchemy import event
+    from domain.models.task_model import StopProgressDomain
+    repo = TaskRepository(async_session)
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    statements = []
+    engine = async_session.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # INSERT ... RETURNING plus the closure row
+        task = await repo.create_task(
+            TaskCreateInput(description="Desc", start_date=now, end_date=now, estimated_hr=2),
+            owner_id=1,
+        )
+        assert statements == ["INSERT", "INSERT"]
+        assert task.id is not None and task.subtasks == [] and task.assignees == []
+
+        statements.clear()
+        stop = await repo.create_stop(task.id)
+        assert statements == ["INSERT"]
+        assert isinstance(stop, StopProgressDomain) and stop.task_id == task.id
+        assert await repo.get_stop(task.id) == stop
+
+        statements.clear()
+        updated = await repo.update_task(task.id, {"description": "upd", "status": None})
+        # UPDATE ... RETURNING, then subtask and assignee ids for the response
+        assert statements == ["UPDATE", "SELECT", "SELECT"]
+        assert (updated.description, updated.status) == ("upd", "pending")
+        assert repo.changed_task_ids >= {task.id}
+        assert await repo.update_task(999, {"description": "x"}) is None
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_deleting_parent_invalidates_cached_subtask_analytics(async_session):
+    from sqlalchemy import text
+    from domain.exceptions import NotFoundError
+    from infrastructure.models.model import User
+    from infrastructure.services.analytics_cache import AnalyticsCache, InMemoryCacheBackend
+    from infrastructure.uow.task_uow import SqlAlchemyUnitOfWork
+    from usecases.task_usecase import TaskService
+
+    class Owner:
+        id = 1
+
+    async_session.add(User(id=Owner.id, email="owner@test.com", username="owner"))
+    await async_session.commit()
+    # SQLite only cascades the subtask delete with foreign keys enabled
+    await async_session.execute(text("PRAGMA foreign_keys=ON"))
+    try:
+        cache = AnalyticsCache(InMemoryCacheBackend())
+        service = TaskService(SqlAlchemyUnitOfWork(lambda: async_session, cache), cache)
+        now = datetime.now(timezone.utc)
+
+        async with service.uow:
+            parent = await service.uow.tasks.create_task(
+                TaskCreateInput(description="parent", start_date=now, end_date=now + timedelta(days=1), estimated_hr=2),
+                owner_id=Owner.id,
+            )
+        async with service.uow:
+            child = await service.uow.tasks.create_task(
+                TaskCreateInput(
+                    description="child", start_date=now, end_date=now + timedelta(days=1), estimated_hr=1,
+                    main_task_id=parent.id,
+                ),
+                owner_id=Owner.id,
+            )
+        # Adding the subtask invalidated the parent's payload
+        assert (await cache.get(parent.id))[1] == 1
+
+        # Both analytics payloads are cached, as after a read
+        for task in (parent, child):
+            _, version = await cache.get(task.id)
+            await cache.set(task.id, version, {"task": await service.get_task(task.id, Owner()), "analytics": {}})
+        assert (await service.get_task_analytics(child.id, Owner()))["task"].id == child.id
+
+        assert await service.delete_task(parent.id, Owner())
+
+        with pytest.raises(NotFoundError):
+            await service.get_task_analytics(child.id, Owner())
+        assert (await cache.get(parent.id))[0] is None
+    finally:
+        await async_session.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+@pytest.mark.asyncio
+async def test_moving_task_marks_old_and_new_parent_changed(async_session):
+    repo = TaskRepository(async_session)
+    old_parent = await repo.create_task(task_input("old parent"), owner_id=1)
+    new_parent = await repo.create_task(task_input("new parent"), owner_id=1)
+    child = await repo.create_task(task_input("child", old_parent.id), owner_id=1)
+
+    repo.changed_task_ids.clear()
+    await repo.update_task(child.id, {"main_task_id": new_parent.id})
+    assert repo.changed_task_ids == {child.id, old_parent.id, new_parent.id}
+
+    repo.changed_task_ids.clear()
+    await repo.update_task(child.id, {"description": "renamed"})
+    assert repo.changed_task_ids == {child.id}
@@ -0,0 +1,15 @@
+import pytest
+
+from domain.models.user_model import UserRegister
+from infrastructure.repositories.user_repository import UserRepository
+
+
+@pytest.mark.asyncio
+async def test_has_any_user(async_session):
+    repo = UserRepository(async_session)
+
+    assert await repo.has_any_user() is False
+
+    await repo.Create(UserRegister("awel", "awel@awel.com", "1234"), "hashed", "superadmin")
+
+    assert await repo.has_any_user() is True
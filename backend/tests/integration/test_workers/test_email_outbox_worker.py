@@ -0,0 +1,103 @@
+import socket
+
+import pytest
+from infrastructure.models.model import EmailOutbox
+from infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from infrastructure.services.outbox_email_service import OutboxEmailService
+from infrastructure.services.smtp_pool import SMTPConnectionPool
+from infrastructure.workers.email_outbox_worker import EmailOutboxSender
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class CollectingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = CollectingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+async def enqueue(async_session, count):
+    repo = EmailOutboxRepository(async_session)
+    for i in range(count):
+        await repo.enqueue(f"user{i}@example.com", f"subject {i}", "<p>hi</p>")
+    await async_session.commit()
+
+
+def make_sender(async_session, port, **kwargs):
+    session_factory = sessionmaker(async_session.bind, class_=AsyncSession, expire_on_commit=False)
+    pool = SMTPConnectionPool("127.0.0.1", port, start_tls=False, size=1)
+    return EmailOutboxSender(session_factory, pool, "App <app@example.com>", **kwargs), pool
+
+
+@pytest.mark.asyncio
+async def test_outbox_sender_delivers_batch_over_one_connection(async_session, smtp_server):
+    controller, handler = smtp_server
+    await enqueue(async_session, 3)
+    sender, pool = make_sender(async_session, controller.port)
+
+    assert await sender.run_once() == 3
+    assert await sender.run_once() == 0
+    await pool.close()
+
+    assert sorted(m.rcpt_tos[0] for m in handler.messages) == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert pool.connects == 1
+    rows = (await async_session.execute(select(EmailOutbox))).scalars().all()
+    assert {row.status for row in rows} == {"sent"}
+    assert all(row.attempts == 1 for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_outbox_sender_retries_with_backoff_then_gives_up(async_session):
+    await enqueue(async_session, 1)
+    sender, pool = make_sender(async_session, free_port(), max_attempts=2, backoff_seconds=0)
+
+    await sender.run_once()
+    row = (await async_session.execute(select(EmailOutbox))).scalar_one()
+    assert (row.status, row.attempts) == ("pending", 1)
+    assert row.last_error
+
+    await sender.run_once()
+    await async_session.refresh(row)
+    assert (row.status, row.attempts) == ("failed", 2)
+    assert await sender.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_email_service_enqueues_in_the_callers_transaction(async_session, monkeypatch):
+    for name in ("SMTP_USERNAME", "SMTP_PASSWORD", "FROM_EMAIL"):
+        monkeypatch.delenv(name, raising=False)
+    service = OutboxEmailService(async_session)
+
+    assert await service.send_verification_email("bob", "bob@example.com", "tok")
+    await async_session.rollback()
+    assert (await async_session.execute(select(EmailOutbox))).scalars().all() == []
+
+    assert await service.send_password_reset_email("bob", "bob@example.com", "tok")
+    await async_session.commit()
+    row = (await async_session.execute(select(EmailOutbox))).scalar_one()
+    assert (row.to_address, row.status) == ("bob@example.com", "pending")
@@ -0,0 +1,105 @@
+import pytest
+from infrastructure.services.analytics_cache import (
+    AnalyticsCache,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    create_analytics_cache,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The slice of redis.asyncio.Redis the backend uses (expiry not modelled)."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+class BrokenBackend:
+    async def get(self, key):
+        raise ConnectionError("down")
+
+    set = version = incr = get
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", [InMemoryCacheBackend(), RedisCacheBackend(FakeRedis())])
+async def test_analytics_cache_invalidation_orphans_old_payload(backend):
+    cache = AnalyticsCache(backend, ttl_seconds=60)
+
+    assert await cache.get(1) == (None, 0)
+    await cache.set(1, 0, {"analytics": "v0"})
+    assert await cache.get(1) == ({"analytics": "v0"}, 0)
+
+    await cache.invalidate([1, 1, 2])
+    assert await cache.get(1) == (None, 1)
+    assert await cache.get(2) == (None, 1)
+
+    # A payload computed before the bump lands under the old version and stays unreachable
+    await cache.set(1, 0, {"analytics": "stale"})
+    assert await cache.get(1) == (None, 1)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_ttl_and_lru():
+    clock = FakeClock()
+    cache = AnalyticsCache(InMemoryCacheBackend(maxsize=2, clock=clock), ttl_seconds=60)
+
+    await cache.set(1, 0, "one")
+    await cache.set(2, 0, "two")
+    assert (await cache.get(1))[0] == "one"  # 1 is now most recently used
+    await cache.set(3, 0, "three")
+
+    assert (await cache.get(2))[0] is None
+    assert (await cache.get(1))[0] == "one"
+
+    clock.now += 61
+    assert (await cache.get(1))[0] is None
+    assert len(cache.backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_sets_ttl():
+    redis = FakeRedis()
+    cache = AnalyticsCache(RedisCacheBackend(redis), ttl_seconds=30)
+
+    await cache.set(7, 0, {"a": 1})
+
+    assert redis.expiry == {"task-analytics:7:v0": 30}
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_errors_are_misses():
+    cache = AnalyticsCache(BrokenBackend(), ttl_seconds=30)
+
+    assert await cache.get(1) == (None, -1)
+    await cache.set(1, -1, "payload")
+    await cache.invalidate([1])
+
+
+def test_in_memory_analytics_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("ANALYTICS_CACHE_REDIS_URL", raising=False)
+    monkeypatch.delenv("ANALYTICS_CACHE_IN_MEMORY_ENABLED", raising=False)
+    assert create_analytics_cache() is None
+
+    monkeypatch.setenv("ANALYTICS_CACHE_IN_MEMORY_ENABLED", "true")
+    assert isinstance(create_analytics_cache().backend, InMemoryCacheBackend)
@@ -0,0 +1,49 @@
+from domain.models.user_model import TokenClaimUser
+from infrastructure.services.claims_cache import ClaimsCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def claims(user_id=1):
+    return TokenClaimUser(user_id, "a@a.com", "a", "user")
+
+
+def test_claims_cache_hit_and_ttl_expiry():
+    clock = FakeClock()
+    cache = ClaimsCache(ttl_seconds=30, clock=clock)
+
+    cache.set("token", claims())
+    assert cache.get("token") == claims()
+
+    clock.now += 31
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_claims_cache_never_outlives_token_exp():
+    clock = FakeClock()
+    cache = ClaimsCache(ttl_seconds=30, clock=clock)
+
+    cache.set("token", claims(), token_exp=clock.now + 5)
+    clock.now += 6
+
+    assert cache.get("token") is None
+
+
+def test_claims_cache_evicts_least_recently_used():
+    cache = ClaimsCache(ttl_seconds=30, maxsize=2, clock=FakeClock())
+
+    cache.set("a", claims(1))
+    cache.set("b", claims(2))
+    cache.get("a")
+    cache.set("c", claims(3))
+
+    assert cache.get("a") == claims(1)
+    assert cache.get("b") is None
+    assert cache.get("c") == claims(3)
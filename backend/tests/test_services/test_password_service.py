@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from infrastructure.services.password_service import PasswordService
+
+
+@pytest.mark.asyncio
+async def test_password_service_hashes_off_the_event_loop():
+    service = PasswordService(max_workers=2)
+
+    hashed = await service.hash_password("secret")
+
+    assert hashed != "secret"
+    assert await service.verify_password("secret", hashed)
+    assert not await service.verify_password("wrong", hashed)
+    assert service.metrics()["completed"] == 3
+    service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_service_bounds_concurrency_and_reports_queue_depth():
+    service = PasswordService(max_workers=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    started = []
+
+    def slow_hash(password):
+        started.append(password)
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return password
+
+    service.pwd_context.hash = slow_hash
+    calls = [asyncio.create_task(service.hash_password(str(i))) for i in range(3)]
+    while not started:
+        await asyncio.sleep(0.01)
+
+    assert service.metrics()["in_flight"] == 1
+    assert service.metrics()["queue_depth"] == 2
+
+    release.set()
+    assert await asyncio.gather(*calls) == ["0", "1", "2"]
+    assert service.metrics()["queue_depth"] == 0
+    service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_service_drops_cancelled_calls_from_queue_depth():
+    service = PasswordService(max_workers=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    started = []
+
+    def slow_hash(password):
+        started.append(password)
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return password
+
+    service.pwd_context.hash = slow_hash
+    running = asyncio.create_task(service.hash_password("0"))
+    while not started:
+        await asyncio.sleep(0.01)
+    waiting = asyncio.create_task(service.hash_password("1"))
+    await asyncio.sleep(0.01)
+    assert service.metrics()["queue_depth"] == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert service.metrics()["queue_depth"] == 0
+
+    release.set()
+    assert await running == "0"
+    assert service.metrics()["queue_depth"] == 0
+    assert started == ["0"]
+    service.shutdown()
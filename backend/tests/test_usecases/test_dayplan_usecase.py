@@ -57,12 +57,9 @@ async def test_create_time_log_overlaps(mock_uow):
 
     # Existing timelog that overlaps
     now = datetime.now()
-    existing_timelog = MagicMock()
-    existing_timelog.start_time = now
-    existing_timelog.end_time = now + timedelta(hours=1)
-
     dayplan_repo = AsyncMock()
-    dayplan_repo.get_dayplanById.return_value = MagicMock(times=[existing_timelog])
+    dayplan_repo.dayplan_exists.return_value = True
+    dayplan_repo.has_overlapping_time_log.return_value = True
     
     task = MagicMock()
     task.owner_id = 1
@@ -87,6 +84,10 @@ async def test_create_time_log_overlaps(mock_uow):
 
     with pytest.raises(BadRequestError):
         await usecase.create_time_log(new_timelog, FakeUser())
+    dayplan_repo.has_overlapping_time_log.assert_awaited_once_with(
+        1, new_timelog.start_time, new_timelog.end_time
+    )
+    dayplan_repo.create_time_log.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_mark_timelog_success_updates_done_hr(mock_uow):
@@ -98,13 +99,6 @@ async def test_mark_timelog_success_updates_done_hr(mock_uow):
     task.status = "in_progress"
     task.main_task_id=None
 
-    up_task = MagicMock()
-    up_task.owner_id = 1
-    up_task.estimated_hr = 1
-    up_task.done_hr = 1
-    up_task.status = "in_progress"
-    up_task.main_task_id=None
-
     timelog = MagicMock()
     timelog.id = 1
     timelog.start_time = (datetime.now() - timedelta(hours=1)).time()
@@ -124,8 +118,7 @@ async def test_mark_timelog_success_updates_done_hr(mock_uow):
     dayplan_repo.update_time_log.return_value = up_timelog
 
     task_repo = AsyncMock()
-    task_repo.get_task.return_value = task
-    task_repo.update_task.return_value = up_task
+    task_repo.propagate_done_hours.return_value = {task.id: (1, "completed")}
 
 
     mock_uow.dayplan_repo = dayplan_repo
@@ -137,8 +130,12 @@ async def test_mark_timelog_success_updates_done_hr(mock_uow):
 
     assert result.done == True
     assert result.task.done_hr==1
-    mock_uow.task_repo.update_task.assert_awaited()
-    assert mock_uow.task_repo.update_task.await_count==1
+    assert result.task.status == "completed"
+    task_repo.propagate_done_hours.assert_awaited_once_with(
+        task.id, usecase._Duration(up_timelog.start_time, up_timelog.end_time)
+    )
+    task_repo.get_task.assert_not_awaited()
+    task_repo.update_task.assert_not_awaited()
     mock_uow.commit.assert_awaited()
 
 
@@ -181,13 +178,13 @@ async def test_timelog_completion_propagates_to_parent(mock_uow):
     mock_uow.dayplan_repo.get_time_log = AsyncMock(return_value=timelog)
     mock_uow.dayplan_repo.update_time_log = AsyncMock(return_value=timelog)
 
-    # child gets updated to completed
-    mock_uow.task_repo.update_task = AsyncMock(side_effect=[
-        child_task,
-        parent_task
-    ])
-
+    # The whole chain is rolled up by one repository call
+    mock_uow.task_repo.propagate_done_hours = AsyncMock(return_value={
+        child_task.id: (6, "completed"),
+        parent_task.id: (5, "in_progress"),
+    })
     mock_uow.task_repo.get_task = AsyncMock(return_value=parent_task)
+    mock_uow.task_repo.update_task = AsyncMock()
 
 
     # Act
@@ -195,15 +192,13 @@ async def test_timelog_completion_propagates_to_parent(mock_uow):
 
     # Assert
     assert result == timelog
-    # First update: child task completed
-    mock_uow.task_repo.update_task.assert_any_call(
-        child_task.id, {"done_hr": child_task.done_hr, "status": "completed"}
-    )
-    # Then parent got updated
-    mock_uow.task_repo.update_task.assert_any_call(
-        parent_task.id, {"done_hr": parent_task.done_hr, "status": "in_progress"}
+    mock_uow.task_repo.propagate_done_hours.assert_awaited_once_with(
+        child_task.id, usecase._Duration(timelog.start_time, timelog.end_time)
     )
-    mock_uow.task_repo.get_task.assert_called_once_with(parent_task.id)
+    assert (child_task.done_hr, child_task.status) == (6, "completed")
+    # No per-ancestor round trips
+    mock_uow.task_repo.get_task.assert_not_awaited()
+    mock_uow.task_repo.update_task.assert_not_awaited()
 
 
 
@@ -277,8 +272,7 @@ async def test_mark_timelog_success_task_update_failed(mock_uow):
     dayplan_repo.update_time_log.return_value = up_timelog
 
     task_repo = AsyncMock()
-    task_repo.get_task.return_value = task
-    task_repo.update_task = AsyncMock(side_effect=RuntimeError("DB failure"))
+    task_repo.propagate_done_hours = AsyncMock(side_effect=RuntimeError("DB failure"))
 
 
     mock_uow.dayplan_repo = dayplan_repo
@@ -327,7 +321,8 @@ async def test_create_time_log_start_after_end_raises(mock_uow):
     # Minimal repos to pass earlier checks if reached
     mock_uow.dayplan_repo = AsyncMock()
     mock_uow.task_repo = AsyncMock()
-    mock_uow.dayplan_repo.get_dayplanById.return_value = MagicMock(times=[])
+    mock_uow.dayplan_repo.dayplan_exists.return_value = True
+    mock_uow.dayplan_repo.has_overlapping_time_log.return_value = False
     mock_uow.task_repo.get_task.return_value = MagicMock(owner_id=1, status="in_progress", id=1)
 
     usecase = DayPlanUseCase(mock_uow)
@@ -347,7 +342,7 @@ async def test_create_time_log_dayplan_not_found(mock_uow):
     now = datetime.now()
     mock_uow.dayplan_repo = AsyncMock()
     mock_uow.task_repo = AsyncMock()
-    mock_uow.dayplan_repo.get_dayplanById.return_value = None
+    mock_uow.dayplan_repo.dayplan_exists.return_value = False
 
     usecase = DayPlanUseCase(mock_uow)
 
@@ -366,7 +361,8 @@ async def test_create_time_log_task_not_found(mock_uow):
     now = datetime.now()
     mock_uow.dayplan_repo = AsyncMock()
     mock_uow.task_repo = AsyncMock()
-    mock_uow.dayplan_repo.get_dayplanById.return_value = MagicMock(times=[])
+    mock_uow.dayplan_repo.dayplan_exists.return_value = True
+    mock_uow.dayplan_repo.has_overlapping_time_log.return_value = False
     mock_uow.task_repo.get_task.return_value = None
 
     usecase = DayPlanUseCase(mock_uow)
@@ -386,7 +382,8 @@ async def test_create_time_log_permission_denied(mock_uow):
     now = datetime.now()
     mock_uow.dayplan_repo = AsyncMock()
     mock_uow.task_repo = AsyncMock()
-    mock_uow.dayplan_repo.get_dayplanById.return_value = MagicMock(times=[])
+    mock_uow.dayplan_repo.dayplan_exists.return_value = True
+    mock_uow.dayplan_repo.has_overlapping_time_log.return_value = False
     # Task owned by someone else
     mock_uow.task_repo.get_task.return_value = MagicMock(owner_id=2, status="pending", id=1)
 
@@ -407,7 +404,8 @@ async def test_create_time_log_success_updates_task_if_pending(mock_uow):
     now = datetime.now()
     dayplan_repo = AsyncMock()
     task_repo = AsyncMock()
-    dayplan_repo.get_dayplanById.return_value = MagicMock(times=[])
+    dayplan_repo.dayplan_exists.return_value = True
+    dayplan_repo.has_overlapping_time_log.return_value = False
 
     # Task is pending initially
     task = MagicMock(id=1, owner_id=1, status="pending")
@@ -482,3 +480,66 @@ async def test_delete_timelog_success(mock_uow):
 
 
 
+
+@pytest.mark.asyncio
+async def test_create_time_logs_batch_sweep(mock_uow):
+    from datetime import time
+
+    from domain.models.dayplan_model import TimeLog
+
+    dayplan_repo = AsyncMock()
+    task_repo = AsyncMock()
+    dayplan_repo.get_existing_dayplan_ids.return_value = {1}
+    dayplan_repo.get_time_log_ranges.return_value = {1: [(time(12), time(13))]}
+    task_repo.get_tasks_by_ids.return_value = [
+        MagicMock(id=1, owner_id=1, status="pending"),
+        MagicMock(id=2, owner_id=2, status="in_progress"),
+    ]
+    dayplan_repo.bulk_create_time_logs.side_effect = lambda logs: [
+        TimeLog(**vars(log), id=100 + n, done=False, task=None) for n, log in enumerate(logs)
+    ]
+    mock_uow.dayplan_repo = dayplan_repo
+    mock_uow.task_repo = task_repo
+
+    def log(start, end, task_id=1, plan_id=1):
+        return TimeLogCreate(task_id=task_id, start_time=time(*start), end_time=time(*end), plan_id=plan_id)
+
+    batch = [
+        log((10,), (11,)),         # ok
+        log((9,), (10,)),          # ok, touches item 0
+        log((10, 30), (11, 30)),   # overlaps item 0 in the batch
+        log((12, 30), (14,)),      # overlaps an existing log
+        log((14,), (15,), task_id=2),  # not the user's task
+        log((15,), (14,)),         # start after end
+        log((8,), (9,), plan_id=7),    # unknown plan
+        log((16,), (17,), task_id=3),  # unknown task
+    ]
+
+    results = await DayPlanUseCase(mock_uow).create_time_logs(batch, FakeUser())
+
+    assert [r.index for r in results] == list(range(len(batch)))
+    assert [r.time_log.id if r.time_log else None for r in results[:2]] == [100, 101]
+    assert [r.error for r in results] == [
+        None,
+        None,
+        "Time log overlaps with another time log in the batch",
+        "Time log overlaps with existing time log",
+        "You don't have permission to work on this task",
+        "Start time must be before end time",
+        "DayPlan not found",
+        "Task not found",
+    ]
+    dayplan_repo.bulk_create_time_logs.assert_awaited_once_with([batch[0], batch[1]])
+    task_repo.update_task.assert_awaited_once_with(1, {"status": "in_progress"})
+    mock_uow.commit.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_time_logs_rejects_oversized_batch(mock_uow):
+    from datetime import time
+
+    usecase = DayPlanUseCase(mock_uow)
+    batch = [TimeLogCreate(1, time(9), time(10), 1)] * (usecase.MAX_TIME_LOG_BATCH + 1)
+
+    with pytest.raises(BadRequestError):
+        await usecase.create_time_logs(batch, FakeUser())
@@ -3,7 +3,13 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from domain.exceptions import BadRequestError, NotFoundError
-from domain.models.task_model import TaskCreateInput, TaskOutput, TaskProgressDomain
+from domain.models.task_model import (
+    PROGRESS_TREND_WINDOW,
+    TaskCreateInput,
+    TaskOutput,
+    TaskProgressDomain,
+    TaskProgressStatsDomain,
+)
 from usecases.task_usecase import TaskService
 
 
@@ -30,6 +36,24 @@ def current_user():
     return User()
 
 
+def progress_stats(history):
+    """What the repository's running aggregates hold for this progress history."""
+    done = [p.done_hr for p in sorted(history, key=lambda p: p.start_date)]
+    estimated = [p for p in history if p.estimated_hr > 0]
+    return TaskProgressStatsDomain(
+        cycle_count=len(done),
+        done_hr_sum=sum(done),
+        done_hr_sq_sum=sum(d * d for d in done),
+        estimated_hr_sum=sum(p.estimated_hr for p in history),
+        completion_pct_sum=sum(min(100, p.done_hr / p.estimated_hr * 100) for p in estimated),
+        estimated_cycle_count=len(estimated),
+        first_half_done_hr=sum(done[:len(done) // 2]),
+        first_window_done_hr=sum(done[:PROGRESS_TREND_WINDOW]),
+        last_window_done_hr=sum(done[-PROGRESS_TREND_WINDOW:]),
+        recent_done_hr=done[-2:],
+    )
+
+
 @pytest.mark.asyncio
 async def test_create_task_success(service, mock_uow, current_user):
     task_input = TaskCreateInput(
@@ -193,20 +217,27 @@ async def test_get_tasks_filters_by_user(service, mock_uow, current_user):
                       estimated_hr=1,
                       owner_id=1, 
                       assignees=[1])
-    task_unrelated = TaskOutput(id=1,
-                      description="disc",
-                      end_date=datetime.now(timezone.utc) + timedelta(days=2),
-                      estimated_hr=1,
-                      owner_id=2, 
-                      assignees=[])
 
-    mock_uow.tasks.get_tasks = AsyncMock(return_value=[task_owned, task_assigned, task_unrelated])
+    mock_uow.tasks.get_tasks = AsyncMock(return_value=[task_owned, task_assigned])
 
     result = await service.get_tasks(current_user)
 
     assert len(result) == 2
     assert all(t in [task_owned, task_assigned] for t in result)
-    mock_uow.commit.assert_awaited()
+    # visibility filtering is pushed down to the repository
+    mock_uow.tasks.get_tasks.assert_awaited_once_with(current_user.id, skip=0, limit=100, after=None)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_passes_keyset_cursor(service, mock_uow, current_user):
+    cursor_date = datetime(2030, 1, 1)
+    mock_uow.tasks.get_tasks = AsyncMock(return_value=[])
+
+    await service.get_tasks(current_user, limit=10, after_end_date=cursor_date, after_id=7)
+
+    mock_uow.tasks.get_tasks.assert_awaited_once_with(
+        current_user.id, skip=0, limit=10, after=(cursor_date.replace(tzinfo=timezone.utc), 7)
+    )
 
 
 @pytest.mark.asyncio
@@ -225,20 +256,72 @@ async def test_handle_repetitive_task_creates_progress(service, mock_uow):
         is_stopped=False
     )
 
-    mock_uow.tasks.create_progress = AsyncMock()
-    mock_uow.tasks.update_task = AsyncMock()
+    mock_uow.tasks.bulk_create_progress = AsyncMock()
+    mock_uow.tasks.advance_repetitive_tasks = AsyncMock()
 
     await service._handle_repetitive_task(task)
 
-    assert mock_uow.tasks.create_progress.await_count == 7
-    mock_uow.tasks.update_task.assert_awaited()
+    mock_uow.tasks.bulk_create_progress.assert_awaited_once()
+    progress = mock_uow.tasks.bulk_create_progress.await_args.args[0]
+    assert len(progress) == 7
+    assert progress[0].done_hr == 2 and progress[0].status == "pending"
+    assert all(p.done_hr == 0.0 and p.status == "in_progress" for p in progress[1:])
+    mock_uow.tasks.advance_repetitive_tasks.assert_awaited_once_with({1: (task.start_date, task.end_date)})
+    assert task.end_date > datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_plan_rollover_closed_form(service):
+    now = datetime(2030, 1, 10, 12, tzinfo=timezone.utc)
+    stale = TaskOutput(
+        id=1,
+        owner_id=1,
+        description="daily",
+        start_date=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        end_date=datetime(2030, 1, 2, tzinfo=timezone.utc),
+        estimated_hr=1,
+        done_hr=1,
+        status="in_progress",
+        is_repititive=True,
+    )
+    current = TaskOutput(
+        id=2,
+        owner_id=1,
+        description="weekly",
+        start_date=datetime(2030, 1, 8, tzinfo=timezone.utc),
+        end_date=datetime(2030, 1, 15, tzinfo=timezone.utc),
+        estimated_hr=1,
+        is_repititive=True,
+    )
+    stopped = TaskOutput(
+        id=3,
+        owner_id=1,
+        description="stopped",
+        start_date=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        end_date=datetime(2030, 1, 2, tzinfo=timezone.utc),
+        estimated_hr=1,
+        is_repititive=True,
+        is_stopped=True,
+    )
+
+    progress, windows = service._plan_rollover([stale, current, stopped], now)
+
+    assert len(progress) == 9
+    assert progress[-1].start_date == datetime(2030, 1, 9, tzinfo=timezone.utc)
+    assert windows == {
+        1: (datetime(2030, 1, 10, tzinfo=timezone.utc), datetime(2030, 1, 11, tzinfo=timezone.utc))
+    }
+
+    progress, windows = service._plan_rollover([stale], now, max_cycle=3)
+
+    assert len(progress) == 3
+    assert windows[1][1] == datetime(2030, 1, 11, tzinfo=timezone.utc)
 
 
 
 
 @pytest.mark.asyncio
-async def test_get_tasks_rolls_back_on_failure(service, mock_uow, current_user):
-    # make get_tasks return one task
+async def test_get_tasks_does_not_roll_over(service, mock_uow, current_user):
     task = TaskOutput(
         id=1,
         owner_id=current_user.id,
@@ -254,18 +337,61 @@ async def test_get_tasks_rolls_back_on_failure(service, mock_uow, current_user):
     )
 
     mock_uow.tasks.get_tasks = AsyncMock(return_value=[task])
-    mock_uow.tasks.create_progress = AsyncMock()
-    mock_uow.tasks.update_task = AsyncMock(side_effect=RuntimeError("DB failure"))
+    mock_uow.tasks.bulk_create_progress = AsyncMock()
+    mock_uow.tasks.advance_repetitive_tasks = AsyncMock()
+
+    result = await service.get_tasks(skip=0, limit=10, current_user=current_user)
+
+    assert result == [task]
+    mock_uow.tasks.bulk_create_progress.assert_not_awaited()
+    mock_uow.tasks.advance_repetitive_tasks.assert_not_awaited()
+    mock_uow.commit.assert_not_awaited()
+
 
+@pytest.mark.asyncio
+async def test_rollover_tasks_commits(service, mock_uow):
+    task = TaskOutput(
+        id=1,
+        owner_id=1,
+        start_date=datetime.now(timezone.utc) - timedelta(days=2),
+        end_date=datetime.now(timezone.utc) - timedelta(days=1),
+        estimated_hr=4,
+        description="disc",
+        is_repititive=True,
+    )
+    mock_uow.tasks.get_due_repetitive_tasks = AsyncMock(return_value=[task])
+    mock_uow.tasks.bulk_create_progress = AsyncMock()
+    mock_uow.tasks.advance_repetitive_tasks = AsyncMock()
+
+    rolled = await service.rollover_tasks([1])
+
+    assert rolled == 1
+    mock_uow.tasks.bulk_create_progress.assert_awaited_once()
+    mock_uow.tasks.advance_repetitive_tasks.assert_awaited_once()
+    mock_uow.commit.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rollover_tasks_rolls_back_on_failure(service, mock_uow):
+    task = TaskOutput(
+        id=1,
+        owner_id=1,
+        start_date=datetime.now(timezone.utc) - timedelta(days=7),
+        end_date=datetime.now(timezone.utc) - timedelta(days=6),
+        estimated_hr=4,
+        description="disc",
+        is_repititive=True,
+    )
+    mock_uow.tasks.get_due_repetitive_tasks = AsyncMock(return_value=[task])
+    mock_uow.tasks.bulk_create_progress = AsyncMock()
+    mock_uow.tasks.advance_repetitive_tasks = AsyncMock(side_effect=RuntimeError("DB failure"))
 
     with pytest.raises(RuntimeError, match="DB failure"):
-        await service.get_tasks(skip=0, limit=10, current_user=current_user)
+        await service.rollover_tasks([1])
 
     mock_uow.commit.assert_not_awaited()
     mock_uow.rollback.assert_awaited()
 
-    # mock_uow.tasks.create_progress.assert_not_awaited()
-
 
 @pytest.mark.asyncio
 async def test_toggle_task_stop_success(service, mock_uow, current_user):
@@ -392,7 +518,7 @@ async def test_get_task_analytics_success(service, mock_uow, current_user):
     ]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=progress_history)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=progress_stats(progress_history))
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -428,7 +554,7 @@ async def test_get_task_analytics_completion_metrics(service, mock_uow, current_
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -477,7 +603,7 @@ async def test_get_task_analytics_time_efficiency(service, mock_uow, current_use
     ]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=progress_history)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=progress_stats(progress_history))
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -542,7 +668,7 @@ async def test_get_task_analytics_progress_trends(service, mock_uow, current_use
     ]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=progress_history)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=progress_stats(progress_history))
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -589,7 +715,7 @@ async def test_get_task_analytics_performance_indicators(service, mock_uow, curr
     ]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=progress_history)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=progress_stats(progress_history))
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -618,7 +744,7 @@ async def test_get_task_analytics_status_analysis(service, mock_uow, current_use
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -648,7 +774,7 @@ async def test_get_task_analytics_time_analysis(service, mock_uow, current_user)
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -678,7 +804,7 @@ async def test_get_task_analytics_summary(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -709,7 +835,7 @@ async def test_get_task_analytics_no_progress(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -862,7 +988,7 @@ async def test_get_progress_success(service, mock_uow, current_user):
     result = await service.get_progress(1, current_user, skip=0, limit=10)
     
     assert result == progress_history
-    mock_uow.tasks.get_progress.assert_awaited_once_with(1, 0, 10)
+    mock_uow.tasks.get_progress.assert_awaited_once_with(1, skip=0, limit=10, before=None)
 
 @pytest.mark.asyncio
 async def test_get_progress_permission_error(service, mock_uow, current_user):
@@ -919,13 +1045,28 @@ async def test_assign_user_to_task_success(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.assign_user_to_task = AsyncMock()
-    mock_uow.tasks.get_task = AsyncMock(side_effect=[task, updated_task])
+    mock_uow.tasks.assign_user_to_task = AsyncMock(return_value=(updated_task, None))
     
     result = await service.assign_user_to_task(1, "user@example.com", current_user)
     
     assert result == updated_task
     mock_uow.tasks.assign_user_to_task.assert_awaited_once_with(1, "user@example.com")
+    mock_uow.tasks.get_task.assert_awaited_once_with(1)
+
+@pytest.mark.asyncio
+async def test_assign_user_to_task_surfaces_repository_error(service, mock_uow, current_user):
+    task = TaskOutput(
+        id=1,
+        description="Test Task",
+        end_date=datetime.now(timezone.utc) + timedelta(days=1),
+        estimated_hr=5.0,
+        owner_id=current_user.id,
+    )
+    mock_uow.tasks.get_task = AsyncMock(return_value=task)
+    mock_uow.tasks.assign_user_to_task = AsyncMock(return_value=(None, "User already assigned"))
+
+    with pytest.raises(BadRequestError, match="User already assigned"):
+        await service.assign_user_to_task(1, "user@example.com", current_user)
 
 @pytest.mark.asyncio
 async def test_assign_user_to_task_not_found(service, mock_uow, current_user):
@@ -1151,7 +1292,7 @@ async def test_analytics_completed_task(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1179,7 +1320,7 @@ async def test_analytics_overdue_task(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1209,7 +1350,7 @@ async def test_analytics_repetitive_task_with_stops(service, mock_uow, current_u
     stop_history = [{"id": 1, "stopped_at": datetime.now(timezone.utc) - timedelta(days=5)}]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=stop_history)
     
     result = await service.get_task_analytics(1, current_user)
@@ -1237,7 +1378,7 @@ async def test_analytics_task_with_no_dates(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1293,7 +1434,7 @@ async def test_analytics_high_variance_progress(service, mock_uow, current_user)
     ]
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=progress_history)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=progress_stats(progress_history))
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1321,7 +1462,7 @@ async def test_analytics_zero_estimated_hours(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1350,7 +1491,7 @@ async def test_analytics_very_large_numbers(service, mock_uow, current_user):
     )
     
     mock_uow.tasks.get_task = AsyncMock(return_value=task)
-    mock_uow.tasks.get_progress = AsyncMock(return_value=[])
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
     mock_uow.tasks.get_stop_progress = AsyncMock(return_value=[])
     
     result = await service.get_task_analytics(1, current_user)
@@ -1360,3 +1501,279 @@ async def test_analytics_very_large_numbers(service, mock_uow, current_user):
     assert analytics["completion_metrics"]["completion_rate"] == 50.0
     assert analytics["completion_metrics"]["remaining_hours"] == 500.0
     assert analytics["time_analysis"]["time_spent_hours"] >= 2400  # ~100 days * 24 hours
+
+@pytest.mark.asyncio
+async def test_update_task_rejects_move_under_own_subtask(service, mock_uow, current_user):
+    def make_task(id):
+        return TaskOutput(
+            id=id,
+            description="Test Task",
+            start_date=datetime.now(timezone.utc),
+            end_date=datetime.now(timezone.utc) + timedelta(days=1),
+            estimated_hr=5.0,
+            done_hr=0.0,
+            owner_id=current_user.id,
+            status="pending",
+            is_repititive=False,
+            is_stopped=False,
+            subtasks=[],
+            assignees=[]
+        )
+
+    mock_uow.tasks.get_task = AsyncMock(side_effect=lambda id: make_task(id))
+    mock_uow.tasks.is_in_subtree = AsyncMock(return_value=True)
+    mock_uow.tasks.update_task = AsyncMock()
+
+    with pytest.raises(BadRequestError, match="cannot be moved under itself"):
+        await service.update_task(1, {"main_task_id": 3}, current_user)
+
+    mock_uow.tasks.is_in_subtree.assert_awaited_once_with(1, 3)
+    mock_uow.tasks.update_task.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_subtree_checks_access(service, mock_uow, current_user):
+    task = TaskOutput(
+        id=1,
+        description="Test Task",
+        start_date=datetime.now(timezone.utc),
+        end_date=datetime.now(timezone.utc) + timedelta(days=1),
+        estimated_hr=5.0,
+        done_hr=0.0,
+        owner_id=999,
+        status="pending",
+        is_repititive=False,
+        is_stopped=False,
+        subtasks=[],
+        assignees=[]
+    )
+    mock_uow.tasks.get_task = AsyncMock(return_value=task)
+    mock_uow.tasks.get_subtree = AsyncMock(return_value=["node"])
+
+    with pytest.raises(PermissionError):
+        await service.get_subtree(1, current_user)
+
+    task.assignees = [current_user.id]
+    assert await service.get_subtree(1, current_user) == ["node"]
+    mock_uow.tasks.get_subtree.assert_awaited_once_with(1)
+
+@pytest.mark.asyncio
+async def test_get_portfolio_analytics_grades_each_task(service, mock_uow, current_user):
+    from domain.models.task_model import TaskPortfolioEntry
+
+    now = datetime.now(timezone.utc)
+    def entry(id, completion_rate, efficiency_score, start_date, end_date):
+        return TaskPortfolioEntry(
+            id=id,
+            description="Task",
+            status="in_progress",
+            start_date=start_date,
+            end_date=end_date,
+            estimated_hr=10.0,
+            done_hr=completion_rate / 10,
+            is_repititive=False,
+            is_stopped=False,
+            cycle_count=0,
+            completion_rate=completion_rate,
+            efficiency_score=efficiency_score,
+        )
+
+    mock_uow.tasks.get_portfolio = AsyncMock(return_value=[
+        entry(1, 99.5, 0.0, now - timedelta(days=9), now - timedelta(days=1)),
+        entry(2, 80.0, 75.123, now - timedelta(days=1), now + timedelta(days=9)),
+        entry(3, 45.0, 0.0, (now - timedelta(days=9)).replace(tzinfo=None), (now + timedelta(hours=12)).replace(tzinfo=None)),
+        entry(4, 10.0, 0.0, None, None),
+    ])
+
+    entries = await service.get_portfolio_analytics(current_user, skip=0, limit=50)
+
+    mock_uow.tasks.get_portfolio.assert_awaited_once_with(1, skip=0, limit=50)
+    assert [(e.grade, e.deadline_status) for e in entries] == [
+        ("A", "overdue"),
+        ("B", "on_track"),
+        ("D", "urgent"),
+        ("F", "no_deadline"),
+    ]
+    assert entries[1].efficiency_score == 75.12
+
+@pytest.mark.asyncio
+async def test_get_task_analytics_served_from_cache(mock_uow, current_user):
+    task = TaskOutput(
+        id=1,
+        description="Test Task",
+        start_date=datetime.now(timezone.utc) - timedelta(days=5),
+        end_date=datetime.now(timezone.utc) + timedelta(days=5),
+        estimated_hr=10.0,
+        done_hr=6.0,
+        owner_id=current_user.id,
+        status="in_progress",
+        is_repititive=False,
+        is_stopped=False,
+        subtasks=[],
+        assignees=[]
+    )
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=(None, 3))
+    cache.set = AsyncMock()
+    service = TaskService(mock_uow, analytics_cache=cache)
+    mock_uow.tasks.get_task = AsyncMock(return_value=task)
+    mock_uow.tasks.get_progress_stats = AsyncMock(return_value=TaskProgressStatsDomain())
+
+    result = await service.get_task_analytics(1, current_user)
+
+    cache.set.assert_awaited_once_with(1, 3, result)
+
+    # A hit answers without touching the repository, but still checks access
+    cache.get = AsyncMock(return_value=(result, 3))
+    mock_uow.tasks.get_task.reset_mock()
+    assert await service.get_task_analytics(1, current_user) is result
+    mock_uow.tasks.get_task.assert_not_called()
+
+    class Stranger:
+        id = 2
+    with pytest.raises(PermissionError):
+        await service.get_task_analytics(1, Stranger())
+
+
+def export_batches(*batches):
+    async def stream_export(user_id):
+        for batch in batches:
+            yield batch
+    return stream_export
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson(service, mock_uow, current_user):
+    import json
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    mock_uow.tasks.export_columns = MagicMock(return_value=["id", "description", "start_date", "task_id"])
+    mock_uow.tasks.stream_export = export_batches(
+        ("tasks", [{"id": 1, "description": "A", "start_date": start}, {"id": 2, "description": "B", "start_date": None}]),
+        ("stop_progress", [{"id": 5, "task_id": 1}]),
+    )
+
+    chunks = [chunk async for chunk in service.export_tasks(current_user, "ndjson")]
+
+    assert len(chunks) == 2
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert records == [
+        {"record_type": "tasks", "id": 1, "description": "A", "start_date": "2030-01-01T00:00:00+00:00"},
+        {"record_type": "tasks", "id": 2, "description": "B", "start_date": None},
+        {"record_type": "stop_progress", "id": 5, "task_id": 1},
+    ]
+    mock_uow.__aenter__.assert_called_once()
+    mock_uow.__aexit__.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_csv_uses_union_header(service, mock_uow, current_user):
+    mock_uow.tasks.export_columns = MagicMock(return_value=["id", "description", "task_id"])
+    mock_uow.tasks.stream_export = export_batches(
+        ("tasks", [{"id": 1, "description": "A, quoted"}]),
+        ("stop_progress", [{"id": 5, "task_id": 1}]),
+    )
+
+    body = "".join([chunk async for chunk in service.export_tasks(current_user, "csv")])
+
+    assert body.splitlines() == [
+        "record_type,id,description,task_id",
+        'tasks,1,"A, quoted",',
+        "stop_progress,5,,1",
+    ]
+
+
+def test_export_tasks_rejects_unknown_format(service, current_user):
+    with pytest.raises(BadRequestError, match="Unsupported export format"):
+        service.export_tasks(current_user, "xml")
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_reports_errors_per_row(service, mock_uow, current_user):
+    from domain.models.task_model import TaskImportInput
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+
+    def item(description, estimated_hr=2, **kwargs):
+        return TaskImportInput(
+            description=description, end_date=future + timedelta(days=1), estimated_hr=estimated_hr, **kwargs
+        )
+
+    tasks = [
+        item("epic", start_date=future),
+        item("story", parent_index=0),
+        item("past", start_date=datetime.now(timezone.utc) - timedelta(days=1)),
+        item("orphan", parent_index=2),
+        item("forward", parent_index=5),
+        item("mine", main_task_id=10),
+        item("theirs", main_task_id=11),
+        item("missing", main_task_id=12),
+        item("negative", estimated_hr=-1),
+    ]
+    mock_uow.tasks.get_task_visibility = AsyncMock(return_value={10: True, 11: False})
+    mock_uow.tasks.bulk_create_tasks = AsyncMock(
+        side_effect=lambda accepted, parents, owner_id: [
+            TaskOutput(id=100 + n, description=t.description, end_date=t.end_date, estimated_hr=t.estimated_hr, owner_id=owner_id)
+            for n, t in enumerate(accepted)
+        ]
+    )
+
+    results = await service.import_tasks(tasks, current_user)
+
+    mock_uow.tasks.get_task_visibility.assert_awaited_once_with([10, 11, 12], current_user.id)
+    accepted, parents, owner_id = mock_uow.tasks.bulk_create_tasks.await_args.args
+    assert [t.description for t in accepted] == ["epic", "story", "mine"]
+    assert parents == [None, 0, None]
+    assert owner_id == current_user.id
+    assert all(t.start_date is not None for t in accepted)
+    assert [(r.index, r.task.id if r.task else None, r.error) for r in results] == [
+        (0, 100, None),
+        (1, 101, None),
+        (2, None, "Start date cannot be in the past"),
+        (3, None, "Parent task was rejected"),
+        (4, None, "parent_index must refer to an earlier item in the batch"),
+        (5, 102, None),
+        (6, None, "Cannot create subtask for another user's task"),
+        (7, None, "Main task not found"),
+        (8, None, "Estimated hours cannot be negative"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_rejects_oversized_batch(service, mock_uow, current_user):
+    from domain.models.task_model import TaskImportInput
+    tasks = [
+        TaskImportInput(description="t", end_date=datetime.now(timezone.utc), estimated_hr=1)
+    ] * (service.MAX_IMPORT_BATCH + 1)
+
+    with pytest.raises(BadRequestError, match="At most"):
+        await service.import_tasks(tasks, current_user)
+    mock_uow.__aenter__.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_checks_permissions_in_one_query(service, mock_uow, current_user):
+    start = datetime(2030, 1, 10)
+    updates = {
+        1: {"status": "completed"},
+        2: {"start_date": start, "end_date": start - timedelta(days=1)},
+        3: {"estimated_hr": -1},
+        4: {"status": "completed"},
+        5: {"status": "completed"},
+        6: {"main_task_id": 1},
+    }
+    mock_uow.tasks.get_task_visibility = AsyncMock(return_value={1: True, 2: True, 3: True, 4: False, 6: True})
+    mock_uow.tasks.bulk_update_tasks = AsyncMock(return_value=[
+        TaskOutput(id=1, description="A", end_date=start, estimated_hr=1, owner_id=current_user.id, status="completed")
+    ])
+
+    results = await service.bulk_update_tasks(updates, current_user)
+
+    mock_uow.tasks.get_task_visibility.assert_awaited_once_with([1, 2, 3, 4, 5, 6], current_user.id)
+    mock_uow.tasks.bulk_update_tasks.assert_awaited_once_with({1: {"status": "completed"}})
+    assert updates[2]["start_date"].tzinfo == timezone.utc
+    assert [(r.task_id, r.task.status if r.task else None, r.error) for r in results] == [
+        (1, "completed", None),
+        (2, None, "End date cannot be before start date"),
+        (3, None, "Estimated hours cannot be negative"),
+        (4, None, "You don't have permission to update this task"),
+        (5, None, "Task not found"),
+        (6, None, "Tasks can't be moved in a bulk update"),
+    ]
@@ -19,7 +19,7 @@ from usecases.user_usecase import UserUsecase
 async def test_user_register_success():
     # Mock all dependencies
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -43,7 +43,7 @@ async def test_user_register_success():
     # Setup async return values
     mock_repo.FindByEmail.return_value = None
     mock_repo.FindByUsername.return_value = None
-    mock_repo.get_all_users.return_value = []  # First user => superadmin
+    mock_repo.has_any_user.return_value = False  # First user => superadmin
     mock_repo.Create.return_value = AsyncMock(id=1)  # async user creation
     mock_pass_service.hash_password.return_value = "hashed_pass"
     mock_jwt_service.create_verification_token.return_value = {"token": "rawtoken"}
@@ -56,13 +56,39 @@ async def test_user_register_success():
 
     # Assert result
     assert result["message"] == "user registered successfully"
+    assert mock_repo.Create.call_args.args[2] == "superadmin"
+    mock_repo.get_all_users.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_user_register_later_users_get_user_role():
+    mock_repo = AsyncMock()
+    mock_pass_service = AsyncMock()
+    mock_jwt_service = MagicMock()
+    mock_token_repo = AsyncMock()
+    mock_email_service = AsyncMock()
+    service = UserUsecase(
+        mock_repo, mock_pass_service, mock_jwt_service, mock_token_repo, mock_email_service
+    )
+
+    mock_repo.FindByEmail.return_value = None
+    mock_repo.FindByUsername.return_value = None
+    mock_repo.has_any_user.return_value = True
+    mock_repo.Create.return_value = AsyncMock(id=2)
+    mock_pass_service.hash_password.return_value = "hashed_pass"
+    mock_jwt_service.create_verification_token.return_value = {"token": "rawtoken"}
+    mock_email_service.send_verification_email = AsyncMock(return_value=True)
+
+    await service.Register(UserRegister("bob", "bob@bob.com", "1234"))
+
+    assert mock_repo.Create.call_args.args[2] == "user"
 
 
 @pytest.mark.asyncio
 async def test_user_register_with_invalid_email():
     # Mock all dependencies
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -86,7 +112,7 @@ async def test_user_register_with_invalid_email():
     # Setup async return values
     mock_repo.FindByEmail.return_value = None
     mock_repo.FindByUsername.return_value = None
-    mock_repo.get_all_users.return_value = []  # First user => superadmin
+    mock_repo.has_any_user.return_value = False  # First user => superadmin
     mock_repo.Create.return_value = AsyncMock(id=1)  # async user creation
     mock_pass_service.hash_password.return_value = "hashed_pass"
     mock_jwt_service.create_verification_token.return_value = {"token": "rawtoken"}
@@ -108,7 +134,7 @@ async def test_user_register_with_invalid_email():
 async def test_user_register_email_exist():
     # Use AsyncMock for all async components
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()  # Changed from MagicMock
+    mock_pass_service = AsyncMock()  # Changed from MagicMock
     mock_jwt_service = MagicMock()  # Changed from MagicMock
     mock_token_repo = AsyncMock()
     mock_email_service= AsyncMock()
@@ -129,7 +155,7 @@ async def test_user_register_email_exist():
 @pytest.mark.asyncio
 async def test_login_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()   # JWT stays sync
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -158,7 +184,7 @@ async def test_login_success():
 @pytest.mark.asyncio
 async def test_login_user_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -177,7 +203,7 @@ async def test_login_user_not_found():
 @pytest.mark.asyncio
 async def test_login_user_invalid_password():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -198,7 +224,7 @@ async def test_login_user_invalid_password():
 @pytest.mark.asyncio
 async def test_refresh_token_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -229,7 +255,7 @@ async def test_refresh_token_success():
 @pytest.mark.asyncio
 async def test_refresh_token_invalid_token():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -244,7 +270,7 @@ async def test_refresh_token_invalid_token():
 @pytest.mark.asyncio
 async def test_refresh_token_token_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -262,7 +288,7 @@ async def test_refresh_token_token_not_found():
 @pytest.mark.asyncio
 async def test_refresh_token_token_user_mismatch():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -284,7 +310,7 @@ async def test_refresh_token_token_user_mismatch():
 @pytest.mark.asyncio
 async def test_verify_email_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -311,7 +337,7 @@ async def test_verify_email_success():
 @pytest.mark.asyncio
 async def test_verify_email_invalid_token():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -326,7 +352,7 @@ async def test_verify_email_invalid_token():
 @pytest.mark.asyncio
 async def test_send_verification_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -349,7 +375,7 @@ async def test_send_verification_success():
 @pytest.mark.asyncio
 async def test_send_verification_user_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -364,7 +390,7 @@ async def test_send_verification_user_not_found():
 @pytest.mark.asyncio
 async def test_send_verification_already_verified():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -382,7 +408,7 @@ async def test_send_verification_already_verified():
 @pytest.mark.asyncio
 async def test_send_password_reset_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -405,7 +431,7 @@ async def test_send_password_reset_success():
 @pytest.mark.asyncio
 async def test_send_password_reset_user_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -420,7 +446,7 @@ async def test_send_password_reset_user_not_found():
 @pytest.mark.asyncio
 async def test_reset_password_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -450,7 +476,7 @@ async def test_reset_password_success():
 @pytest.mark.asyncio
 async def test_reset_password_invalid_token():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -466,7 +492,7 @@ async def test_reset_password_invalid_token():
 @pytest.mark.asyncio
 async def test_get_user_by_email_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -485,7 +511,7 @@ async def test_get_user_by_email_success():
 @pytest.mark.asyncio
 async def test_get_user_by_email_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -500,7 +526,7 @@ async def test_get_user_by_email_not_found():
 @pytest.mark.asyncio
 async def test_promote_user_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -521,7 +547,7 @@ async def test_promote_user_success():
 @pytest.mark.asyncio
 async def test_promote_user_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -538,7 +564,7 @@ async def test_promote_user_not_found():
 @pytest.mark.asyncio
 async def test_promote_user_insufficient_permission():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -556,7 +582,7 @@ async def test_promote_user_insufficient_permission():
 @pytest.mark.asyncio
 async def test_promote_admin_user():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -574,7 +600,7 @@ async def test_promote_admin_user():
 @pytest.mark.asyncio
 async def test_demote_user_success():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -595,7 +621,7 @@ async def test_demote_user_success():
 @pytest.mark.asyncio
 async def test_demote_user_not_found():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -612,7 +638,7 @@ async def test_demote_user_not_found():
 @pytest.mark.asyncio
 async def test_demote_user_insufficient_permission():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -632,7 +658,7 @@ async def test_demote_user_insufficient_permission():
 @pytest.mark.asyncio
 async def test_login_user_not_verified():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
@@ -649,7 +675,7 @@ async def test_login_user_not_verified():
 @pytest.mark.asyncio
 async def test_user_register_username_exists():
     mock_repo = AsyncMock()
-    mock_pass_service = MagicMock()
+    mock_pass_service = AsyncMock()
     mock_jwt_service = MagicMock()
     mock_token_repo = AsyncMock()
     mock_email_service = AsyncMock()
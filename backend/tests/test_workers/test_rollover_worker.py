@@ -0,0 +1,82 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from infrastructure.workers.rollover_worker import RolloverScheduler
+
+
+def make_service(due_ids, in_flight, peak):
+    async def get_due_rollover_ids(limit, after_id):
+        return [i for i in due_ids if i > after_id][:limit]
+
+    async def rollover_tasks(task_ids):
+        in_flight.append(task_ids)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0)
+        in_flight.remove(task_ids)
+        return len(task_ids)
+
+    service = MagicMock()
+    service.get_due_rollover_ids = AsyncMock(side_effect=get_due_rollover_ids)
+    service.rollover_tasks = AsyncMock(side_effect=rollover_tasks)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_run_once_rolls_over_in_chunks():
+    in_flight, peak = [], []
+    service = make_service(list(range(1, 11)), in_flight, peak)
+    scheduler = RolloverScheduler(lambda: service, chunk_size=3, concurrency=2)
+
+    rolled = await scheduler.run_once()
+
+    assert rolled == 10
+    chunks = [call.args[0] for call in service.rollover_tasks.await_args_list]
+    assert chunks == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    assert max(peak) <= 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_keeps_going_when_a_chunk_fails():
+    service = make_service([1, 2, 3, 4], [], [])
+    service.rollover_tasks = AsyncMock(side_effect=[RuntimeError("DB failure"), 2])
+    scheduler = RolloverScheduler(lambda: service, chunk_size=2)
+
+    rolled = await scheduler.run_once()
+
+    assert rolled == 2
+    assert service.rollover_tasks.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_cancels_started_chunks_when_the_scan_fails():
+    started, cancelled = asyncio.Event(), []
+    scans = iter([[1, 2], None])
+
+    async def get_due_rollover_ids(limit, after_id):
+        task_ids = next(scans)
+        if task_ids is None:
+            await started.wait()  # the first chunk is running
+            raise RuntimeError("DB failure")
+        return task_ids
+
+    service = MagicMock()
+    service.get_due_rollover_ids = AsyncMock(side_effect=get_due_rollover_ids)
+
+    async def rollover_tasks(task_ids):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(task_ids)
+            raise
+        return len(task_ids)
+
+    service.rollover_tasks = AsyncMock(side_effect=rollover_tasks)
+    scheduler = RolloverScheduler(lambda: service, chunk_size=2)
+
+    with pytest.raises(RuntimeError, match="DB failure"):
+        await scheduler.run_once()
+
+    assert cancelled == [[1, 2]]
+    assert [task for task in asyncio.all_tasks() if task is not asyncio.current_task()] == []
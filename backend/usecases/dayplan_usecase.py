@@ -1,8 +1,10 @@
+from bisect import bisect_left
 from datetime import date, datetime, time
+from typing import Dict, List, Tuple
 
 from domain.exceptions import BadRequestError, NotFoundError
 from domain.interfaces.daypla_uow import IDayPlanUoW
-from domain.models.dayplan_model import TimeLogCreate
+from domain.models.dayplan_model import TimeLogCreate, TimeLogResult
 
 
 class DayPlanUseCase:
@@ -45,16 +47,13 @@ class DayPlanUseCase:
                 if new_start >= new_end:
                     raise BadRequestError("Start time must be before end time")
 
-                dayplan = await self.uow.dayplan_repo.get_dayplanById(time_log.plan_id)
-                if not dayplan:
+                if not await self.uow.dayplan_repo.dayplan_exists(time_log.plan_id):
                     raise NotFoundError("DayPlan not found")
 
-                for existing in dayplan.times:
-                    existing_start = to_naive(existing.start_time)
-                    existing_end = to_naive(existing.end_time)
-
-                    if new_start < existing_end and existing_start < new_end:
-                        raise BadRequestError("Time log overlaps with existing time log")
+                if await self.uow.dayplan_repo.has_overlapping_time_log(
+                    time_log.plan_id, new_start, new_end
+                ):
+                    raise BadRequestError("Time log overlaps with existing time log")
 
                 task = await self.uow.task_repo.get_task(time_log.task_id)
                 if not task:
@@ -74,6 +73,90 @@ class DayPlanUseCase:
                 await self.uow.commit()
         return created_timelog  # domain model returned
 
+    MAX_TIME_LOG_BATCH = 200
+
+    async def create_time_logs(self, time_logs: List[TimeLogCreate], current_user) -> List[TimeLogResult]:
+        """
+        Create many time logs in one transaction. Each item is checked against
+        the plan's existing logs (bisect over the sorted, non-overlapping
+        ranges) and then against the rest of the batch in one sorted sweep per
+        plan, where the earliest-starting item wins. Rejected items don't stop
+        the others.
+        """
+        if len(time_logs) > self.MAX_TIME_LOG_BATCH:
+            raise BadRequestError(f"At most {self.MAX_TIME_LOG_BATCH} time logs per batch")
+
+        results = [TimeLogResult(index=i) for i in range(len(time_logs))]
+        times = [
+            (t.start_time.replace(tzinfo=None), t.end_time.replace(tzinfo=None)) for t in time_logs
+        ]
+        async with self.uow:
+            try:
+                plan_ids = sorted({t.plan_id for t in time_logs})
+                existing_plans = await self.uow.dayplan_repo.get_existing_dayplan_ids(plan_ids)
+                tasks = {
+                    task.id: task
+                    for task in await self.uow.task_repo.get_tasks_by_ids(
+                        sorted({t.task_id for t in time_logs})
+                    )
+                }
+                ranges = await self.uow.dayplan_repo.get_time_log_ranges(sorted(existing_plans))
+
+                candidates: Dict[int, List[int]] = {}
+                for i, time_log in enumerate(time_logs):
+                    start, end = times[i]
+                    task = tasks.get(time_log.task_id)
+                    if start >= end:
+                        results[i].error = "Start time must be before end time"
+                    elif time_log.plan_id not in existing_plans:
+                        results[i].error = "DayPlan not found"
+                    elif not task:
+                        results[i].error = "Task not found"
+                    elif task.owner_id != current_user.id:
+                        results[i].error = "You don't have permission to work on this task"
+                    elif self._overlaps_existing(ranges[time_log.plan_id], start, end):
+                        results[i].error = "Time log overlaps with existing time log"
+                    else:
+                        candidates.setdefault(time_log.plan_id, []).append(i)
+
+                accepted: List[int] = []
+                for indexes in candidates.values():
+                    last_end = None
+                    for i in sorted(indexes, key=lambda i: (times[i][0], i)):
+                        start, end = times[i]
+                        if last_end is not None and start < last_end:
+                            results[i].error = "Time log overlaps with another time log in the batch"
+                        else:
+                            accepted.append(i)
+                            last_end = end
+                accepted.sort()
+
+                pending = sorted({
+                    time_logs[i].task_id for i in accepted
+                    if tasks[time_logs[i].task_id].status == "pending"
+                })
+                for task_id in pending:
+                    await self.uow.task_repo.update_task(task_id, {"status": "in_progress"})
+
+                created = await self.uow.dayplan_repo.bulk_create_time_logs(
+                    [time_logs[i] for i in accepted]
+                )
+                for i, time_log in zip(accepted, created):
+                    results[i].time_log = time_log
+            except Exception:
+                await self.uow.rollback()
+                raise
+            else:
+                await self.uow.commit()
+        return results
+
+    @staticmethod
+    def _overlaps_existing(ranges: List[Tuple[time, time]], start: time, end: time) -> bool:
+        # Existing logs never overlap each other, so sorted by start their ends
+        # are sorted too: only the last one starting before `end` can overlap.
+        i = bisect_left(ranges, end, key=lambda r: r[0])
+        return i > 0 and ranges[i - 1][1] > start
+
     async def delete_timelog(self, time_log_id: int, current_user):
         async with self.uow:
             time_log = await self.uow.dayplan_repo.get_time_log(time_log_id)
@@ -101,43 +184,13 @@ class DayPlanUseCase:
                     raise BadRequestError("time log already done")
                 
                 time_log = await self.uow.dayplan_repo.update_time_log(time_log.id,{"done":True})
-                
-
-                duration = self._Duration(time_log.start_time, time_log.end_time)
-
                 if not time_log:
                     raise NotFoundError("Time log not found")
 
-                task = time_log.task
-                task.done_hr += duration
-
-                while task and task.done_hr >= task.estimated_hr:
-                    data = {"done_hr": task.done_hr, "status": "completed"}
-                    await self.uow.task_repo.update_task(task.id, data)
-                    if not task:
-                        raise BadRequestError("Task update failed")
-
-                    if task.main_task_id:
-                        sb_task_es_hr = task.estimated_hr
-                        task = await self.uow.task_repo.get_task(task.main_task_id)
-
-                        print("+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++")
-                        print(task.done_hr, task.estimated_hr, sb_task_es_hr)
-                        task.done_hr += sb_task_es_hr
-                        print(task.done_hr, task.estimated_hr)
-
-                        
-                    else:
-                        break
-                else:
-                    if task:
-                        data={"done_hr": task.done_hr}
-                        if task.status == "pending":
-                            data["status"]="in_progress"
-
-                        await self.uow.task_repo.update_task(
-                            task.id,data
-                        )
+                duration = self._Duration(time_log.start_time, time_log.end_time)
+                updated = await self.uow.task_repo.propagate_done_hours(time_log.task.id, duration)
+                if time_log.task.id in updated:
+                    time_log.task.done_hr, time_log.task.status = updated[time_log.task.id]
             except Exception:
                 await self.uow.rollback()
                 raise
@@ -1,14 +1,38 @@
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from domain.exceptions import BadRequestError, NotFoundError
+from domain.interfaces.analytics_cache import IAnalyticsCache
 from domain.interfaces.iuow import IUnitOfWork
-from domain.models.task_model import TaskCreateInput, TaskOutput, TaskProgressDomain
+from domain.models.task_model import (
+    PROGRESS_TREND_WINDOW,
+    TaskCreateInput,
+    TaskImportInput,
+    TaskImportResult,
+    TaskOutput,
+    TaskPortfolioEntry,
+    TaskProgressDomain,
+    TaskProgressStatsDomain,
+    TaskTreeNode,
+    TaskUpdateResult,
+)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def _export_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
 
 
 class TaskService:
-    def __init__(self, uow: IUnitOfWork):
+    def __init__(self, uow: IUnitOfWork, analytics_cache: Optional[IAnalyticsCache] = None):
         self.uow = uow
+        self.analytics_cache = analytics_cache
 
     def _normalize_datetime(self, dt):
         if dt and dt.tzinfo is None:
@@ -28,46 +52,87 @@ class TaskService:
             if start_date and end_date < start_date:
                 raise BadRequestError("End date cannot be before start date")
     
-    async def _handle_repetitive_task(self, task: TaskOutput, max_cycle=100):
-        
-        now = datetime.now(timezone.utc)
-        updated = False
-        cycle = 0
-        
-        while task.is_repititive and task.end_date <= now and not task.is_stopped:
-
-            if cycle >= max_cycle:
-                return
-            cycle += 1
-            await self.uow.tasks.create_progress(
-                TaskProgressDomain(
-                    **{
-                        "task_id": task.id,
-                        "start_date": task.start_date,
-                        "end_date": task.end_date,
-                        "status": task.status,
-                        "done_hr": task.done_hr,
-                        "estimated_hr": task.estimated_hr,
-                    }
+    def _plan_rollover(self, tasks: List[TaskOutput], now: datetime, max_cycle=100):
+        """
+        Work out, in closed form, every cycle a repetitive task missed since its
+        ``end_date``. Returns the progress rows to record and the new
+        ``(start_date, end_date)`` window per task id.
+
+        The first missed cycle keeps the task's own status and ``done_hr``; the
+        following ones were never worked on. At most ``max_cycle`` rows are recorded
+        per task, but the window is always advanced to the one containing ``now``.
+        """
+        progress = []
+        windows = {}
+        for task in tasks:
+            if not task.is_repititive or task.is_stopped or task.end_date > now:
+                continue
+            interval = task.end_date - task.start_date
+            if interval <= timedelta(0):
+                continue
+
+            cycles = (now - task.end_date) // interval + 1
+            for cycle in range(min(cycles, max_cycle)):
+                first = cycle == 0
+                progress.append(
+                    TaskProgressDomain(
+                        task_id=task.id,
+                        start_date=task.start_date + cycle * interval,
+                        end_date=task.end_date + cycle * interval,
+                        status=task.status if first else "in_progress",
+                        done_hr=task.done_hr if first else 0.0,
+                        estimated_hr=task.estimated_hr,
+                    )
                 )
+            windows[task.id] = (
+                task.start_date + cycles * interval,
+                task.end_date + cycles * interval,
             )
-            interval = task.end_date - task.start_date
-            data={
-                "start_date": task.end_date,
-                "end_date": task.end_date + interval,
-                "status": "in_progress",
-                "done_hr": 0.0,
+        return progress, windows
 
-            }
-            task.start_date = task.end_date
-            task.end_date += interval
-            task.status = "in_progress"
-            task.done_hr = 0.0
-            updated = True
+    async def _handle_repetitive_tasks(self, tasks: List[TaskOutput], max_cycle=100):
+        """
+        Roll every overdue repetitive task in ``tasks`` forward with one bulk
+        progress insert and one set-based update, and mirror the new window on
+        the passed domain objects.
+        """
+        progress, windows = self._plan_rollover(tasks, datetime.now(timezone.utc), max_cycle)
+        if not windows:
+            return
 
-        if updated:
-            await self.uow.tasks.update_task(task.id, data)
+        if progress:
+            await self.uow.tasks.bulk_create_progress(progress)
+        await self.uow.tasks.advance_repetitive_tasks(windows)
+
+        for task in tasks:
+            if task.id in windows:
+                task.start_date, task.end_date = windows[task.id]
+                task.status = "in_progress"
+                task.done_hr = 0.0
+
+    async def _handle_repetitive_task(self, task: TaskOutput, max_cycle=100):
+        await self._handle_repetitive_tasks([task], max_cycle)
 
+    async def get_due_rollover_ids(self, limit: int = 100, after_id: int = 0) -> List[int]:
+        async with self.uow:
+            return await self.uow.tasks.get_due_repetitive_task_ids(
+                datetime.now(timezone.utc), limit=limit, after_id=after_id
+            )
+
+    async def rollover_tasks(self, task_ids: List[int], max_cycle=100) -> int:
+        """Roll the given repetitive tasks over in one transaction. Returns how many moved."""
+        async with self.uow:
+            try:
+                tasks = await self.uow.tasks.get_due_repetitive_tasks(
+                    task_ids, datetime.now(timezone.utc)
+                )
+                await self._handle_repetitive_tasks(tasks, max_cycle)
+            except Exception:
+                await self.uow.rollback()
+                raise
+            else:
+                await self.uow.commit()
+            return len(tasks)
 
     async def create_task(self, task: TaskCreateInput, current_user):
         async with self.uow:
@@ -91,15 +156,75 @@ class TaskService:
             created_task = await self.uow.tasks.create_task(task, current_user.id)
             return created_task
 
+    MAX_IMPORT_BATCH = 5000
+
+    async def import_tasks(self, tasks: List[TaskImportInput], current_user) -> List[TaskImportResult]:
+        """
+        Create many tasks in one transaction. Every item is validated in a single
+        pass, with the out-of-batch ``main_task_id``s resolved by one query; an
+        item may instead name an earlier item as its parent via ``parent_index``.
+        Rejected items (and the children of rejected items) don't stop the others.
+        """
+        if len(tasks) > self.MAX_IMPORT_BATCH:
+            raise BadRequestError(f"At most {self.MAX_IMPORT_BATCH} tasks per import")
+
+        results = [TaskImportResult(index=i) for i in range(len(tasks))]
+        async with self.uow:
+            visibility = await self.uow.tasks.get_task_visibility(
+                sorted({t.main_task_id for t in tasks if t.main_task_id and t.parent_index is None}),
+                current_user.id,
+            )
+            now = datetime.now(timezone.utc)
+            accepted: List[int] = []
+            positions: Dict[int, int] = {}
+            for i, task in enumerate(tasks):
+                task.start_date = self._normalize_datetime(task.start_date)
+                task.end_date = self._normalize_datetime(task.end_date)
+                parent = task.parent_index
+                if parent is not None and task.main_task_id:
+                    results[i].error = "Give either main_task_id or parent_index, not both"
+                elif parent is not None and not 0 <= parent < i:
+                    results[i].error = "parent_index must refer to an earlier item in the batch"
+                elif parent is not None and parent not in positions:
+                    results[i].error = "Parent task was rejected"
+                elif task.main_task_id and task.main_task_id not in visibility:
+                    results[i].error = "Main task not found"
+                elif task.main_task_id and not visibility[task.main_task_id]:
+                    results[i].error = "Cannot create subtask for another user's task"
+                elif task.estimated_hr < 0:
+                    results[i].error = "Estimated hours cannot be negative"
+                else:
+                    try:
+                        self._validate_dates(task.start_date, task.end_date)
+                    except BadRequestError as e:
+                        results[i].error = str(e)
+                        continue
+                    task.start_date = task.start_date or now
+                    positions[i] = len(accepted)
+                    accepted.append(i)
+
+            created = await self.uow.tasks.bulk_create_tasks(
+                [tasks[i] for i in accepted],
+                [
+                    None if tasks[i].parent_index is None else positions[tasks[i].parent_index]
+                    for i in accepted
+                ],
+                current_user.id,
+            )
+            for i, task in zip(accepted, created):
+                results[i].task = task
+        return results
+
     async def get_task(self, task_id: int, current_user):
         task = await self.uow.tasks.get_task(task_id)
         if not task:
             raise NotFoundError("Task not found")
+        self._check_access(task, current_user)
+        return task
 
-        if task.owner_id == current_user.id or current_user.id in task.assignees:
-            return task
-
-        raise PermissionError("You don't have access to this task")
+    def _check_access(self, task: TaskOutput, current_user):
+        if task.owner_id != current_user.id and current_user.id not in task.assignees:
+            raise PermissionError("You don't have access to this task")
 
     async def get_task_analytics(self, task_id: int, current_user) -> Dict[str, Any]:
         """
@@ -109,12 +234,22 @@ class TaskService:
         - Progress history
         - Performance indicators
         - Trend analysis
+
+        Served from ``analytics_cache`` when set; the access check then runs
+        against the cached task, so a hit doesn't touch the database.
         """
+        version = None
+        if self.analytics_cache is not None:
+            cached, version = await self.analytics_cache.get(task_id)
+            if cached is not None:
+                self._check_access(cached["task"], current_user)
+                return cached
+
         # Get the task with permission check
         task = await self.get_task(task_id, current_user)
         
-        # Get progress history
-        progress_history = await self.uow.tasks.get_progress(task_id, skip=0, limit=1000)
+        # Running aggregates over the progress history
+        stats = await self.uow.tasks.get_progress_stats(task_id)
         
         # Get stop history for repetitive tasks
         stop_history = []
@@ -122,14 +257,44 @@ class TaskService:
             stop_history = await self.uow.tasks.get_stop_progress(task_id)
         
         # Calculate analytics
-        analytics = await self._calculate_task_analytics(task, progress_history, stop_history)
+        analytics = await self._calculate_task_analytics(task, stats, stop_history)
         
-        return {
+        result = {
             "task": task,
             "analytics": analytics
         }
+        if self.analytics_cache is not None:
+            await self.analytics_cache.set(task_id, version, result)
+        return result
 
-    async def _calculate_task_analytics(self, task: TaskOutput, progress_history: List[TaskProgressDomain], stop_history: List) -> Dict[str, Any]:
+    async def get_portfolio_analytics(
+        self, current_user, skip: int = 0, limit: int = 100
+    ) -> List[TaskPortfolioEntry]:
+        """
+        Dashboard view of every task the user owns or is assigned: completion
+        rate, efficiency, deadline status and grade, graded the same way as
+        ``get_task_analytics`` but from one query for the whole page.
+        """
+        async with self.uow:
+            entries = await self.uow.tasks.get_portfolio(current_user.id, skip=skip, limit=limit)
+
+        now = datetime.now(timezone.utc)
+        for entry in entries:
+            entry.start_date = self._normalize_datetime(entry.start_date)
+            entry.end_date = self._normalize_datetime(entry.end_date)
+            entry.efficiency_score = round(entry.efficiency_score, 2)
+            entry.grade = self._grade(entry.completion_rate, entry.efficiency_score)
+            entry.completion_rate = round(entry.completion_rate, 2)
+            if entry.start_date and entry.end_date:
+                entry.deadline_status = self._deadline_status(
+                    (entry.end_date - now).total_seconds() / 3600,
+                    (entry.end_date - entry.start_date).total_seconds() / 3600,
+                )
+            else:
+                entry.deadline_status = "no_deadline"
+        return entries
+
+    async def _calculate_task_analytics(self, task: TaskOutput, stats: TaskProgressStatsDomain, stop_history: List) -> Dict[str, Any]:
         """Calculate comprehensive task analytics"""
         
         # Basic completion metrics
@@ -137,19 +302,19 @@ class TaskService:
         remaining_hours = max(0, task.estimated_hr - task.done_hr)
         
         # Time efficiency
-        time_efficiency = self._calculate_time_efficiency(task, progress_history)
+        time_efficiency = self._calculate_time_efficiency(task, stats)
         
         # Progress trends
-        progress_trends = self._analyze_progress_trends(progress_history)
+        progress_trends = self._analyze_progress_trends(stats)
         
         # Performance indicators
-        performance_indicators = self._calculate_performance_indicators(task, progress_history)
+        performance_indicators = self._calculate_performance_indicators(task, stats)
         
         # Status analysis
-        status_analysis = self._analyze_task_status(task, progress_history, stop_history)
+        status_analysis = self._analyze_task_status(task, stats, stop_history)
         
         # Time analysis
-        time_analysis = self._analyze_time_metrics(task, progress_history)
+        time_analysis = self._analyze_time_metrics(task)
         
         return {
             "completion_metrics": {
@@ -167,9 +332,9 @@ class TaskService:
             "summary": self._generate_analytics_summary(task, completion_rate, time_efficiency, time_analysis)
         }
 
-    def _calculate_time_efficiency(self, task: TaskOutput, progress_history: List[TaskProgressDomain]) -> Dict[str, Any]:
+    def _calculate_time_efficiency(self, task: TaskOutput, stats: TaskProgressStatsDomain) -> Dict[str, Any]:
         """Calculate time efficiency metrics"""
-        if not progress_history:
+        if not stats.cycle_count:
             return {
                 "efficiency_score": 0,
                 "avg_hours_per_cycle": 0,
@@ -177,9 +342,9 @@ class TaskService:
                 "total_cycles": 0
             }
         
-        total_cycles = len(progress_history)
-        total_hours_worked = sum(p.done_hr for p in progress_history)
-        avg_hours_per_cycle = total_hours_worked / total_cycles if total_cycles > 0 else 0
+        total_cycles = stats.cycle_count
+        total_hours_worked = stats.done_hr_sum
+        avg_hours_per_cycle = total_hours_worked / total_cycles
         
         # Efficiency score based on consistency
         efficiency_score = min(100, (task.estimated_hr / avg_hours_per_cycle * 100)) if avg_hours_per_cycle > 0 else 0
@@ -192,9 +357,10 @@ class TaskService:
             "total_hours_worked": round(total_hours_worked, 2)
         }
 
-    def _analyze_progress_trends(self, progress_history: List[TaskProgressDomain]) -> Dict[str, Any]:
+    def _analyze_progress_trends(self, stats: TaskProgressStatsDomain) -> Dict[str, Any]:
         """Analyze progress trends over time"""
-        if not progress_history:
+        cycles = stats.cycle_count
+        if not cycles:
             return {
                 "trend": "no_data",
                 "consistency_score": 0,
@@ -202,32 +368,28 @@ class TaskService:
                 "cycles_analyzed": 0
             }
         
-        # Sort by start date
-        sorted_progress = sorted(progress_history, key=lambda x: x.start_date)
-        
         # Calculate consistency
-        hours_per_cycle = [p.done_hr for p in sorted_progress]
-        if len(hours_per_cycle) > 1:
-            variance = sum((h - sum(hours_per_cycle)/len(hours_per_cycle))**2 for h in hours_per_cycle) / len(hours_per_cycle)
+        if cycles > 1:
+            mean = stats.done_hr_sum / cycles
+            variance = max(0.0, stats.done_hr_sq_sum / cycles - mean ** 2)
             # Increase penalty factor to be more sensitive to high variance
             consistency_score = max(0, 100 - (variance * 20))  # Lower variance = higher consistency
         else:
             consistency_score = 100
         
-        # Calculate improvement rate
-        if len(hours_per_cycle) >= 2:
-            first_half = hours_per_cycle[:len(hours_per_cycle)//2]
-            second_half = hours_per_cycle[len(hours_per_cycle)//2:]
-            avg_first = sum(first_half) / len(first_half)
-            avg_second = sum(second_half) / len(second_half)
+        # Calculate improvement rate (first half of the cycles vs the rest)
+        if cycles >= 2:
+            first_half = cycles // 2
+            avg_first = stats.first_half_done_hr / first_half
+            avg_second = (stats.done_hr_sum - stats.first_half_done_hr) / (cycles - first_half)
             improvement_rate = ((avg_second - avg_first) / avg_first * 100) if avg_first > 0 else 0
         else:
             improvement_rate = 0
         
         # Determine trend
-        if len(hours_per_cycle) >= 3:
-            recent_avg = sum(hours_per_cycle[-3:]) / 3
-            earlier_avg = sum(hours_per_cycle[:3]) / 3
+        if cycles >= PROGRESS_TREND_WINDOW:
+            recent_avg = stats.last_window_done_hr / PROGRESS_TREND_WINDOW
+            earlier_avg = stats.first_window_done_hr / PROGRESS_TREND_WINDOW
             if recent_avg > earlier_avg * 1.1:
                 trend = "improving"
             elif recent_avg < earlier_avg * 0.9:
@@ -241,13 +403,13 @@ class TaskService:
             "trend": trend,
             "consistency_score": round(consistency_score, 2),
             "improvement_rate": round(improvement_rate, 2),
-            "cycles_analyzed": len(hours_per_cycle),
-            "recent_performance": hours_per_cycle[-2:] if len(hours_per_cycle) >= 2 else hours_per_cycle
+            "cycles_analyzed": cycles,
+            "recent_performance": stats.recent_done_hr
         }
 
-    def _calculate_performance_indicators(self, task: TaskOutput, progress_history: List[TaskProgressDomain]) -> Dict[str, Any]:
+    def _calculate_performance_indicators(self, task: TaskOutput, stats: TaskProgressStatsDomain) -> Dict[str, Any]:
         """Calculate performance indicators"""
-        if not progress_history:
+        if not stats.cycle_count:
             return {
                 "productivity_score": 0,
                 "reliability_score": 0,
@@ -256,27 +418,17 @@ class TaskService:
             }
         
         # Productivity: How much work done vs estimated
-        total_estimated = sum(p.estimated_hr for p in progress_history)
-        total_done = sum(p.done_hr for p in progress_history)
+        total_estimated = stats.estimated_hr_sum
+        total_done = stats.done_hr_sum
         productivity_score = min(100, (total_done / total_estimated * 100)) if total_estimated > 0 else 0
         
-        # Reliability: Consistency in meeting estimates
-        reliability_scores = []
-        for p in progress_history:
-            if p.estimated_hr > 0:
-                accuracy = min(100, (p.done_hr / p.estimated_hr * 100))
-                reliability_scores.append(accuracy)
-        
-        reliability_score = sum(reliability_scores) / len(reliability_scores) if reliability_scores else 0
+        # Reliability: Consistency in meeting estimates (mean per-cycle completion, capped at 100)
+        reliability_score = (
+            stats.completion_pct_sum / stats.estimated_cycle_count if stats.estimated_cycle_count else 0
+        )
         
         # Quality: Based on completion rate and consistency
-        completion_rates = []
-        for p in progress_history:
-            if p.estimated_hr > 0:
-                completion_rate = min(100, (p.done_hr / p.estimated_hr * 100))
-                completion_rates.append(completion_rate)
-        
-        quality_score = sum(completion_rates) / len(completion_rates) if completion_rates else 0
+        quality_score = reliability_score
         
         # Overall performance (weighted average)
         overall_performance = (productivity_score * 0.4 + reliability_score * 0.3 + quality_score * 0.3)
@@ -288,7 +440,7 @@ class TaskService:
             "overall_performance": round(overall_performance, 2)
         }
 
-    def _analyze_task_status(self, task: TaskOutput, progress_history: List[TaskProgressDomain], stop_history: List) -> Dict[str, Any]:
+    def _analyze_task_status(self, task: TaskOutput, stats: TaskProgressStatsDomain, stop_history: List) -> Dict[str, Any]:
         """Analyze task status and history"""
         current_status = task.status.value if hasattr(task.status, 'value') else str(task.status)
         
@@ -298,7 +450,7 @@ class TaskService:
             status_duration = (datetime.now(timezone.utc) - task.start_date).days
         
         # Status changes
-        status_changes = len(progress_history) if progress_history else 0
+        status_changes = stats.cycle_count
         
         # Stop frequency for repetitive tasks
         stop_frequency = len(stop_history) if stop_history else 0
@@ -323,7 +475,7 @@ class TaskService:
             "is_stopped": task.is_stopped
         }
 
-    def _analyze_time_metrics(self, task: TaskOutput, progress_history: List[TaskProgressDomain]) -> Dict[str, Any]:
+    def _analyze_time_metrics(self, task: TaskOutput) -> Dict[str, Any]:
         """Analyze time-related metrics"""
         if not task.start_date:
             return {
@@ -345,15 +497,7 @@ class TaskService:
             # Time efficiency
             time_efficiency = (task.done_hr / time_spent * 100) if time_spent > 0 else 0
             
-            # Deadline status
-            if time_remaining < 0:
-                deadline_status = "overdue"
-            elif time_remaining < total_duration * 0.1:  # Less than 10% time remaining
-                deadline_status = "urgent"
-            elif time_remaining < total_duration * 0.3:  # Less than 30% time remaining
-                deadline_status = "approaching"
-            else:
-                deadline_status = "on_track"
+            deadline_status = self._deadline_status(time_remaining, total_duration)
         else:
             time_remaining = 0
             time_efficiency = 0
@@ -368,23 +512,34 @@ class TaskService:
             "end_date": task.end_date
         }
 
+    def _deadline_status(self, time_remaining: float, total_duration: float) -> str:
+        if time_remaining < 0:
+            return "overdue"
+        if time_remaining < total_duration * 0.1:  # Less than 10% time remaining
+            return "urgent"
+        if time_remaining < total_duration * 0.3:  # Less than 30% time remaining
+            return "approaching"
+        return "on_track"
+
+    def _grade(self, completion_rate: float, efficiency_score: float) -> str:
+        if completion_rate >= 99:
+            return "A"
+        if completion_rate >= 90 and efficiency_score >= 80:
+            return "A"
+        if completion_rate >= 75 and efficiency_score >= 70:
+            return "B"
+        if completion_rate >= 60 and efficiency_score >= 60:
+            return "C"
+        if completion_rate >= 40:
+            return "D"
+        return "F"
+
     def _generate_analytics_summary(self, task: TaskOutput, completion_rate: float, time_efficiency: Dict[str, Any], time_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a summary of the analytics"""
         efficiency_score = time_efficiency.get("efficiency_score", 0)
         
         # Overall grade
-        if completion_rate >= 99:
-            grade = "A"
-        elif completion_rate >= 90 and efficiency_score >= 80:
-            grade = "A"
-        elif completion_rate >= 75 and efficiency_score >= 70:
-            grade = "B"
-        elif completion_rate >= 60 and efficiency_score >= 60:
-            grade = "C"
-        elif completion_rate >= 40:
-            grade = "D"
-        else:
-            grade = "F"
+        grade = self._grade(completion_rate, efficiency_score)
         
         # Recommendations
         recommendations = []
@@ -418,26 +573,27 @@ class TaskService:
             ]
         }
 
-    async def get_tasks(self, current_user,search_name=None, skip: int = 0, limit: int = 100):
-        result = []
+    async def get_tasks(
+        self,
+        current_user,
+        search_name=None,
+        skip: int = 0,
+        limit: int = 100,
+        after_end_date: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+    ):
+        # Read-only: repetitive tasks are rolled over by the background scheduler.
         async with self.uow:
-            try:
-                if search_name:
-                    tasks = await self.uow.tasks.get_tasks_by_name(search_name, skip=skip, limit=limit)
-                else:
-                    tasks = await self.uow.tasks.get_tasks(skip=skip, limit=limit)
-                tasks.sort(key=lambda x: x.end_date)
-
-                for task in tasks:
-                    if task.owner_id == current_user.id or current_user.id in task.assignees:
-                        await self._handle_repetitive_task(task)
-                        result.append(task)
-            except Exception:
-                await self.uow.rollback()
-                raise
-            else:
-                await self.uow.commit()
-            return result
+            if search_name:
+                return await self.uow.tasks.get_tasks_by_name(
+                    search_name, current_user.id, skip=skip, limit=limit
+                )
+            after = None
+            if after_end_date is not None and after_id is not None:
+                after = (self._normalize_datetime(after_end_date), after_id)
+            return await self.uow.tasks.get_tasks(
+                current_user.id, skip=skip, limit=limit, after=after
+            )
 
 
     async def delete_task(self, task_id: int, current_user):
@@ -459,8 +615,10 @@ class TaskService:
             if current_user.id != task.owner_id:
                 raise PermissionError("You are not authorized to assign this task")
 
-            await self.uow.tasks.assign_user_to_task(task_id, assignee_email)
-            return await self.uow.tasks.get_task(task_id)
+            assigned, error = await self.uow.tasks.assign_user_to_task(task_id, assignee_email)
+            if error:
+                raise BadRequestError(error)
+            return assigned
 
     async def update_task(self, task_id: int, task_data: dict, current_user):
         async with self.uow:
@@ -482,8 +640,67 @@ class TaskService:
             if task_data.get("estimated_hr") is not None and task_data["estimated_hr"] < 0:
                 raise BadRequestError("Estimated hours cannot be negative")
 
+            new_parent_id = task_data.get("main_task_id")
+            if new_parent_id is not None and new_parent_id != task.main_task_id:
+                main_task = await self.uow.tasks.get_task(new_parent_id)
+                if not main_task:
+                    raise NotFoundError("Main task not found")
+                if main_task.owner_id != current_user.id and current_user.id not in main_task.assignees:
+                    raise PermissionError("Cannot move a task under another user's task")
+                if await self.uow.tasks.is_in_subtree(task_id, new_parent_id):
+                    raise BadRequestError("A task cannot be moved under itself or its subtasks")
+
             return await self.uow.tasks.update_task(task_id, task_data)
 
+    MAX_BULK_UPDATE = 1000
+
+    async def bulk_update_tasks(self, updates: Dict[int, dict], current_user) -> List[TaskUpdateResult]:
+        """
+        Apply ``{task_id: changes}`` with one permission query and a single UPDATE
+        for every task that passes. Tasks that are missing, not the caller's, or
+        given invalid values report an error and are left alone. Moving a task to
+        another parent still goes through ``update_task``.
+        """
+        if len(updates) > self.MAX_BULK_UPDATE:
+            raise BadRequestError(f"At most {self.MAX_BULK_UPDATE} tasks per bulk update")
+
+        results = {task_id: TaskUpdateResult(task_id=task_id) for task_id in updates}
+        async with self.uow:
+            visibility = await self.uow.tasks.get_task_visibility(list(updates), current_user.id)
+            accepted: Dict[int, dict] = {}
+            for task_id, task_data in updates.items():
+                for key in ("start_date", "end_date"):
+                    if key in task_data:
+                        task_data[key] = self._normalize_datetime(task_data[key])
+                start_date, end_date = task_data.get("start_date"), task_data.get("end_date")
+                if task_id not in visibility:
+                    results[task_id].error = "Task not found"
+                elif not visibility[task_id]:
+                    results[task_id].error = "You don't have permission to update this task"
+                elif "main_task_id" in task_data:
+                    results[task_id].error = "Tasks can't be moved in a bulk update"
+                elif start_date and end_date and end_date < start_date:
+                    results[task_id].error = "End date cannot be before start date"
+                elif task_data.get("estimated_hr") is not None and task_data["estimated_hr"] < 0:
+                    results[task_id].error = "Estimated hours cannot be negative"
+                else:
+                    accepted[task_id] = task_data
+
+            if accepted:
+                for task in await self.uow.tasks.bulk_update_tasks(accepted):
+                    results[task.id].task = task
+        return list(results.values())
+
+    async def get_subtree(self, task_id: int, current_user) -> List[TaskTreeNode]:
+        async with self.uow:
+            await self.get_task(task_id, current_user)
+            return await self.uow.tasks.get_subtree(task_id)
+
+    async def get_ancestors(self, task_id: int, current_user) -> List[TaskTreeNode]:
+        async with self.uow:
+            await self.get_task(task_id, current_user)
+            return await self.uow.tasks.get_ancestors(task_id, current_user.id)
+
     async def toggle_task(self, task_id: int, stop: bool, current_user):
         result = None
         async with self.uow:
@@ -538,13 +755,56 @@ class TaskService:
 
             
 
-    async def get_progress(self, task_id: int, current_user, skip=0, limit=20):
+    async def get_progress(
+        self,
+        task_id: int,
+        current_user,
+        skip=0,
+        limit=20,
+        before_start_date: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ):
         task = await self.uow.tasks.get_task(task_id)
         if not task:
             raise NotFoundError("Task not found")
         if current_user.id != task.owner_id and current_user.id not in task.assignees:
             raise PermissionError("You don't have permission to view this task's progress")
 
-        result=await self.uow.tasks.get_progress(task_id, skip, limit)
-        result.sort(key=lambda x: x.start_date, reverse=True)
-        return result
\ No newline at end of file
+        before = None
+        if before_start_date is not None and before_id is not None:
+            before = (self._normalize_datetime(before_start_date), before_id)
+        return await self.uow.tasks.get_progress(task_id, skip=skip, limit=limit, before=before)
+
+    def export_tasks(self, current_user, fmt: str = "ndjson") -> AsyncIterator[str]:
+        """
+        Stream the caller's tasks, progress, stops and time logs as NDJSON (one
+        object per row, tagged with ``record_type``) or as a single CSV whose header
+        is the union of the tables' columns. The format is checked up front; the
+        returned iterator opens the unit of work itself and holds it until the
+        last chunk, so give this service a unit of work with its own session.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise BadRequestError(f"Unsupported export format, expected one of {', '.join(EXPORT_FORMATS)}")
+        return self._export_chunks(current_user.id, fmt)
+
+    async def _export_chunks(self, user_id: int, fmt: str) -> AsyncIterator[str]:
+        async with self.uow:
+            columns = ["record_type"] + self.uow.tasks.export_columns()
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+            if fmt == "csv":
+                writer.writeheader()
+            async for record_type, rows in self.uow.tasks.stream_export(user_id):
+                for row in rows:
+                    record = {"record_type": record_type}
+                    record.update((key, _export_value(value)) for key, value in row.items())
+                    if fmt == "csv":
+                        writer.writerow(record)
+                    else:
+                        buffer.write(json.dumps(record))
+                        buffer.write("\n")
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
@@ -27,12 +27,9 @@ class UserUsecase:
         if not result:
             raise BadRequestError("invalid Email")
         token["token"]=self.jwt_service.hash_token(token["token"])
-        hashed_password = self.pass_service.hash_password(user.password)
-        result = await self.repo.get_all_users()
-        if len(result)==0:
-            role="superadmin"
-        else:
-            role="user"
+        hashed_password = await self.pass_service.hash_password(user.password)
+        # The very first account bootstraps the system as superadmin.
+        role = "user" if await self.repo.has_any_user() else "superadmin"
         
         created_user=await self.repo.Create(user, hashed_password, role)
         token["user_id"]=created_user.id
@@ -67,7 +64,7 @@ class UserUsecase:
             raise NotFoundError("User not found")
         if not user.verified:
             raise BadRequestError("Email not verified")
-        if not self.pass_service.verify_password(
+        if not await self.pass_service.verify_password(
             user_info.password, user.hashed_password
         ):
             raise BadRequestError("Invalid password")
@@ -189,7 +186,7 @@ class UserUsecase:
         # Optional extra check for stolen tokens
         if user.id != dbtoken.user_id:
             raise BadRequestError("Token-user mismatch")
-        hashed_password=self.pass_service.hash_password(newpassword)
+        hashed_password=await self.pass_service.hash_password(newpassword)
         await self.repo.update_user(user.id, hashed_password=hashed_password)
         await self.tokenRepo.DeleteByID(dbtoken.id)
 